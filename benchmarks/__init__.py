@@ -0,0 +1,18 @@
+"""Scanner benchmarks on deterministic synthetic trees.
+
+Run with ``python -m benchmarks run`` from the repository root.
+"""
+from .harness import VARIANTS, BenchResult, BenchRun, load_run, run_benchmarks, save_run
+from .trees import SHAPES, TreeInfo, generate_tree
+
+__all__ = [
+    'SHAPES',
+    'VARIANTS',
+    'TreeInfo',
+    'BenchResult',
+    'BenchRun',
+    'generate_tree',
+    'run_benchmarks',
+    'save_run',
+    'load_run',
+]
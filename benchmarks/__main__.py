@@ -0,0 +1,212 @@
+"""Command line for the benchmarks: python -m benchmarks <command>."""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from file_scanner.utils import format_size
+
+from .harness import VARIANTS, BenchResult, load_run, run_benchmarks, run_variant, save_run
+from .trees import SHAPES, generate_tree, tree_path
+
+DEFAULT_BASE = Path(tempfile.gettempdir()) / 'file_scanner_bench'
+DEFAULT_SIZES = [10_000, 100_000]
+
+def _optional(value, fmt: str) -> str:
+    return format(value, fmt) if value is not None else '-'
+
+def create_results_table(results) -> Table:
+    """Create a table of benchmark results."""
+    table = Table(title="Benchmark Results")
+    table.add_column("Shape", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Variant", style="green")
+    table.add_column("Time", justify="right")
+    table.add_column("Files/s", justify="right", style="yellow")
+    table.add_column("FS ops/file", justify="right")
+    table.add_column("Syscalls/file", justify="right")
+    table.add_column("Peak RSS", justify="right", style="magenta")
+    for r in results:
+        table.add_row(
+            r.shape,
+            f"{r.files:,}",
+            r.variant,
+            f"{r.elapsed:.3f}s",
+            f"{r.files_per_sec:,.0f}",
+            _optional(r.fs_ops_per_file, '.2f'),
+            _optional(r.syscalls_per_file, '.2f'),
+            format_size(r.peak_rss_bytes)
+        )
+    return table
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return '-'
+    change = (new - old) / old * 100
+    color = 'green' if change >= 0 else 'red'
+    return f"[{color}]{change:+.1f}%[/]"
+
+def create_comparison_table(baseline, current) -> Table:
+    """Create a table comparing two runs on the trees and variants they share."""
+    table = Table(title="Benchmark Comparison")
+    table.add_column("Shape", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Variant", style="green")
+    table.add_column("Files/s before", justify="right")
+    table.add_column("Files/s after", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Peak RSS before", justify="right")
+    table.add_column("Peak RSS after", justify="right")
+
+    before: Dict[Tuple[str, int, str], BenchResult] = {
+        (r.shape, r.files, r.variant): r for r in baseline.results
+    }
+    for r in current.results:
+        old = before.get((r.shape, r.files, r.variant))
+        if old is None:
+            continue
+        table.add_row(
+            r.shape,
+            f"{r.files:,}",
+            r.variant,
+            f"{old.files_per_sec:,.0f}",
+            f"{r.files_per_sec:,.0f}",
+            _change(old.files_per_sec, r.files_per_sec),
+            format_size(old.peak_rss_bytes),
+            format_size(r.peak_rss_bytes)
+        )
+    return table
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    """Create and configure argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Benchmark the scanner on synthetic directory trees"
+    )
+    subparsers = parser.add_subparsers(dest='command', help='Commands')
+
+    def add_tree_arguments(command: argparse.ArgumentParser) -> None:
+        command.add_argument(
+            '--shapes',
+            nargs='+',
+            choices=list(SHAPES),
+            default=list(SHAPES),
+            help='Tree shapes (default: all)'
+        )
+        command.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=DEFAULT_SIZES,
+            metavar='FILES',
+            help='Files per tree (default: 10000 100000)'
+        )
+        command.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Tree seed (default: 0)'
+        )
+        command.add_argument(
+            '--base',
+            type=Path,
+            default=DEFAULT_BASE,
+            help=f'Directory holding the generated trees (default: {DEFAULT_BASE})'
+        )
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks and store the results')
+    add_tree_arguments(run_parser)
+    run_parser.add_argument(
+        '--variants',
+        nargs='+',
+        choices=list(VARIANTS),
+        default=list(VARIANTS),
+        help='Scanner variants (default: all)'
+    )
+    run_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Measured runs per variant; the median is reported (default: 3)'
+    )
+    run_parser.add_argument(
+        '--no-syscalls',
+        action='store_true',
+        help='Skip counting system calls with strace'
+    )
+    run_parser.add_argument(
+        '--output',
+        type=Path,
+        help='Results file (default: benchmarks/results/bench-<timestamp>.json)'
+    )
+
+    generate_parser = subparsers.add_parser('generate', help='Only generate the trees')
+    add_tree_arguments(generate_parser)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('baseline', type=Path, help='Earlier results file')
+    compare_parser.add_argument('current', type=Path, help='Later results file')
+
+    # Used by the harness to run one measurement in a fresh interpreter
+    one_parser = subparsers.add_parser('run-one')
+    one_parser.add_argument('root', type=Path)
+    one_parser.add_argument('variant', choices=list(VARIANTS))
+    one_parser.add_argument('--output', type=Path, required=True)
+
+    return parser
+
+def main() -> None:
+    """Main entry point."""
+    parser = create_arg_parser()
+    args = parser.parse_args()
+    console = Console()
+
+    if args.command == 'run-one':
+        args.output.write_text(json.dumps(run_variant(args.root, args.variant)))
+
+    elif args.command == 'generate':
+        for shape in args.shapes:
+            for size in args.sizes:
+                root = tree_path(args.base, shape, size, args.seed)
+                info = generate_tree(root, shape, size, args.seed)
+                console.print(
+                    f"{root}: {info.files:,} files in {info.directories:,} directories, "
+                    f"{format_size(info.total_bytes)} apparent size"
+                )
+
+    elif args.command == 'run':
+        with console.status("Running benchmarks...") as status:
+            bench = run_benchmarks(
+                args.base,
+                args.shapes,
+                args.sizes,
+                args.variants,
+                repeat=args.repeat,
+                seed=args.seed,
+                syscalls=not args.no_syscalls,
+                on_result=lambda r: status.update(
+                    f"Running benchmarks... {r.shape}/{r.files:,}/{r.variant}: "
+                    f"{r.files_per_sec:,.0f} files/s"
+                )
+            )
+        console.print(create_results_table(bench.results))
+        if not args.no_syscalls and not shutil.which('strace'):
+            console.print("[dim]strace not available; syscalls per file not measured[/]")
+        path = save_run(bench, args.output)
+        console.print(f"Results saved to {path}")
+
+    elif args.command == 'compare':
+        console.print(create_comparison_table(load_run(args.baseline), load_run(args.current)))
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
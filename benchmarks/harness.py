@@ -0,0 +1,305 @@
+"""Runs scanner variants on synthetic trees and records the results."""
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from file_scanner.core.accumulator import ScanAccumulator
+from file_scanner.core.budget import IOBudget, IOThrottle
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.database.catalog import CatalogManager
+
+from .trees import TreeInfo, generate_tree, tree_path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+@dataclass
+class BenchResult:
+    """Measurements of one variant on one tree."""
+    shape: str
+    files: int  # Files in the tree
+    variant: str
+    elapsed: float  # Median seconds over the runs
+    files_per_sec: float
+    runs: List[float]  # Seconds of every measured run
+    scanned_files: int  # Files the scan reported, a sanity check
+    peak_rss_bytes: int  # Highest peak of any run, worker processes included
+    baseline_rss_bytes: int  # Peak before the scan, after imports
+    fs_ops_per_file: Optional[float] = None  # Listings and stats issued, per file
+    syscalls_per_file: Optional[float] = None  # From strace, net of an empty tree
+    syscall_source: Optional[str] = None  # "strace", or None if unavailable
+
+@dataclass
+class BenchRun:
+    """A complete benchmark run, as stored in the results file."""
+    timestamp: str
+    python: str
+    platform: str
+    cpu_count: int
+    commit: Optional[str]
+    trees: List[TreeInfo] = field(default_factory=list)
+    results: List[BenchResult] = field(default_factory=list)
+
+class _Quiet:
+    """Progress updater that discards updates, keeping output out of timings."""
+
+    def update_progress(self, status: str, percentage: int = -1):
+        pass
+
+class CountingThrottle(IOThrottle):
+    """Throttle that never waits but counts the filesystem calls it sees.
+
+    The walker and scanner acquire the throttle before every directory
+    stat, listing and file stat, so the count is the scanner's own
+    filesystem traffic without strace.
+    """
+
+    def __init__(self):
+        super().__init__(IOBudget())
+        self.ops = 0
+        self._count_lock = threading.Lock()
+
+    def acquire(self, ops: int = 1, nbytes: int = 0) -> None:
+        with self._count_lock:
+            self.ops += ops
+
+def _scan(scanner: FileScanner) -> int:
+    return scanner.scan().total_files
+
+def _scan_columnar(scanner: FileScanner) -> int:
+    return scanner.scan_columnar().total_files
+
+def _iter_scan(scanner: FileScanner) -> int:
+    accumulator = ScanAccumulator(scanner.root_path)
+    for _ in scanner.iter_scan(accumulator):
+        pass
+    return accumulator.total_files
+
+def _catalog(scanner: FileScanner) -> int:
+    accumulator = ScanAccumulator(scanner.root_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CatalogManager(os.path.join(tmp, 'bench.db'))
+        manager.create_catalog_from_stream(scanner.iter_scan(accumulator), accumulator)
+    return accumulator.total_files
+
+# name -> (scan options, function running the scan and returning the file count)
+VARIANTS: Dict[str, tuple] = {
+    'scan': (ScanOptions(), _scan),
+    'scan-columnar': (ScanOptions(), _scan_columnar),
+    'iter-scan': (ScanOptions(), _iter_scan),
+    'workers-8': (ScanOptions(workers=8), _scan),
+    'processes-4': (ScanOptions(processes=4), _scan),
+    'catalog': (ScanOptions(), _catalog),
+}
+
+def _max_rss() -> int:
+    """Get the peak RSS of this process and its reaped children, in bytes."""
+    usage = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+    # Kilobytes on Linux, bytes on macOS
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+def run_variant(root: Path, variant: str) -> dict:
+    """Run one variant once in this process.
+
+    Meant to run in a fresh interpreter (see measure()), so the peak RSS
+    belongs to this scan alone.
+
+    Args:
+        root: Tree to scan
+        variant: One of VARIANTS
+
+    Returns:
+        Dict with elapsed, scanned_files, peak_rss_bytes,
+        baseline_rss_bytes and fs_ops
+    """
+    options, run = VARIANTS[variant]
+    counter = CountingThrottle() if options.processes == 1 else None
+    scanner = FileScanner(root, options, progress_updater=_Quiet(), throttle=counter)
+    baseline_rss = _max_rss()
+
+    start = time.perf_counter()
+    scanned = run(scanner)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'elapsed': elapsed,
+        'scanned_files': scanned,
+        'peak_rss_bytes': _max_rss(),
+        'baseline_rss_bytes': baseline_rss,
+        # Worker processes count in their own, unreachable throttles
+        'fs_ops': counter.ops if counter else None,
+    }
+
+def _child(root: Path, variant: str, strace_out: Optional[Path] = None) -> dict:
+    """Run a variant in a fresh interpreter and get its measurements."""
+    with tempfile.NamedTemporaryFile('r', suffix='.json') as out:
+        command = [
+            sys.executable, '-m', 'benchmarks', 'run-one',
+            str(root), variant, '--output', out.name
+        ]
+        if strace_out is not None:
+            command = ['strace', '-f', '-c', '-o', str(strace_out)] + command
+        subprocess.run(
+            command, cwd=REPO_ROOT, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return json.load(out)
+
+def _count_syscalls(root: Path, variant: str) -> Optional[int]:
+    """Count the system calls of one run under ``strace -f -c``."""
+    with tempfile.NamedTemporaryFile('r', suffix='.strace') as out:
+        _child(root, variant, Path(out.name))
+        for line in out.read().splitlines():
+            # % time, seconds, usecs/call, calls, [errors,] "total"
+            fields = line.split()
+            if fields and fields[-1] == 'total' and len(fields) >= 5:
+                return int(fields[3])
+        return None
+
+def measure(
+    root: Path,
+    info: TreeInfo,
+    variant: str,
+    repeat: int = 3,
+    empty_root: Optional[Path] = None
+) -> BenchResult:
+    """Benchmark one variant on one tree.
+
+    Every run happens in a fresh interpreter. An unmeasured run comes
+    first so the tree is in the page cache; the timings are thus of a
+    warm cache. With strace installed and ``empty_root`` given, one more
+    run counts system calls, less those of scanning an empty tree, which
+    covers interpreter startup and imports.
+
+    Args:
+        root: Tree to scan
+        info: The tree's description
+        variant: One of VARIANTS
+        repeat: Measured runs; the median time is reported
+        empty_root: Empty directory for the syscall baseline
+
+    Returns:
+        BenchResult
+    """
+    _child(root, variant)  # Warm-up
+    runs = [_child(root, variant) for _ in range(max(1, repeat))]
+    elapsed = statistics.median(r['elapsed'] for r in runs)
+    files = max(1, info.files)
+
+    result = BenchResult(
+        shape=info.shape,
+        files=info.files,
+        variant=variant,
+        elapsed=elapsed,
+        files_per_sec=info.files / elapsed if elapsed else 0.0,
+        runs=[r['elapsed'] for r in runs],
+        scanned_files=runs[0]['scanned_files'],
+        peak_rss_bytes=max(r['peak_rss_bytes'] for r in runs),
+        baseline_rss_bytes=min(r['baseline_rss_bytes'] for r in runs),
+    )
+    if runs[0]['fs_ops'] is not None:
+        result.fs_ops_per_file = runs[0]['fs_ops'] / files
+
+    if empty_root is not None and shutil.which('strace'):
+        total = _count_syscalls(root, variant)
+        empty = _count_syscalls(empty_root, variant)
+        if total is not None and empty is not None:
+            result.syscalls_per_file = (total - empty) / files
+            result.syscall_source = 'strace'
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(
+    base: Path,
+    shapes: List[str],
+    sizes: List[int],
+    variants: List[str],
+    repeat: int = 3,
+    seed: int = 0,
+    syscalls: bool = True,
+    on_result: Optional[Callable[[BenchResult], None]] = None
+) -> BenchRun:
+    """Generate the trees and benchmark every variant on each.
+
+    Args:
+        base: Directory holding the generated trees; existing identical
+            trees are reused
+        shapes: Tree shapes, see trees.SHAPES
+        sizes: File counts
+        variants: Variants, see VARIANTS
+        repeat: Measured runs per variant and tree
+        seed: Tree seed
+        syscalls: Whether to count system calls when strace is available
+        on_result: Called with each result as it completes
+
+    Returns:
+        BenchRun with all results
+    """
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant: {variant} (choose from {', '.join(VARIANTS)})")
+
+    bench = BenchRun(
+        timestamp=datetime.now().isoformat(timespec='seconds'),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        cpu_count=os.cpu_count() or 1,
+        commit=_git_commit()
+    )
+    empty_root = None
+    if syscalls:
+        empty_root = Path(base) / 'empty'
+        empty_root.mkdir(parents=True, exist_ok=True)
+
+    for shape in shapes:
+        for size in sizes:
+            root = tree_path(base, shape, size, seed)
+            info = generate_tree(root, shape, size, seed)
+            bench.trees.append(info)
+            for variant in variants:
+                result = measure(root, info, variant, repeat, empty_root)
+                bench.results.append(result)
+                if on_result:
+                    on_result(result)
+    return bench
+
+def save_run(bench: BenchRun, path: Optional[Path] = None) -> Path:
+    """Write a run to JSON, by default as results/bench-<timestamp>.json."""
+    if path is None:
+        stamp = datetime.fromisoformat(bench.timestamp).strftime('%Y%m%d-%H%M%S')
+        path = RESULTS_DIR / f"bench-{stamp}.json"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(bench), indent=2))
+    return path
+
+def load_run(path: Path) -> BenchRun:
+    """Read a run written by save_run."""
+    data = json.loads(Path(path).read_text())
+    data['trees'] = [TreeInfo(**tree) for tree in data['trees']]
+    data['results'] = [BenchResult(**result) for result in data['results']]
+    return BenchRun(**data)
@@ -0,0 +1,173 @@
+"""Deterministic synthetic directory trees for benchmarks."""
+import json
+import math
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+MARKER_SUFFIX = '.tree.json'  # Written next to the tree once it is complete
+
+# (extension, weight, median size in bytes) for the mixed shape
+_MIXED_TYPES = [
+    ('.py', 12, 6000), ('.js', 10, 9000), ('.json', 6, 2000), ('.md', 4, 3000),
+    ('.txt', 6, 1500), ('.jpg', 8, 900_000), ('.png', 6, 150_000), ('.pdf', 4, 400_000),
+    ('.docx', 3, 60_000), ('.xlsx', 2, 40_000), ('.mp4', 1, 80_000_000),
+    ('.zip', 1, 20_000_000), ('.o', 4, 30_000), ('.log', 3, 200_000), ('', 5, 500)
+]
+
+@dataclass
+class TreeInfo:
+    """Description of a generated tree, stored in its marker file."""
+    shape: str
+    files: int
+    directories: int
+    total_bytes: int  # Apparent size; files are sparse and use no space
+    seed: int
+
+class _Builder:
+    """Creates directories and sparse files and counts them."""
+
+    def __init__(self, root: Path, rng: random.Random):
+        self.root = root
+        self.rng = rng
+        self.files = 0
+        self.directories = 1
+        self.total_bytes = 0
+
+    def mkdir(self, path: Path) -> Path:
+        path.mkdir()
+        self.directories += 1
+        return path
+
+    def file(self, path: Path, size: int) -> None:
+        with open(path, 'wb') as f:
+            if size:
+                f.truncate(size)
+        self.files += 1
+        self.total_bytes += size
+
+def _wide_flat(b: _Builder, files: int) -> None:
+    """A few huge directories directly below the root."""
+    dirs = max(1, files // 20_000)
+    for d in range(dirs):
+        parent = b.mkdir(b.root / f"bucket{d:03d}")
+        for i in range(d, files, dirs):
+            b.file(parent / f"file_{i:07d}.dat", b.rng.randrange(65_536))
+
+def _deep_narrow(b: _Builder, files: int) -> None:
+    """Long chains of directories holding a few files each."""
+    per_dir, max_depth = 4, 200
+    levels = max(1, math.ceil(files / per_dir))
+    chains = math.ceil(levels / max_depth)
+    made = 0
+    for c in range(chains):
+        parent = b.root
+        for depth in range(min(max_depth, levels - c * max_depth)):
+            parent = b.mkdir(parent / (f"chain{c:03d}" if depth == 0 else f"d{depth:03d}"))
+            for i in range(min(per_dir, files - made)):
+                b.file(parent / f"f{i}.txt", b.rng.randrange(4096))
+                made += 1
+
+def _many_tiny(b: _Builder, files: int) -> None:
+    """A bushy tree of small directories full of tiny files."""
+    per_dir, fanout = 50, 16
+    leaves = max(1, math.ceil(files / per_dir))
+    depth = max(1, math.ceil(math.log(leaves, fanout)))
+    made = 0
+    for leaf in range(leaves):
+        parent = b.root
+        for level in reversed(range(depth)):
+            parent = parent / f"n{(leaf // fanout ** level) % fanout:02d}"
+            if not parent.exists():
+                b.mkdir(parent)
+        for i in range(min(per_dir, files - made)):
+            b.file(parent / f"t{i:02d}", b.rng.randrange(257))
+            made += 1
+
+def _mixed(b: _Builder, files: int) -> None:
+    """A project-share-like tree with skewed directory and file sizes.
+
+    Directory file counts and file sizes are log-normal, fan-out shrinks
+    with depth, extensions follow a weighted mix, and a few hidden
+    directories hold many tiny files, as version-control metadata does.
+    """
+    rng = b.rng
+    names = [ext for ext, _, _ in _MIXED_TYPES]
+    weights = [w for _, w, _ in _MIXED_TYPES]
+    medians = {ext: m for ext, _, m in _MIXED_TYPES}
+    queue: List[Tuple[Path, int]] = [(b.root, 0)]
+    made = 0
+    while made < files:
+        if not queue:
+            queue.append((b.root, 0))  # Budget left; grow another top-level subtree
+        parent, depth = queue.pop(rng.randrange(len(queue)))
+
+        count = min(files - made, int(rng.lognormvariate(math.log(8), 1.2)))
+        for i in range(count):
+            ext = rng.choices(names, weights)[0]
+            size = min(int(rng.lognormvariate(math.log(medians[ext]), 1.0)), 2 ** 32)
+            hidden = '.' if rng.random() < 0.02 else ''
+            b.file(parent / f"{hidden}item{made:07d}{ext}", size)
+            made += 1
+
+        if rng.random() < 0.03 and made < files:
+            # Dense hidden metadata directory
+            meta = b.mkdir(parent / f".meta{made:07d}")
+            for i in range(min(files - made, rng.randrange(50, 400))):
+                b.file(meta / f"{i:04x}", rng.randrange(300))
+                made += 1
+
+        for s in range(int(rng.expovariate(1 / max(0.5, 4 - depth * 0.5))) + (depth == 0)):
+            queue.append((b.mkdir(parent / f"dir{made:07d}_{s}"), depth + 1))
+
+SHAPES: Dict[str, Callable[[_Builder, int], None]] = {
+    'wide-flat': _wide_flat,
+    'deep-narrow': _deep_narrow,
+    'many-tiny': _many_tiny,
+    'mixed': _mixed,
+}
+
+def generate_tree(root: Path, shape: str, files: int, seed: int = 0) -> TreeInfo:
+    """Create a synthetic tree, or reuse an identical one.
+
+    The same shape, size and seed always produce the same tree. Files
+    are sparse, so even large trees take little disk space. An existing
+    tree is reused if the marker file next to it matches; anything else
+    at ``root`` is replaced.
+
+    Args:
+        root: Directory to create the tree in
+        shape: One of SHAPES
+        files: Number of files to create
+        seed: Random seed
+
+    Returns:
+        TreeInfo describing the tree
+
+    Raises:
+        ValueError: If the shape is unknown
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown tree shape: {shape} (choose from {', '.join(SHAPES)})")
+
+    marker = root.with_name(root.name + MARKER_SUFFIX)
+    if marker.exists():
+        info = TreeInfo(**json.loads(marker.read_text()))
+        if (info.shape, info.files, info.seed) == (shape, files, seed):
+            return info
+        marker.unlink()
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True)
+
+    builder = _Builder(root, random.Random(f"{shape}:{files}:{seed}"))
+    SHAPES[shape](builder, files)
+    info = TreeInfo(shape, builder.files, builder.directories, builder.total_bytes, seed)
+    marker.write_text(json.dumps(asdict(info)))
+    return info
+
+def tree_path(base: Path, shape: str, files: int, seed: int = 0) -> Path:
+    """Get the conventional location of a tree below a base directory."""
+    return Path(base) / f"{shape}-{files}-{seed}"
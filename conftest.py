@@ -0,0 +1,105 @@
+"""Pytest configuration and fixtures shared by the tests."""
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from file_scanner.core.accumulator import ScanAccumulator
+from file_scanner.database.catalog import CatalogManager
+
+# Manual scripts run directly; they need a display and PySide6
+collect_ignore = ['test_filter.py', 'test_imports.py', 'test_panel.py', 'test_scan.py']
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small tree under tmp_path/root and return the root.
+
+    Five directories d0-d4 hold three files each and an ``inner``
+    directory with three more; d0 continues four levels down. d0/g1.txt
+    has a second link in d2/inner, and d1/g2.txt one outside the root.
+    There are also an empty directory, a hidden one and a node_modules
+    directory, for scans that skip them.
+    """
+    root = tmp_path / 'root'
+    for i in range(5):
+        inner = root / f'd{i}' / 'inner'
+        inner.mkdir(parents=True)
+        for k in range(3):
+            (inner / f'f{k}.txt').write_text('x' * (i * 10 + k))
+            (inner.parent / f'g{k}.txt').write_text('y' * k)
+    deep = root / 'd0' / 'inner' / 'a' / 'b'
+    deep.mkdir(parents=True)
+    (deep / 'h.dat').write_bytes(b'z' * 100)
+    os.link(root / 'd0' / 'g1.txt', root / 'd2' / 'inner' / 'link.txt')
+    os.link(root / 'd1' / 'g2.txt', tmp_path / 'outside.txt')
+    (root / 'empty').mkdir()
+    (root / '.hidden').mkdir()
+    (root / '.hidden' / 'secret.txt').write_text('s')
+    (root / 'node_modules' / 'pkg').mkdir(parents=True)
+    (root / 'node_modules' / 'pkg' / 'index.js').write_text('module')
+    (root / 'root.txt').write_text('root')
+    return root
+
+@pytest.fixture
+def catalog_manager(tmp_path):
+    """Catalog database in tmp_path."""
+    return CatalogManager(str(tmp_path / 'catalog.db'))
+
+@pytest.fixture
+def stream_catalog():
+    """Get a function cataloging a scanner's iter_scan stream.
+
+    The function takes the catalog manager and scanner, and returns the
+    catalog id.
+    """
+    def catalog(catalog_manager, scanner):
+        accumulator = ScanAccumulator(scanner.root_path)
+        return catalog_manager.create_catalog_from_stream(
+            scanner.iter_scan(accumulator), accumulator, checkpoint=scanner.checkpoint
+        )
+    return catalog
+
+def _timestamp(value):
+    # Files of reused directories come back from modified_date, which
+    # only keeps microseconds
+    return None if value is None else datetime.fromtimestamp(value).isoformat(' ')
+
+@pytest.fixture
+def catalog_contents():
+    """Get a function reading a catalog for comparison with another.
+
+    The function returns (totals and status, files, directories), with
+    rows identified by relative path rather than row id.
+    """
+    def contents(catalog_manager, catalog_id):
+        with sqlite3.connect(str(catalog_manager.db_path)) as conn:
+            catalog = conn.execute(
+                "SELECT total_files, total_size_bytes, status FROM catalogs WHERE id = ?",
+                (catalog_id,)
+            ).fetchone()
+            files = sorted(conn.execute(
+                """
+                SELECT f.relative_path, f.size_bytes, f.modified_date, f.extension,
+                       f.is_hidden, f.link_count, f.device, f.inode, d.relative_path
+                FROM files f LEFT JOIN directories d ON d.id = f.directory_id
+                WHERE f.catalog_id = ?
+                """,
+                (catalog_id,)
+            ))
+            directories = sorted(
+                row[:8] + (_timestamp(row[8]), *row[9:11], _timestamp(row[11]), row[12])
+                for row in conn.execute(
+                    """
+                    SELECT d.relative_path, d.depth, d.truncated, d.entry_count,
+                           d.mtime_ns, d.inode, d.file_count, d.size_bytes, d.newest_mtime,
+                           d.tree_file_count, d.tree_size_bytes, d.tree_newest_mtime,
+                           p.relative_path
+                    FROM directories d LEFT JOIN directories p ON p.id = d.parent_id
+                    WHERE d.catalog_id = ?
+                    """,
+                    (catalog_id,)
+                )
+            )
+        return catalog, files, directories
+    return contents
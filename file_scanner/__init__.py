@@ -1,7 +1,8 @@
 """File scanner package for directory analysis and cataloging."""
 from .core import (
     FileInfo, DirectoryInfo, ScanResult, ScanOptions,
-    FileScanner, ScanError, AccessError, InvalidPathError
+    FileScanner, ScanAccumulator, ColumnarScanResult,
+    ScanError, AccessError, InvalidPathError, WatchError
 )
 from .database import StatsManager, CatalogManager
 
@@ -11,6 +12,7 @@ __all__ = [
     # Core functionality
     'FileScanner',
     'ScanOptions',
+    'ScanAccumulator',
     
     # Database managers
     'StatsManager',
@@ -20,9 +22,11 @@ __all__ = [
     'FileInfo',
     'DirectoryInfo',
     'ScanResult',
+    'ColumnarScanResult',
     
     # Exceptions
     'ScanError',
     'AccessError',
-    'InvalidPathError'
+    'InvalidPathError',
+    'WatchError'
 ]
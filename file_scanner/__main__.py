@@ -2,6 +2,7 @@
 import sys
 from PySide6.QtWidgets import QApplication
 
+from .core import memory
 from .ui.cli import main as cli_main
 from .ui.gui import MainWindow
 
@@ -12,7 +13,11 @@ def main():
         cli_main()
         return
 
-    # Default to GUI
+    # Default to GUI; --memory-profile prints memory use after each scan
+    if '--memory-profile' in sys.argv:
+        sys.argv.remove('--memory-profile')
+        memory.enable()
+    
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -1,17 +1,32 @@
 """Core domain logic package."""
 from .models import (
     FileInfo, DirectoryInfo, ScanResult, ScanOptions,
-    ScanError, AccessError, InvalidPathError
+    ScanError, AccessError, InvalidPathError, WatchError
 )
+from .accumulator import ScanAccumulator
+from .columnar import ColumnarScanResult, FileColumns
 from .scanner import FileScanner
+from .hashing import FileHasher, HashResult
+from .profiling import Profiler, ProfileReport
+from .memory import MemoryProfiler, MemoryReport
 
 __all__ = [
     'FileInfo',
     'DirectoryInfo',
     'ScanResult',
+    'ColumnarScanResult',
+    'FileColumns',
     'ScanOptions',
     'FileScanner',
+    'ScanAccumulator',
+    'FileHasher',
+    'HashResult',
+    'Profiler',
+    'ProfileReport',
+    'MemoryProfiler',
+    'MemoryReport',
     'ScanError',
     'AccessError',
-    'InvalidPathError'
+    'InvalidPathError',
+    'WatchError'
 ]
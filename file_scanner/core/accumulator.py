@@ -0,0 +1,295 @@
+"""Running aggregates for streaming scans."""
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .columnar import ColumnarScanResult, FileColumns
+from .models import DirectoryInfo, FileInfo, ScanResult
+from .registry import DirectoryRegistry
+from ..utils import format_size
+
+MAX_PENDING_LINKS = 100_000  # Multiply-linked files remembered for their other links
+
+@dataclass
+class _LinkOwner:
+    """Link of a multiply-linked file whose size is counted."""
+    remaining: int  # Links not seen yet
+    relative_path: str
+    directory_id: Optional[int]
+    extension: str
+
+class ScanAccumulator:
+    """Collects directories and aggregate statistics while files stream by.
+
+    Exposes the same summary attributes as ScanResult (root_path,
+    total_files, total_size, directories, extension_stats, pruned_dirs,
+    reused_dirs),
+    so consumers can read either one once the file stream is exhausted.
+    Only directories are retained; files are counted, not stored.
+
+    Files with several hard links are counted once per link, but their
+    size only once, in the directory and extension of the link with the
+    smallest relative path, so the totals do not depend on the order of
+    traversal; the other links are counted in duplicate_links. A file is
+    remembered until all its links were seen, which never happens when
+    some lie outside the tree, so at most MAX_PENDING_LINKS files are
+    remembered, the oldest forgotten first; a later link to a forgotten
+    file has its size counted again. With follow_links, symbolic links
+    can reach any file any number of times, so every file is remembered
+    until it is forgotten that way.
+
+    Each directory's own file count, size and newest mtime are updated
+    as files arrive; rollup() derives the subtree totals from them.
+    """
+
+    def __init__(self, root_path: Path, follow_links: bool = False):
+        """Initialize accumulator.
+
+        Args:
+            root_path: Root directory of the scan
+            follow_links: Whether the scan follows symbolic links
+        """
+        self.root_path = root_path
+        self.follow_links = follow_links
+        self.registry = DirectoryRegistry(root_path)
+        self.total_files = 0
+        self.total_size = 0
+        self.extension_stats: Dict[str, Dict[str, int]] = {}
+        self.pruned_dirs = 0
+        self.reused_dirs = 0
+        self.duplicate_links = 0
+        self.interrupted = False
+        # Links still expected for multiply-linked files seen so far
+        self._pending_links: Dict[Tuple[int, int], _LinkOwner] = OrderedDict()
+
+    @property
+    def directories(self) -> List[DirectoryInfo]:
+        """Directories registered so far, parents before children."""
+        return self.registry.directories
+
+    @property
+    def formatted_total_size(self) -> str:
+        """Get human-readable total size."""
+        return format_size(self.total_size)
+
+    def dedupe_link(
+        self,
+        file_id: Tuple[int, int],
+        link_count: int,
+        relative_path: str,
+        directory_id: Optional[int],
+        extension: Optional[str],
+        size: int,
+        links: int = 1
+    ) -> None:
+        """Record links of a multiply-linked file whose size was just counted.
+
+        If another link of the file was counted before, the size is
+        removed again from whichever of the two links has the larger
+        relative path.
+
+        Args:
+            file_id: (st_dev, st_ino) of the file
+            link_count: Number of links to the file
+            relative_path: Path of the counted link, relative to the root
+            directory_id: Directory of the counted link
+            extension: Extension of the counted link
+            size: Size of the file
+            links: Links covered by this call, e.g. all links in a
+                partial result that counted the size once
+        """
+        extension = extension or "(no extension)"
+        owner = self._pending_links.get(file_id)
+        if owner is None:
+            if link_count > links or self.follow_links:
+                if len(self._pending_links) >= MAX_PENDING_LINKS:
+                    self._pending_links.popitem(last=False)
+                self._pending_links[file_id] = _LinkOwner(
+                    link_count - links, relative_path, directory_id, extension
+                )
+            return
+
+        self.duplicate_links += 1
+        if relative_path < owner.relative_path:
+            self._uncount_size(owner.directory_id, owner.extension, size)
+            owner.relative_path = relative_path
+            owner.directory_id = directory_id
+            owner.extension = extension
+        else:
+            self._uncount_size(directory_id, extension, size)
+        # Forget the file once all its links were seen
+        owner.remaining -= links
+        if owner.remaining <= 0 and not self.follow_links:
+            del self._pending_links[file_id]
+
+    def add_file(self, file_info: FileInfo) -> None:
+        """Add a file to the aggregate statistics."""
+        size = file_info.size_bytes
+        ext = file_info.extension or "(no extension)"
+        stats = self.extension_stats.get(ext)
+        if stats is None:
+            stats = self.extension_stats[ext] = {"count": 0, "size": 0}
+        stats["count"] += 1
+        stats["size"] += size
+
+        self.total_files += 1
+        self.total_size += size
+
+        if file_info.directory_id is not None:
+            dir_info = self.registry.directories[file_info.directory_id]
+            dir_info.file_count += 1
+            dir_info.size_bytes += size
+            if dir_info.newest_mtime is None or file_info.st_mtime > dir_info.newest_mtime:
+                dir_info.newest_mtime = file_info.st_mtime
+
+        if file_info.file_id is not None:
+            self.dedupe_link(
+                file_info.file_id,
+                file_info.link_count,
+                file_info.relative_path_str,
+                file_info.directory_id,
+                ext,
+                size
+            )
+
+    def _uncount_size(self, directory_id: Optional[int], extension: str, size: int) -> None:
+        """Remove a file's size from the totals, keeping it counted as a file."""
+        self.extension_stats[extension]["size"] -= size
+        self.total_size -= size
+        if directory_id is not None:
+            self.registry.directories[directory_id].size_bytes -= size
+
+    def rollup(self) -> None:
+        """Compute every directory's subtree totals from the own totals.
+
+        Directories are registered parents first, so one pass in reverse
+        order sees each directory complete before adding it to its parent.
+        """
+        directories = self.registry.directories
+        for dir_info in directories:
+            dir_info.tree_file_count = dir_info.file_count
+            dir_info.tree_size_bytes = dir_info.size_bytes
+            dir_info.tree_newest_mtime = dir_info.newest_mtime
+
+        for dir_info in reversed(directories):
+            if dir_info.parent_id is None:
+                continue
+            parent = directories[dir_info.parent_id]
+            parent.tree_file_count += dir_info.tree_file_count
+            parent.tree_size_bytes += dir_info.tree_size_bytes
+            newest = dir_info.tree_newest_mtime
+            if newest is not None and (
+                parent.tree_newest_mtime is None or newest > parent.tree_newest_mtime
+            ):
+                parent.tree_newest_mtime = newest
+
+    def add_result(self, result: ScanResult) -> List[FileInfo]:
+        """Merge a partial result of a subtree under the same root.
+
+        Directories are re-registered, so their ids change; the directory_id
+        of every file in the result is remapped in place.
+
+        Args:
+            result: Partial scan result
+
+        Returns:
+            The result's files, with remapped directory ids
+        """
+        id_map: Dict[int, int] = {}
+        for dir_info in sorted(result.directories, key=lambda d: d.depth):
+            rel_path = str(dir_info.relative_path) if dir_info.depth else ''
+            merged = self.registry.register(rel_path, dir_info.depth)
+            merged.truncated = merged.truncated or dir_info.truncated
+            if dir_info.entry_count is not None:
+                merged.entry_count = dir_info.entry_count
+            if dir_info.mtime_ns is not None:
+                merged.mtime_ns = dir_info.mtime_ns
+                merged.inode = dir_info.inode
+            merged.file_count += dir_info.file_count
+            merged.size_bytes += dir_info.size_bytes
+            if dir_info.newest_mtime is not None and (
+                merged.newest_mtime is None or dir_info.newest_mtime > merged.newest_mtime
+            ):
+                merged.newest_mtime = dir_info.newest_mtime
+            id_map[dir_info.id] = merged.id
+
+        for file_info in result.files:
+            file_info.directory_id = id_map.get(file_info.directory_id)
+
+        for ext, stats in result.extension_stats.items():
+            merged_stats = self.extension_stats.setdefault(ext, {"count": 0, "size": 0})
+            merged_stats["count"] += stats["count"]
+            merged_stats["size"] += stats["size"]
+
+        self.total_files += result.total_files
+        self.total_size += result.total_size
+        self.pruned_dirs += result.pruned_dirs
+        self.reused_dirs += result.reused_dirs
+        self.duplicate_links += result.duplicate_links
+
+        # The result counted the size of each linked file once, at its link
+        # with the smallest path; settle that against earlier results
+        linked: Dict[Tuple[int, int], List[FileInfo]] = {}
+        for file_info in result.files:
+            if file_info.file_id is not None:
+                linked.setdefault(file_info.file_id, []).append(file_info)
+        for file_id, links in linked.items():
+            owner = min(links, key=lambda f: f.relative_path_str)
+            self.dedupe_link(
+                file_id,
+                owner.link_count,
+                owner.relative_path_str,
+                owner.directory_id,
+                owner.extension,
+                owner.size_bytes,
+                len(links)
+            )
+        self.interrupted = self.interrupted or result.interrupted
+        return result.files
+
+    def to_result(self, files: Optional[List[FileInfo]] = None) -> ScanResult:
+        """Create a ScanResult from the accumulated state.
+
+        Args:
+            files: Files to include; omit when they were consumed as a stream
+
+        Returns:
+            ScanResult whose totals cover every file seen
+        """
+        self.rollup()
+        return ScanResult(
+            root_path=self.root_path,
+            total_files=self.total_files,
+            total_size=self.total_size,
+            files=files if files is not None else [],
+            directories=self.registry.directories,
+            extension_stats=self.extension_stats,
+            pruned_dirs=self.pruned_dirs,
+            reused_dirs=self.reused_dirs,
+            interrupted=self.interrupted,
+            duplicate_links=self.duplicate_links
+        )
+
+    def to_columnar(self, columns: FileColumns) -> ColumnarScanResult:
+        """Create a ColumnarScanResult from the accumulated state.
+
+        Args:
+            columns: Columns holding the files of the scan
+
+        Returns:
+            ColumnarScanResult whose totals cover every file seen
+        """
+        self.rollup()
+        return ColumnarScanResult(
+            root_path=self.root_path,
+            total_files=self.total_files,
+            total_size=self.total_size,
+            columns=columns,
+            directories=self.registry.directories,
+            extension_stats=self.extension_stats,
+            pruned_dirs=self.pruned_dirs,
+            reused_dirs=self.reused_dirs,
+            interrupted=self.interrupted,
+            duplicate_links=self.duplicate_links
+        )
@@ -0,0 +1,82 @@
+"""Previous-scan baselines for incremental rescans."""
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from .models import FileInfo
+
+@dataclass(frozen=True)
+class BaselineDirectory:
+    """Stored state of a directory from a previous scan."""
+    mtime_ns: int
+    inode: int
+    subdirs: Tuple[str, ...] = ()
+
+    def matches(self, stats: os.stat_result) -> bool:
+        """Check whether a fresh stat shows the directory unchanged.
+
+        A directory's mtime changes whenever entries are added, removed or
+        renamed in it, but not when an existing file is rewritten in place.
+        """
+        return stats.st_mtime_ns == self.mtime_ns and stats.st_ino == self.inode
+
+class ScanBaseline(Protocol):
+    """Source of previously scanned directories and their files."""
+
+    def get_directory(self, relative_path: str) -> Optional[BaselineDirectory]:
+        """Get stored state for a directory ('' for the root)."""
+        ...
+
+    def get_files(self, relative_path: str) -> List[FileInfo]:
+        """Get the stored files directly inside a directory."""
+        ...
+
+class NestedRootBaseline:
+    """Baseline of a root assembled from the scans of roots inside it.
+
+    Lookups below a nested root are answered by that root's baseline, with
+    its files rebased onto the outer root; everything else goes to the
+    optional fallback, such as the outer root's own previous catalog.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        nested: Dict[str, ScanBaseline],
+        fallback: Optional[ScanBaseline] = None
+    ):
+        """Initialize baseline.
+
+        Args:
+            root_path: Outer root the lookups are relative to
+            nested: Baselines of nested roots by path relative to root_path
+            fallback: Optional baseline for paths outside nested roots
+        """
+        self.nested = nested
+        self.fallback = fallback
+        self._rel_offset = len(os.path.join(root_path, ''))
+
+    def _locate(self, relative_path: str) -> Tuple[Optional[ScanBaseline], str]:
+        """Find the baseline covering a path and the path relative to it."""
+        for prefix, baseline in self.nested.items():
+            if relative_path == prefix:
+                return baseline, ''
+            if relative_path.startswith(prefix + os.sep):
+                return baseline, relative_path[len(prefix) + 1:]
+        return self.fallback, relative_path
+
+    def get_directory(self, relative_path: str) -> Optional[BaselineDirectory]:
+        """Get stored state for a directory ('' for the root)."""
+        baseline, inner_path = self._locate(relative_path)
+        return baseline.get_directory(inner_path) if baseline else None
+
+    def get_files(self, relative_path: str) -> List[FileInfo]:
+        """Get the stored files directly inside a directory."""
+        baseline, inner_path = self._locate(relative_path)
+        if baseline is None:
+            return []
+        files = baseline.get_files(inner_path)
+        if baseline is self.fallback:
+            return files
+        # Same full paths; only the root-relative part starts earlier
+        return [replace(f, rel_offset=self._rel_offset) for f in files]
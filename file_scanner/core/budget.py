@@ -0,0 +1,162 @@
+"""I/O budgets and the token-bucket throttle enforcing them."""
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from datetime import time as time_of_day
+from typing import Callable, List, Optional, Tuple
+
+_WINDOW = re.compile(r'^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$')
+
+def parse_window(text: str) -> Tuple[time_of_day, time_of_day]:
+    """Parse a time-of-day window such as "08:00-18:00".
+
+    A window whose end is before its start runs past midnight.
+
+    Raises:
+        ValueError: If the text is not a valid window
+    """
+    match = _WINDOW.match(text.strip())
+    try:
+        if not match:
+            raise ValueError
+        h1, m1, h2, m2 = map(int, match.groups())
+        return time_of_day(h1, m1), time_of_day(h2, m2)
+    except ValueError:
+        raise ValueError(f"Invalid time window (expected HH:MM-HH:MM): {text}") from None
+
+@dataclass
+class IOBudget:
+    """Limits on the I/O a scan or hashing run may issue.
+
+    Operations are directory listings and stat calls, plus one per read
+    when hashing; bytes are file contents read. With windows, the limits
+    only apply during those times of day and I/O is unpaced outside them.
+    """
+    ops_per_sec: Optional[float] = None
+    bytes_per_sec: Optional[float] = None
+    windows: List[str] = field(default_factory=list)  # e.g. "08:00-18:00", local time
+
+    def __post_init__(self):
+        """Validate the rates and windows."""
+        for name in ('ops_per_sec', 'bytes_per_sec'):
+            rate = getattr(self, name)
+            if rate is not None and not 0 < rate < math.inf:
+                raise ValueError(f"{name} must be a positive number, got {rate}")
+        if self.windows is None:
+            self.windows = []
+        for window in self.windows:
+            parse_window(window)
+
+    def __bool__(self) -> bool:
+        return bool(self.ops_per_sec or self.bytes_per_sec)
+
+    def scaled(self, fraction: float) -> 'IOBudget':
+        """Get a share of this budget, e.g. for one of several processes."""
+        return replace(
+            self,
+            ops_per_sec=self.ops_per_sec * fraction if self.ops_per_sec else None,
+            bytes_per_sec=self.bytes_per_sec * fraction if self.bytes_per_sec else None
+        )
+
+class IOThrottle:
+    """Token-bucket scheduler pacing I/O to an IOBudget.
+
+    Each rate has a bucket holding up to BURST_SECONDS of tokens. acquire()
+    takes its tokens even if that overdraws the bucket and then sleeps,
+    outside the lock, until the debt is repaid; concurrent threads thus
+    queue up behind each other's reservations and the combined rate stays
+    within budget. One throttle is shared by all threads of a scan.
+    """
+
+    BURST_SECONDS = 1.0  # Tokens a bucket holds, in seconds of its rate
+    WINDOW_CHECK = 1.0  # Seconds between checks of the time-of-day windows
+
+    def __init__(
+        self,
+        budget: IOBudget,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        now: Callable[[], datetime] = datetime.now
+    ):
+        """Initialize throttle.
+
+        Args:
+            budget: Limits to enforce
+            clock: Monotonic time source, in seconds
+            sleep: Called with the seconds to wait
+            now: Local wall-clock time, for the windows
+        """
+        self.budget = budget
+        self._clock = clock
+        self._sleep = sleep
+        self._now = now
+        self._windows = [parse_window(window) for window in budget.windows]
+        self._lock = threading.Lock()
+        self._last = clock()
+        self._ops = budget.ops_per_sec * self.BURST_SECONDS if budget.ops_per_sec else 0.0
+        self._bytes = budget.bytes_per_sec * self.BURST_SECONDS if budget.bytes_per_sec else 0.0
+        self._window_checked: Optional[float] = None
+        self._active = True
+        self._throttled_until = float('-inf')
+        self.throttled_seconds = 0.0  # Total time callers were made to wait
+
+    def _in_window(self) -> bool:
+        """Check whether the current time of day falls in a window."""
+        current = self._now().time()
+        for start, end in self._windows:
+            if start <= end:
+                if start <= current < end:
+                    return True
+            elif current >= start or current < end:
+                return True
+        return False
+
+    def acquire(self, ops: int = 1, nbytes: int = 0) -> None:
+        """Wait until the budget allows the given I/O.
+
+        Callers that cannot know a size up front, such as reads near the
+        end of a file, may pay right after the I/O instead; the rate over
+        time is the same.
+
+        Args:
+            ops: Operations about to be issued
+            nbytes: Bytes about to be read
+        """
+        budget = self.budget
+        with self._lock:
+            now = self._clock()
+            if self._windows and (
+                self._window_checked is None or now - self._window_checked >= self.WINDOW_CHECK
+            ):
+                self._window_checked = now
+                self._active = self._in_window()
+            if not self._active:
+                return
+
+            elapsed = now - self._last
+            self._last = now
+            wait = 0.0
+            if budget.ops_per_sec:
+                rate = budget.ops_per_sec
+                self._ops = min(rate * self.BURST_SECONDS, self._ops + elapsed * rate) - ops
+                if self._ops < 0:
+                    wait = -self._ops / rate
+            if budget.bytes_per_sec:
+                rate = budget.bytes_per_sec
+                self._bytes = min(rate * self.BURST_SECONDS, self._bytes + elapsed * rate) - nbytes
+                if self._bytes < 0:
+                    wait = max(wait, -self._bytes / rate)
+            if wait > 0:
+                self.throttled_seconds += wait
+                self._throttled_until = max(self._throttled_until, now + wait)
+
+        if wait > 0:
+            self._sleep(wait)
+
+    @property
+    def throttled(self) -> bool:
+        """Whether I/O is being held back now or was within the last second."""
+        return self._clock() < self._throttled_until + 1.0
@@ -0,0 +1,40 @@
+"""Traversal checkpoints for resuming interrupted scans."""
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List, Tuple
+
+from .models import ScanOptions
+
+# (relative path, depth, recursive) of a directory still to be scanned
+FrontierEntry = Tuple[str, int, bool]
+
+@dataclass
+class ScanCheckpoint:
+    """Directories of a scan that have not been completely scanned yet.
+
+    Everything outside the frontier subtrees is finished. A frontier
+    directory may already have been partly cataloged (the one being listed
+    when the checkpoint was taken), so a resumed scan discards what was
+    stored for the frontier before walking it again.
+    """
+    frontier: List[FrontierEntry]
+    options: ScanOptions = field(default_factory=ScanOptions)
+    pruned_dirs: int = 0
+
+    def to_json(self) -> str:
+        """Serialize the checkpoint."""
+        return json.dumps({
+            'frontier': self.frontier,
+            'options': asdict(self.options),
+            'pruned_dirs': self.pruned_dirs
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> 'ScanCheckpoint':
+        """Deserialize a checkpoint."""
+        values = json.loads(data)
+        return cls(
+            frontier=[(rel, depth, recursive) for rel, depth, recursive in values['frontier']],
+            options=ScanOptions(**values['options']),
+            pruned_dirs=values.get('pruned_dirs', 0)
+        )
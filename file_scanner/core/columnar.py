@@ -0,0 +1,164 @@
+"""Compact column storage for large scan results."""
+import os
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union, overload
+
+from .models import DirectoryInfo, FileInfo, ScanResult
+from ..utils import format_size, get_extension
+
+class FileColumns:
+    """Per-file values stored as typed arrays.
+
+    A file costs one entry in each array plus its name in a shared string
+    table, instead of a FileInfo with its Path and datetime objects. The
+    directory of each file is stored as the id of a DirectoryInfo, from
+    which paths are rebuilt on access. Link counts are a column; the
+    (st_dev, st_ino) of the few multiply-linked files are kept by row in
+    a dict rather than as two more columns. The arrays support the buffer
+    protocol, so ``numpy.frombuffer(columns.sizes, dtype='int64')`` gives
+    a zero-copy NumPy view where NumPy is available.
+    """
+
+    def __init__(self):
+        """Initialize empty columns."""
+        self.names: List[str] = []  # String table
+        self._name_ids: Dict[str, int] = {}
+        self.name_ids = array('L')
+        self.directory_ids = array('l')
+        self.sizes = array('q')
+        self.mtimes = array('d')  # POSIX timestamps
+        self.ctimes = array('d')
+        self.link_counts = array('I')
+        self.file_ids: Dict[int, Tuple[int, int]] = {}  # Row -> (st_dev, st_ino) if linked
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def _intern(self, name: str) -> int:
+        """Get the string table id of a name, adding it if new."""
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def append(self, file_info: FileInfo) -> None:
+        """Store a file; its directory_id must be set.
+
+        Raises:
+            ValueError: If the file has no directory id
+        """
+        if file_info.directory_id is None:
+            raise ValueError(f"File has no directory id: {file_info.relative_path}")
+
+        if file_info.file_id is not None:
+            self.file_ids[len(self.sizes)] = file_info.file_id
+        self.name_ids.append(self._intern(file_info.name))
+        self.directory_ids.append(file_info.directory_id)
+        self.sizes.append(file_info.size_bytes)
+        self.mtimes.append(file_info.st_mtime)
+        self.ctimes.append(file_info.st_ctime)
+        self.link_counts.append(file_info.link_count)
+
+class FileView(Sequence[FileInfo]):
+    """Read-only sequence of FileInfo built on demand from columns."""
+
+    def __init__(
+        self, 
+        root_path: Path, 
+        columns: FileColumns, 
+        directories: List[DirectoryInfo]
+    ):
+        self.columns = columns
+        self.directories = directories
+        self._rel_offset = len(os.path.join(root_path, ''))
+        self._dir_paths: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @overload
+    def __getitem__(self, index: int) -> FileInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[FileInfo]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[FileInfo, List[FileInfo]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("file index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+    def _materialize(self, i: int) -> FileInfo:
+        """Create the FileInfo for row i."""
+        columns = self.columns
+        name = columns.names[columns.name_ids[i]]
+        directory_id = columns.directory_ids[i]
+        dir_path = self._dir_paths.get(directory_id)
+        if dir_path is None:
+            dir_path = self._dir_paths[directory_id] = str(self.directories[directory_id].path)
+        return FileInfo(
+            name=name,
+            path_str=os.path.join(dir_path, name),
+            rel_offset=self._rel_offset,
+            extension=get_extension(name),
+            size_bytes=columns.sizes[i],
+            st_ctime=columns.ctimes[i],
+            st_mtime=columns.mtimes[i],
+            is_hidden=name.startswith('.'),
+            directory_id=directory_id,
+            link_count=columns.link_counts[i],
+            file_id=columns.file_ids.get(i)
+        )
+
+@dataclass
+class ColumnarScanResult:
+    """Scan results with files held in FileColumns.
+
+    Has the same attributes as ScanResult; ``files`` is a lazy FileView, so
+    existing consumers keep working while only the columns stay resident.
+    """
+    root_path: Path
+    total_files: int
+    total_size: int
+    columns: FileColumns
+    directories: List[DirectoryInfo]
+    extension_stats: Dict[str, Dict[str, int]]
+    pruned_dirs: int = 0
+    reused_dirs: int = 0
+    interrupted: bool = False
+    duplicate_links: int = 0
+
+    @property
+    def files(self) -> FileView:
+        """Files of the scan, materialized on access."""
+        return FileView(self.root_path, self.columns, self.directories)
+
+    @property
+    def formatted_total_size(self) -> str:
+        """Get human-readable total size."""
+        return format_size(self.total_size)
+
+    def to_result(self) -> ScanResult:
+        """Materialize every file into a regular ScanResult."""
+        return ScanResult(
+            root_path=self.root_path,
+            total_files=self.total_files,
+            total_size=self.total_size,
+            files=list(self.files),
+            directories=self.directories,
+            extension_stats=self.extension_stats,
+            pruned_dirs=self.pruned_dirs,
+            reused_dirs=self.reused_dirs,
+            interrupted=self.interrupted,
+            duplicate_links=self.duplicate_links
+        )
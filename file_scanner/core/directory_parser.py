@@ -2,9 +2,12 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Set, Protocol
 from pathlib import Path
+import os
 import re
 from abc import ABC, abstractmethod
 
+from .models import ScanResult
+
 @dataclass
 class DirectoryGroup:
     """Group of related files in a directory."""
@@ -73,7 +76,11 @@ class DirectoryAnalyzer:
         self.groups: Dict[Path, DirectoryGroup] = {}
     
     def analyze_directory(self, root_path: Path) -> DirectoryGroup:
-        """Analyze directory structure and patterns.
+        """Analyze directory structure and patterns by listing the tree.
+        
+        Prefer analyze_scan() when the tree has just been scanned; this
+        lists every directory again. Symlinked directories are not
+        followed.
         
         Args:
             root_path: Root directory to analyze
@@ -81,81 +88,122 @@ class DirectoryAnalyzer:
         Returns:
             DirectoryGroup containing analysis results
         """
-        self.groups.clear()
-        return self._analyze_recursive(root_path, 0)
+        root = DirectoryGroup(path=root_path, level=0)
+        groups = [root]
+        pending = [root]
+        while pending:
+            group = pending.pop()
+            try:
+                with os.scandir(group.path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subgroup = DirectoryGroup(path=Path(entry.path), level=group.level + 1)
+                            group.subdirs.append(subgroup)
+                            groups.append(subgroup)
+                            pending.append(subgroup)
+                        elif entry.is_file():
+                            group.files.append(Path(entry.path))
+            except OSError as e:
+                # Log error but continue analysis
+                group.metadata['error'] = str(e)
+        
+        return self._analyze_groups(root, groups)
     
-    def _analyze_recursive(self, path: Path, level: int) -> DirectoryGroup:
-        """Recursively analyze directory structure.
+    def analyze_scan(self, result: ScanResult) -> DirectoryGroup:
+        """Analyze the directories and files of a scan.
+        
+        Uses only the scan's DirectoryInfo and FileInfo records, so the
+        filesystem is not touched and the groups cover exactly what the
+        scan included.
         
         Args:
-            path: Current directory path
-            level: Current directory depth
+            result: ScanResult or ColumnarScanResult
         
         Returns:
-            DirectoryGroup for current directory
+            DirectoryGroup of the scan root
         """
-        group = DirectoryGroup(path=path, level=level)
+        root = None
+        groups: Dict[str, DirectoryGroup] = {}
+        for directory in result.directories:
+            group = DirectoryGroup(path=directory.path, level=directory.depth)
+            groups[str(directory.path)] = group
+            if directory.depth == 0:
+                root = group
+        if root is None:
+            root = groups[str(result.root_path)] = DirectoryGroup(path=Path(result.root_path), level=0)
         
-        try:
-            # Get all files and directories
-            items = list(path.iterdir())
-            files = [f for f in items if f.is_file()]
-            dirs = [d for d in items if d.is_dir()]
-            
-            # Analyze files in current directory
-            group.files = files
-            group.file_count = len(files)
-            
-            # Find common patterns
-            if files:
-                # Get common prefix
-                names = [f.stem for f in files]
-                prefix = self._find_common_prefix(names)
-                if prefix and len(prefix) > 3:  # Minimum meaningful length
-                    group.common_prefix = prefix
-                
-                # Look for project codes
-                project_codes = set()
-                for name in names:
-                    code = self.matchers['project'].match(name)
-                    if code:
-                        project_codes.add(code)
-                
-                if len(project_codes) == 1:
-                    group.project_code = project_codes.pop()
-                elif len(project_codes) > 1:
-                    # Multiple projects - might be a project container
-                    group.metadata['projects'] = ', '.join(sorted(project_codes))
-                
-                # Detect naming pattern
-                pattern = self._detect_naming_pattern(files)
-                if pattern:
-                    group.pattern = pattern
-            
-            # Recursively analyze subdirectories
-            for subdir in dirs:
-                subgroup = self._analyze_recursive(subdir, level + 1)
-                group.subdirs.append(subgroup)
-                
-                # Inherit project code if subdirs have same code
-                if subgroup.project_code:
-                    if not group.project_code:
-                        group.project_code = subgroup.project_code
-                    elif group.project_code != subgroup.project_code:
-                        # Different project codes - mark as multi-project
-                        group.project_code = None
-                        if 'projects' not in group.metadata:
-                            group.metadata['projects'] = set()
-                        group.metadata['projects'].add(subgroup.project_code)
+        for directory in result.directories:
+            if directory.parent_path is not None:
+                parent = groups.get(str(directory.parent_path))
+                if parent is not None:
+                    parent.subdirs.append(groups[str(directory.path)])
+        
+        for file_info in result.files:
+            group = groups.get(os.path.dirname(file_info.path_str))
+            if group is not None:
+                group.files.append(Path(file_info.path_str))
+        
+        return self._analyze_groups(root, list(groups.values()))
+    
+    def _analyze_groups(self, root: DirectoryGroup, groups: List[DirectoryGroup]) -> DirectoryGroup:
+        """Detect patterns and project codes of linked groups, deepest first.
+        
+        Args:
+            root: Group of the root directory
+            groups: Every group of the tree, with files and subdirs filled in
+        
+        Returns:
+            The root group
+        """
+        self.groups.clear()
+        # Subdirectories are complete before their parent is visited
+        for group in sorted(groups, key=lambda g: g.level, reverse=True):
+            group.file_count = len(group.files)
+            project_codes = self._analyze_files(group)
             
-            # Store group
-            self.groups[path] = group
+            # Inherit project codes of subdirectories
+            project_codes.update(sub.project_code for sub in group.subdirs if sub.project_code)
+            if len(project_codes) == 1:
+                group.project_code = project_codes.pop()
+            elif len(project_codes) > 1:
+                # Multiple projects - might be a project container
+                group.metadata['projects'] = ', '.join(sorted(project_codes))
             
-        except Exception as e:
-            # Log error but continue analysis
-            group.metadata['error'] = str(e)
+            self.groups[group.path] = group
+        
+        return root
+    
+    def _analyze_files(self, group: DirectoryGroup) -> Set[str]:
+        """Find the common prefix and naming pattern of a group's files.
+        
+        Args:
+            group: Group whose files are analyzed
+        
+        Returns:
+            Project codes found in the file names
+        """
+        project_codes = set()
+        if not group.files:
+            return project_codes
+        
+        # Get common prefix
+        names = [f.stem for f in group.files]
+        prefix = self._find_common_prefix(names)
+        if prefix and len(prefix) > 3:  # Minimum meaningful length
+            group.common_prefix = prefix
+        
+        # Look for project codes
+        for name in names:
+            code = self.matchers['project'].match(name)
+            if code:
+                project_codes.add(code)
+        
+        # Detect naming pattern
+        pattern = self._detect_naming_pattern(group.files)
+        if pattern:
+            group.pattern = pattern
         
-        return group
+        return project_codes
     
     def _find_common_prefix(self, names: List[str]) -> Optional[str]:
         """Find common prefix among file names.
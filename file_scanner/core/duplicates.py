@@ -0,0 +1,167 @@
+"""Duplicate file detection by size, then edge hashes, then full hashes."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .hashing import FileHasher
+
+EDGE_BYTES = 64 * 1024  # Bytes hashed at each end of a file in the partial pass
+
+@dataclass
+class DuplicateCandidate:
+    """A file that may have duplicates."""
+    path: Path
+    size_bytes: int
+    file_id: Optional[Tuple[int, int]] = None  # (st_dev, st_ino) of hard-linked files
+
+@dataclass
+class DuplicateSet:
+    """Files with identical content."""
+    size_bytes: int
+    content_hash: str  # "algorithm:hex digest"
+    paths: List[Path]  # One path per distinct file
+    copies: int  # Distinct files, len(paths)
+    links: List[Path] = field(default_factory=list)  # Other hard links to those files
+
+    @property
+    def reclaimable_bytes(self) -> int:
+        """Get the bytes freed by keeping a single copy."""
+        return self.size_bytes * (self.copies - 1)
+
+@dataclass
+class DuplicateReport:
+    """Duplicate sets and what it took to find them."""
+    sets: List[DuplicateSet] = field(default_factory=list)  # Most reclaimable first
+    candidates: int = 0  # Distinct files sharing their size with another
+    edge_hashed: int = 0  # Files compared by their first and last blocks
+    full_hashed: int = 0  # Files hashed whole (or found in the cache)
+    bytes_read: int = 0
+    failed: int = 0  # Unreadable, or changed since they were cataloged
+
+    @property
+    def reclaimable_bytes(self) -> int:
+        """Get the bytes freed by keeping one copy of every set."""
+        return sum(s.reclaimable_bytes for s in self.sets)
+
+_Links = List[DuplicateCandidate]  # Paths of one file, hard links included
+_Key = Tuple[int, str]  # (size, content hash)
+_Groups = List[Tuple[_Key, List[_Links]]]
+
+class DuplicateFinder:
+    """Finds files with identical content.
+
+    Each pass only reads files that survived the previous one:
+
+    1. Files are bucketed by size; sizes held by a single file are
+       dropped without reading anything.
+    2. The first and last ``edge`` bytes of the remaining files are
+       hashed, and files without a match are dropped. Files of up to two
+       edges are hashed whole here, so they are settled in this pass.
+    3. The survivors are hashed whole, using the hasher's cache.
+
+    Candidates are grouped by (device, inode) first, so hard links to one
+    file are hashed once and never count as copies of each other; only
+    one path per file is listed in a set. Hashing runs on the
+    FileHasher's threads.
+    """
+
+    def __init__(self, hasher: FileHasher, edge: int = EDGE_BYTES):
+        """Initialize finder.
+
+        Args:
+            hasher: Hasher used for both hashing passes
+            edge: Bytes hashed at each end of a file in the partial pass
+        """
+        self.hasher = hasher
+        self.edge = edge
+
+    def find(self, files: Iterable[DuplicateCandidate]) -> DuplicateReport:
+        """Find duplicate sets.
+
+        Args:
+            files: Files to compare; filtering to sizes that occur more
+                than once beforehand (as the catalog does) saves memory
+
+        Returns:
+            DuplicateReport
+        """
+        report = DuplicateReport()
+
+        # Size buckets, each grouping a file's hard links under one identity
+        buckets: Dict[int, Dict[Hashable, _Links]] = {}
+        for candidate in files:
+            identity = candidate.file_id or candidate.path
+            buckets.setdefault(candidate.size_bytes, {}).setdefault(identity, []).append(candidate)
+
+        groups = [
+            list(bucket.values())
+            for bucket in buckets.values() if len(bucket) > 1
+        ]
+        report.candidates = sum(len(group) for group in groups)
+
+        # Partial pass; files of up to two edges are hashed whole
+        matches, settled = self._match(
+            (links for group in groups for links in group), report, self.edge
+        )
+        sets = [self._to_set(key, members) for key, members in settled]
+
+        # Full pass over the partial matches only
+        _, full = self._match(
+            (links for _, members in matches for links in members), report
+        )
+        sets.extend(self._to_set(key, members) for key, members in full)
+
+        sets.sort(key=lambda s: s.reclaimable_bytes, reverse=True)
+        report.sets = sets
+        return report
+
+    def _match(
+        self,
+        files: Iterable[_Links],
+        report: DuplicateReport,
+        edge: Optional[int] = None
+    ) -> Tuple[_Groups, _Groups]:
+        """Hash one path per file and group the files by size and digest.
+
+        Returns:
+            (groups matched on partial digests, groups matched on full
+            digests); only groups of two or more files are kept
+        """
+        partial: Dict[_Key, List[_Links]] = {}
+        full: Dict[_Key, List[_Links]] = {}
+
+        for result in self.hasher.hash_files(
+            ((links, links[0].path) for links in files), edge
+        ):
+            links = result.ref
+            size = links[0].size_bytes
+            if result.digest is None or result.size_bytes != size:
+                report.failed += 1
+                continue
+
+            if result.partial:
+                report.edge_hashed += 1
+                report.bytes_read += 2 * edge
+                groups = partial
+            else:
+                report.full_hashed += 1
+                if not result.cached:
+                    report.bytes_read += size
+                groups = full
+            groups.setdefault((size, result.content_hash), []).append(links)
+
+        return (
+            [(key, members) for key, members in partial.items() if len(members) > 1],
+            [(key, members) for key, members in full.items() if len(members) > 1]
+        )
+
+    @staticmethod
+    def _to_set(key: _Key, members: List[_Links]) -> DuplicateSet:
+        size, content_hash = key
+        paths = []
+        others = []
+        for links in members:
+            first, *rest = sorted(c.path for c in links)
+            paths.append(first)
+            others.extend(rest)
+        return DuplicateSet(size, content_hash, sorted(paths), len(members), sorted(others))
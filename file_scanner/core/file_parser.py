@@ -1,10 +1,56 @@
 """File name parsing and analysis."""
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
 from datetime import datetime
 from pathlib import Path
 
+_DIGIT = re.compile(r'\d')  # Every project, version, date and sequence pattern needs one
+
+def _stem(name: str) -> str:
+    """Get a file name without its last suffix, as Path.stem does."""
+    i = name.rfind('.')
+    return name[:i] if 0 < i < len(name) - 1 else name
+
+def _keyword_automaton(terms: Iterable[str]) -> Pattern:
+    """Compile terms into a pattern reporting each position where one starts.
+    
+    The match is a lookahead, so finditer() reports overlapping terms
+    in one scan; where several terms start at the same position, the
+    first in ``terms`` is reported.
+    """
+    return re.compile('(?=(' + '|'.join(map(re.escape, terms)) + '))')
+
+def _find_keyword(automaton: Pattern, rank: Dict[str, int], text: str) -> Optional[Tuple[str, int]]:
+    """Find the highest ranked term in a text and its first position.
+    
+    Args:
+        automaton: Pattern from _keyword_automaton() over the ranked terms
+        rank: Priority of each term, 0 first
+        text: Text to search
+    
+    Returns:
+        (term, position), or None if no term occurs
+    """
+    match = automaton.search(text)
+    if match is None:
+        return None
+    best = None
+    best_rank = len(rank)
+    for match in automaton.finditer(text, match.start()):
+        term = match.group(1)
+        if rank[term] < best_rank:
+            best, best_rank = (term, match.start()), rank[term]
+            if best_rank == 0:
+                break
+    return best
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str, format_str: str) -> datetime:
+    """Parse a date; the same few dates recur across many file names."""
+    return datetime.strptime(date_str, format_str)
+
 @dataclass(frozen=True)
 class NameComponent:
     """Component extracted from a file name."""
@@ -127,6 +173,16 @@ class FileNameParser:
         'ARCHIVED': 'Archived',
     }
     
+    # Compiled once for all parsers
+    _PROJECT_RES = [(re.compile(pattern), confidence) for pattern, confidence in PROJECT_PATTERNS]
+    _VERSION_RES = [re.compile(pattern) for pattern in VERSION_PATTERNS]
+    _DATE_RES = [(re.compile(pattern), format_str) for pattern, format_str in DATE_PATTERNS]
+    _SEQUENCE_RE = re.compile(r'_(\d+)(?=_|$)')
+    _DISCIPLINE_AUTOMATON = _keyword_automaton(DISCIPLINES)
+    _DISCIPLINE_RANK = {code: i for i, code in enumerate(DISCIPLINES)}
+    _STATUS_AUTOMATON = _keyword_automaton(STATUS_TERMS)
+    _STATUS_RANK = {term: i for i, term in enumerate(STATUS_TERMS)}
+    
     def parse_file_name(self, file_path: Path) -> ParsedName:
         """Parse a file name into components.
         
@@ -136,14 +192,75 @@ class FileNameParser:
         Returns:
             ParsedName containing extracted information
         """
-        # Initialize result
-        name = file_path.stem
+        return self.parse_name(file_path.stem)
+    
+    def parse_many(self, names: Iterable[str]) -> List[ParsedName]:
+        """Parse many file names.
+        
+        Takes names rather than paths, so callers holding the names from
+        a scan create no Path objects.
+        
+        Args:
+            names: File names, with their extensions
+        
+        Returns:
+            ParsedName for each name, in order
+        """
+        parse_name = self.parse_name
+        return [parse_name(_stem(name)) for name in names]
+    
+    def parse_name(self, name: str) -> ParsedName:
+        """Parse a file name without its extension into components.
+        
+        Each kind of pattern is tried in priority order; names without
+        digits skip the numeric ones. The discipline and status terms are
+        each found in one scan of the uppercased name.
+        
+        Args:
+            name: File name without extension
+        
+        Returns:
+            ParsedName containing extracted information
+        """
         result = ParsedName(original=name)
         components = []
+        if _DIGIT.search(name):
+            self._parse_numbers(name, result, components)
+        
+        upper = name.upper()
+        
+        # Extract discipline
+        found = _find_keyword(self._DISCIPLINE_AUTOMATON, self._DISCIPLINE_RANK, upper)
+        if found:
+            code, position = found
+            result.discipline = self.DISCIPLINES[code]
+            components.append(NameComponent(
+                type='discipline',
+                value=result.discipline,
+                position=position
+            ))
+        
+        # Extract status
+        found = _find_keyword(self._STATUS_AUTOMATON, self._STATUS_RANK, upper)
+        if found:
+            term, position = found
+            result.status = self.STATUS_TERMS[term]
+            components.append(NameComponent(
+                type='status',
+                value=result.status,
+                position=position
+            ))
         
+        # Store components sorted by position
+        result.components = sorted(components, key=lambda x: x.position)
+        
+        return result
+    
+    def _parse_numbers(self, name: str, result: ParsedName, components: List[NameComponent]) -> None:
+        """Extract the project code, version, date and sequence of a name."""
         # Extract project code
-        for pattern, confidence in self.PROJECT_PATTERNS:
-            match = re.search(pattern, name)
+        for pattern, confidence in self._PROJECT_RES:
+            match = pattern.search(name)
             if match:
                 code = match.group('code')
                 result.project_code = code
@@ -156,8 +273,8 @@ class FileNameParser:
                 break
         
         # Extract version
-        for pattern in self.VERSION_PATTERNS:
-            match = re.search(pattern, name)
+        for pattern in self._VERSION_RES:
+            match = pattern.search(name)
             if match:
                 version = match.group('version')
                 result.version = version
@@ -169,12 +286,12 @@ class FileNameParser:
                 break
         
         # Extract date
-        for pattern, format_str in self.DATE_PATTERNS:
-            match = re.search(pattern, name)
+        for pattern, format_str in self._DATE_RES:
+            match = pattern.search(name)
             if match:
                 try:
                     date_str = match.group('date')
-                    date = datetime.strptime(date_str, format_str)
+                    date = _parse_date(date_str, format_str)
                     result.date = date
                     components.append(NameComponent(
                         type='date',
@@ -186,7 +303,7 @@ class FileNameParser:
                     continue
         
         # Extract sequence numbers
-        seq_match = re.search(r'_(\d+)(?=_|$)', name)
+        seq_match = self._SEQUENCE_RE.search(name)
         if seq_match:
             seq = int(seq_match.group(1))
             result.sequence = seq
@@ -195,33 +312,6 @@ class FileNameParser:
                 value=str(seq),
                 position=seq_match.start()
             ))
-        
-        # Extract discipline
-        for code, desc in self.DISCIPLINES.items():
-            if code in name.upper():
-                result.discipline = desc
-                components.append(NameComponent(
-                    type='discipline',
-                    value=desc,
-                    position=name.upper().find(code)
-                ))
-                break
-        
-        # Extract status
-        for term, desc in self.STATUS_TERMS.items():
-            if term in name.upper():
-                result.status = desc
-                components.append(NameComponent(
-                    type='status',
-                    value=desc,
-                    position=name.upper().find(term)
-                ))
-                break
-        
-        # Store components sorted by position
-        result.components = sorted(components, key=lambda x: x.position)
-        
-        return result
     
     def get_category(self, file_path: Path) -> Optional[str]:
         """Get the category of a file based on its extension.
@@ -0,0 +1,251 @@
+"""Parallel content hashing with a persistent cache."""
+import hashlib
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Protocol, Set, Tuple
+
+from . import profiling
+from .budget import IOThrottle
+
+DEFAULT_ALGORITHM = 'blake2b'
+CHUNK_SIZE = 1 << 20  # Bytes read per call; one buffer of this size per thread
+
+# Identity of one version of a file: (st_dev, st_ino, st_size, st_mtime_ns)
+HashKey = Tuple[int, int, int, int]
+
+def hash_key(stats: os.stat_result) -> HashKey:
+    """Get the cache key of a file from its stat result."""
+    return (stats.st_dev, stats.st_ino, stats.st_size, stats.st_mtime_ns)
+
+class HashStore(Protocol):
+    """Protocol for digest caches (see database.hash_cache.HashCache).
+
+    get() is called from the hashing threads; put_many() only from the
+    thread consuming FileHasher.hash_files(), and close() once its
+    threads have stopped, to release what they opened.
+    """
+
+    def get(self, key: HashKey, algorithm: str) -> Optional[str]: ...
+
+    def put_many(self, entries: Iterable[Tuple[HashKey, str]], algorithm: str) -> None: ...
+
+    def close(self) -> None: ...
+
+@dataclass
+class HashResult:
+    """Outcome of hashing one file."""
+    ref: Any  # Caller's reference for the file, e.g. a FileInfo or row id
+    path: Path
+    digest: Optional[str] = None  # Hex digest, None if the file could not be hashed
+    size_bytes: int = 0
+    cached: bool = False  # Digest came from the cache
+    partial: bool = False  # Digest covers only the ends of the file
+    key: Optional[HashKey] = None
+    error: Optional[str] = None
+    algorithm: str = DEFAULT_ALGORITHM
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """Get the digest prefixed with its algorithm, as stored in catalogs."""
+        return None if self.digest is None else f"{self.algorithm}:{self.digest}"
+
+class FileHasher:
+    """Hashes file contents on a thread pool.
+
+    Files are read with readinto() into one reused buffer per thread, so
+    hashing allocates nothing per chunk; hashlib releases the GIL while
+    digesting large chunks, so threads scale on both I/O and CPU. Each
+    file is stat'ed first and its (dev, inode, size, mtime_ns) looked up
+    in the cache; only misses are read. A file whose stat changes while
+    it is read is reported as an error and not cached. With a throttle,
+    stats and reads are paced to its budget.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        algorithm: str = DEFAULT_ALGORITHM,
+        cache: Optional[HashStore] = None,
+        chunk_size: int = CHUNK_SIZE,
+        throttle: Optional[IOThrottle] = None
+    ):
+        """Initialize hasher.
+
+        Args:
+            workers: Threads reading and hashing files
+            algorithm: Any hashlib algorithm name
+            cache: Optional digest cache
+            chunk_size: Bytes read per call
+            throttle: Optional I/O budget shared by the hashing threads
+
+        Raises:
+            ValueError: If the algorithm is not available
+        """
+        hashlib.new(algorithm)  # Fail early on unknown names
+        self.workers = max(1, workers)
+        self.algorithm = algorithm
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.throttle = throttle
+        self._local = threading.local()
+
+    def _buffer(self) -> memoryview:
+        """Get this thread's read buffer."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = memoryview(bytearray(self.chunk_size))
+        return buffer
+
+    def hash_path(self, path: Path, offset: int = 0, length: Optional[int] = None) -> str:
+        """Hash a file, or a byte range of it.
+
+        Args:
+            path: File to read
+            offset: First byte to hash
+            length: Bytes to hash; the rest of the file if None
+
+        Returns:
+            Hex digest
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        digest = hashlib.new(self.algorithm)
+        with open(path, 'rb', buffering=0) as f:
+            self._update(digest, f, offset, length)
+        return digest.hexdigest()
+
+    def hash_edges(self, path: Path, size: int, edge: int) -> str:
+        """Hash the first and last ``edge`` bytes of a file.
+
+        Files of up to two edges are hashed whole, so for them the result
+        equals hash_path().
+
+        Args:
+            path: File to read
+            size: Size of the file
+            edge: Bytes hashed at each end
+
+        Returns:
+            Hex digest
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        if size <= 2 * edge:
+            return self.hash_path(path)
+        digest = hashlib.new(self.algorithm)
+        with open(path, 'rb', buffering=0) as f:
+            self._update(digest, f, 0, edge)
+            self._update(digest, f, size - edge, edge)
+        return digest.hexdigest()
+
+    def _update(self, digest: Any, f: BinaryIO, offset: int, length: Optional[int]) -> None:
+        """Feed a byte range of an open file to a digest."""
+        buffer = self._buffer()
+        remaining = length
+        f.seek(offset)
+        while remaining is None or remaining > 0:
+            view = buffer if remaining is None or remaining >= len(buffer) else buffer[:remaining]
+            n = f.readinto(view)
+            if self.throttle:
+                # Paid after the read, for the bytes actually read
+                self.throttle.acquire(1, n)
+            if not n:
+                break
+            digest.update(view[:n])
+            if remaining is not None:
+                remaining -= n
+
+    def _hash_one(self, ref: Any, path: Path, edge: Optional[int] = None) -> HashResult:
+        """Stat, look up and if needed hash one file (runs on a worker)."""
+        result = HashResult(ref, path, algorithm=self.algorithm)
+        try:
+            if self.throttle:
+                self.throttle.acquire()
+            stats = os.stat(path)
+            result.key = hash_key(stats)
+            result.size_bytes = stats.st_size
+            if edge is not None and stats.st_size > 2 * edge:
+                # Edge digests are cheap and never cached
+                with profiling.timed('hash.edges'):
+                    digest = self.hash_edges(path, stats.st_size, edge)
+                result.partial = True
+            else:
+                if self.cache is not None:
+                    with profiling.timed('hash.cache_lookup'):
+                        result.digest = self.cache.get(result.key, self.algorithm)
+                    if result.digest is not None:
+                        result.cached = True
+                        return result
+                with profiling.timed('hash.read'):
+                    digest = self.hash_path(path)
+
+            if self.throttle:
+                self.throttle.acquire()
+            if hash_key(os.stat(path)) != result.key:
+                result.error = "file changed while it was read"
+            else:
+                result.digest = digest
+        except OSError as e:
+            result.error = e.strerror or str(e)
+        return result
+
+    def hash_files(
+        self,
+        files: Iterable[Tuple[Any, Path]],
+        edge: Optional[int] = None
+    ) -> Iterator[HashResult]:
+        """Hash files in parallel.
+
+        Only a few files per worker are in flight, so the input can be a
+        stream over millions of catalog rows. New digests are written to
+        the cache as results are consumed, and the cache is closed once the
+        threads have stopped.
+
+        Args:
+            files: (reference, path) pairs; the reference is passed through
+            edge: If set, only hash this many bytes at each end of files
+                larger than two edges (see hash_edges); these partial
+                digests are not cached
+
+        Yields:
+            HashResult for each file, in completion order
+        """
+        files = iter(files)
+        pending: Set[Future] = set()
+        fresh = []
+
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="hasher") as pool:
+                try:
+                    while True:
+                        for ref, path in files:
+                            pending.add(pool.submit(self._hash_one, ref, path, edge))
+                            if len(pending) >= self.workers * 4:
+                                break
+                        if not pending:
+                            break
+
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            result = future.result()
+                            if result.digest is not None and not (result.cached or result.partial):
+                                fresh.append((result.key, result.digest))
+                            yield result
+
+                        if self.cache is not None and len(fresh) >= 1000:
+                            self.cache.put_many(fresh, self.algorithm)
+                            fresh = []
+                finally:
+                    for future in pending:
+                        future.cancel()
+                    if self.cache is not None and fresh:
+                        self.cache.put_many(fresh, self.algorithm)
+        finally:
+            # The pool has shut down, so no lookup is running
+            if self.cache is not None:
+                self.cache.close()
@@ -0,0 +1,254 @@
+"""Compiled ignore rules with .gitignore semantics."""
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Ignore files honored by --ignore-files when no names are given
+DEFAULT_IGNORE_FILES = ('.gitignore', '.scanignore')
+
+_GLOB_CHARS = re.compile(r'[*?\[\\]')
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """A single parsed ignore pattern."""
+    pattern: str  # Glob without the '!', leading '/' and trailing '/'
+    negated: bool = False  # '!' re-includes paths matched by earlier rules
+    dir_only: bool = False  # Trailing '/' matches directories only
+    anchored: bool = False  # Contains a '/', so it matches the path from base
+    base: str = ''  # Directory of the ignore file, relative to the scan root
+
+    @classmethod
+    def parse(cls, line: str, base: str = '') -> Optional['IgnoreRule']:
+        """Parse one line of an ignore file.
+
+        Returns:
+            IgnoreRule, or None for blank lines and comments
+        """
+        line = line.rstrip('\n')
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        line = stripped
+        if not line or line.startswith('#'):
+            return None
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith(('\\!', '\\#')):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if not line:
+            return None
+
+        return cls(line, negated, dir_only, anchored, base.replace(os.sep, '/'))
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                j = i + 2
+                if at_start and j < n and pattern[j] == '/':
+                    parts.append('(?:.*/)?')  # '**/': any leading directories
+                    i = j + 1
+                    continue
+                if at_start and j == n:
+                    parts.append('.*')  # '/**': everything inside
+                    i = j
+                    continue
+                i = j  # Other runs of '*' behave like a single one
+                while i < n and pattern[i] == '*':
+                    i += 1
+                parts.append('[^/]*')
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                parts.append(re.escape(c))  # Unclosed bracket is literal
+            else:
+                body = pattern[i + 1:j]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+class _RuleTable:
+    """Lookup structures for the rules that apply to one kind of entry.
+
+    Literal names and '*suffix' patterns go into hash tables. Anchored
+    patterns are bucketed by the first component of the path they match,
+    so only rules for the entry's top-level directory are tried. All other
+    patterns are joined into regexes whose alternatives are ordered from
+    the last rule to the first, so the alternative that matches is the
+    rule that takes precedence.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[int, IgnoreRule]]):
+        self.names: Dict[str, int] = {}
+        self.suffixes: Dict[int, Dict[str, int]] = {}  # Suffix length -> suffix -> rule
+        name_globs: List[Tuple[int, str]] = []
+        path_globs: Dict[str, List[Tuple[int, str]]] = {}  # First component -> globs
+        wild_globs: List[Tuple[int, str]] = []  # Anchored, first component is a glob
+
+        for index, rule in rules:
+            pattern = rule.pattern
+            if rule.anchored:
+                if rule.base:
+                    # The ignore file's directory is literal, never a glob
+                    head = rule.base.partition('/')[0]
+                    regex = re.escape(rule.base + '/') + _translate(pattern)
+                else:
+                    head = pattern.partition('/')[0]
+                    regex = _translate(pattern)
+                if not rule.base and _GLOB_CHARS.search(head):
+                    wild_globs.append((index, regex))
+                else:
+                    path_globs.setdefault(head, []).append((index, regex))
+            elif not _GLOB_CHARS.search(pattern):
+                self.names[pattern] = index
+            elif pattern.startswith('*') and not _GLOB_CHARS.search(pattern[1:]) and len(pattern) > 1:
+                suffix = pattern[1:]
+                self.suffixes.setdefault(len(suffix), {})[suffix] = index
+            else:
+                name_globs.append((index, _translate(pattern)))
+
+        self.name_regex = self._compile(name_globs)
+        self.path_regexes = {head: self._compile(globs) for head, globs in path_globs.items()}
+        self.wild_regex = self._compile(wild_globs)
+        self.suffix_lengths = sorted(self.suffixes)
+
+    @staticmethod
+    def _compile(globs: List[Tuple[int, str]]) -> Optional[Pattern]:
+        if not globs:
+            return None
+        return re.compile('|'.join(
+            f'(?P<r{index}>{regex})' for index, regex in reversed(globs)
+        ), re.DOTALL)
+
+    def match(self, rel_path: str, name: str) -> int:
+        """Get the index of the deciding rule, or -1 if none matches."""
+        best = self.names.get(name, -1)
+        for length in self.suffix_lengths:
+            if length > len(name):
+                break
+            index = self.suffixes[length].get(name[-length:], -1)
+            if index > best:
+                best = index
+        for regex, target in (
+            (self.name_regex, name),
+            (self.path_regexes.get(rel_path.partition('/')[0]), rel_path),
+            (self.wild_regex, rel_path)
+        ):
+            if regex is None:
+                continue
+            m = regex.fullmatch(target)
+            if m and int(m.lastgroup[1:]) > best:
+                best = int(m.lastgroup[1:])
+        return best
+
+class IgnoreMatcher:
+    """Compiled set of ignore rules.
+
+    Rules follow .gitignore semantics: the last matching rule decides, '!'
+    negates, a trailing '/' restricts a rule to directories, and a pattern
+    containing '/' is anchored to the directory of the file that defined it
+    (the scan root for ScanOptions.ignore_patterns); other patterns match
+    the entry name at any depth. As in git, a file inside an ignored
+    directory cannot be re-included, since the directory is never opened.
+
+    Matching costs a few hash lookups and at most three regex matches per
+    entry; only rules with wildcards in the entry name or the first path
+    component add alternatives to every match.
+    """
+
+    def __init__(self, rules: Sequence[IgnoreRule] = ()):
+        """Initialize matcher.
+
+        Args:
+            rules: Rules in precedence order, later rules winning
+        """
+        self.rules = tuple(rules)
+        indexed = list(enumerate(self.rules))
+        self._files = _RuleTable([(i, r) for i, r in indexed if not r.dir_only])
+        self._dirs = _RuleTable(indexed)
+
+    @classmethod
+    def from_patterns(cls, patterns: Iterable[str], base: str = '') -> 'IgnoreMatcher':
+        """Compile patterns, one .gitignore line each."""
+        return cls(cls._parse(patterns, base))
+
+    @staticmethod
+    def _parse(patterns: Iterable[str], base: str) -> List[IgnoreRule]:
+        rules = []
+        for line in patterns:
+            rule = IgnoreRule.parse(line, base)
+            if rule is not None:
+                rules.append(rule)
+        return rules
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def extend(self, patterns: Iterable[str], base: str) -> 'IgnoreMatcher':
+        """Get a matcher with rules from an ignore file in another directory.
+
+        Args:
+            patterns: Lines of the ignore file
+            base: Directory containing the file, relative to the scan root
+
+        Returns:
+            New matcher whose added rules take precedence, or this matcher
+            if the file has no rules
+        """
+        rules = self._parse(patterns, base)
+        return IgnoreMatcher(self.rules + tuple(rules)) if rules else self
+
+    def match(self, rel_path: str, is_dir: bool = False) -> Optional[bool]:
+        """Check a path against the rules.
+
+        Args:
+            rel_path: Path relative to the scan root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if ignored, False if re-included by a negated rule,
+            None if no rule matches
+        """
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        name = rel_path.rpartition('/')[2]
+        index = (self._dirs if is_dir else self._files).match(rel_path, name)
+        if index < 0:
+            return None
+        return not self.rules[index].negated
+
+    def ignores(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check whether a path is ignored."""
+        return self.match(rel_path, is_dir) is True
@@ -0,0 +1,131 @@
+"""Minimal Linux inotify binding using ctypes."""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .models import WatchError
+
+# Event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+@dataclass
+class InotifyEvent:
+    """A single inotify event."""
+    wd: int
+    mask: int
+    cookie: int
+    name: str  # Entry name inside the watched directory; '' for the directory itself
+
+    @property
+    def is_dir(self) -> bool:
+        """Check whether the event refers to a directory."""
+        return bool(self.mask & IN_ISDIR)
+
+class Inotify:
+    """An inotify instance whose events are read in batches."""
+
+    def __init__(self):
+        """Create the inotify instance.
+
+        Raises:
+            WatchError: If inotify is not available on this platform
+        """
+        if not sys.platform.startswith('linux'):
+            raise WatchError("Watching requires Linux inotify")
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise WatchError(f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._poll = select.poll()
+        self._poll.register(self.fd, select.POLLIN)
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """Watch a path, returning its watch descriptor.
+
+        Watching an already watched inode returns the existing descriptor.
+
+        Raises:
+            OSError: If the watch could not be added (e.g. ENOSPC when
+                fs.inotify.max_user_watches is exhausted)
+        """
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching a descriptor; errors for stale descriptors are ignored."""
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: Optional[float] = None) -> List[InotifyEvent]:
+        """Wait for events and return everything currently queued.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            Events in arrival order; empty if the timeout expired
+        """
+        if not self._poll.poll(None if timeout is None else int(timeout * 1000)):
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        """Close the inotify instance and drop all watches."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self) -> 'Inotify':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,249 @@
+"""Memory sampling at phase boundaries and sizes of scan data structures."""
+import json
+import os
+import sys
+import tracemalloc
+import types
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SAMPLE_SIZE = 1000  # Elements measured per large collection
+_OWN_REFS = 3  # References deep_sizeof itself holds to a child it inspects
+
+# Shared by everything; never counted
+_SKIP = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, type(None), bool
+)
+
+def current_rss() -> Optional[int]:
+    """Get the resident set size of this process in bytes, if known."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def peak_rss() -> Optional[int]:
+    """Get the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # KiB on Linux
+
+def _children(obj: Any) -> Optional[List[Any]]:
+    """Get the objects an object refers to, or None for leaves."""
+    if isinstance(obj, dict):
+        return [*obj.keys(), *obj.values()]
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return list(obj)
+    refs = []
+    if hasattr(obj, '__dict__'):
+        refs.append(obj.__dict__)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if name != '__dict__' and hasattr(obj, name):
+                refs.append(getattr(obj, name))
+    return refs or None
+
+def deep_sizeof(obj: Any, sample_size: int = SAMPLE_SIZE) -> int:
+    """Estimate the memory held by an object and everything it refers to.
+
+    Collections with more than ``sample_size`` elements are measured on
+    evenly spaced elements and extrapolated, so sizing millions of
+    entries takes seconds. Objects reached twice count once. Within a
+    sampled collection, an object with several references, such as a
+    string held by both a list and a dict, or a directory group shared by
+    many files, counts a share per reference reached instead, so it
+    counts once in expectation however the sample falls; what it refers
+    to is only counted at the first share. Classes, modules and functions
+    are not counted. Native memory, such as Qt's, is invisible to this
+    function.
+
+    Args:
+        obj: Object to measure
+        sample_size: Elements measured per large collection
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set()
+    total = 0.0
+    stack = [(obj, 1.0, False)]
+    while stack:
+        current, weight, share = stack.pop()
+        if isinstance(current, _SKIP):
+            continue
+        if id(current) in seen:
+            if share:
+                total += sys.getsizeof(current) * weight
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current) * weight
+
+        children = _children(current)
+        if not children:
+            continue
+        if len(children) > sample_size:
+            step = len(children) / sample_size
+            weight *= step
+            children = [children[int(i * step)] for i in range(sample_size)]
+        if weight == 1.0:
+            stack.extend((child, weight, False) for child in children)
+            continue
+        for child in children:
+            # Held by the parent, this list, the loop and the call when not shared
+            owners = sys.getrefcount(child) - _OWN_REFS
+            if owners > 1:
+                stack.append((child, weight / owners, True))
+            else:
+                stack.append((child, weight, False))
+    return int(total)
+
+@dataclass
+class MemorySample:
+    """Memory in use at a phase boundary."""
+    label: str
+    rss_bytes: Optional[int]
+    traced_bytes: int  # Python allocations alive now
+    traced_peak_bytes: int  # Highest Python allocations since the previous sample
+
+@dataclass
+class ContainerSize:
+    """Memory held by one data structure."""
+    name: str
+    size_bytes: int
+    files: int  # Files the structure describes
+    method: str  # "deep size", or "rss delta" for native memory
+
+    @property
+    def bytes_per_file(self) -> float:
+        return self.size_bytes / self.files if self.files else 0.0
+
+@dataclass
+class MemoryReport:
+    """Samples, container sizes and top allocation sites of a run."""
+    samples: List[MemorySample] = field(default_factory=list)
+    containers: List[ContainerSize] = field(default_factory=list)
+    peak_rss_bytes: Optional[int] = None
+    top_sites: List[Tuple[str, int]] = field(default_factory=list)  # (file:line, bytes)
+    tracemalloc_bytes: int = 0  # Held by tracemalloc itself, included in RSS
+
+    def to_json(self) -> str:
+        """Serialize the report, with bytes per file for each container."""
+        data = asdict(self)
+        for container, values in zip(self.containers, data['containers']):
+            values['bytes_per_file'] = container.bytes_per_file
+        return json.dumps(data, indent=2)
+
+class MemoryProfiler:
+    """Records memory at phase boundaries and the size of containers.
+
+    Samples take the RSS and tracemalloc's current and peak traced
+    memory; the peak is reset at each sample, so it is the peak within
+    the phase that just ended. Containers are sized with deep_sizeof(),
+    and native structures such as the Qt model by the RSS growth around
+    the code filling them (add_native). Containers sharing objects each
+    count the shared objects in full.
+
+    tracemalloc slows allocation-heavy code severalfold; it is only
+    started while this profiler runs.
+    """
+
+    def __init__(self, frames: int = 1):
+        """Initialize profiler and start tracing allocations.
+
+        Args:
+            frames: Stack frames stored per allocation
+        """
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(frames)
+        self.samples: List[MemorySample] = []
+        self._containers: Dict[str, ContainerSize] = {}
+        self._top_sites: List[Tuple[str, int]] = []
+        self._tracemalloc_bytes = 0
+        self.checkpoint('start')
+
+    def checkpoint(self, label: str) -> MemorySample:
+        """Record memory in use at the end of a phase."""
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        sample = MemorySample(label, current_rss(), current, peak)
+        self.samples.append(sample)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        return sample
+
+    def measure(self, name: str, container: Any, files: int) -> ContainerSize:
+        """Record the deep size of a data structure.
+
+        Args:
+            name: Name to report, e.g. "ScanResult.files"
+            container: The structure
+            files: Files it describes, for the per-file size
+        """
+        size = ContainerSize(name, deep_sizeof(container), files, 'deep size')
+        self._containers[name] = size
+        return size
+
+    def add_native(self, name: str, nbytes: int, files: int) -> None:
+        """Add memory measured outside the Python heap, e.g. RSS growth."""
+        size = self._containers.setdefault(name, ContainerSize(name, 0, 0, 'rss delta'))
+        size.size_bytes += nbytes
+        size.files += files
+
+    def stop(self, top: int = 10) -> None:
+        """Record the top allocation sites and stop tracing."""
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        self._top_sites = [
+            (str(stat.traceback), stat.size)
+            for stat in snapshot.statistics('lineno')[:top]
+        ]
+        self._tracemalloc_bytes = tracemalloc.get_tracemalloc_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def report(self) -> MemoryReport:
+        """Get everything recorded so far."""
+        return MemoryReport(
+            samples=list(self.samples),
+            containers=list(self._containers.values()),
+            peak_rss_bytes=peak_rss(),
+            top_sites=list(self._top_sites),
+            tracemalloc_bytes=self._tracemalloc_bytes
+        )
+
+_active: Optional[MemoryProfiler] = None
+
+def enable(frames: int = 1) -> MemoryProfiler:
+    """Start tracing allocations and recording samples."""
+    global _active
+    _active = MemoryProfiler(frames)
+    return _active
+
+def disable() -> Optional[MemoryProfiler]:
+    """Stop tracing; returns the profiler that was active, stopped."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+def active() -> Optional[MemoryProfiler]:
+    """Get the active memory profiler, or None when it is off."""
+    return _active
+
+def checkpoint(label: str) -> None:
+    """Record a phase boundary if memory profiling is on."""
+    if _active is not None:
+        _active.checkpoint(label)
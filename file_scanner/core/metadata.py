@@ -1,12 +1,13 @@
 """File metadata and pattern analysis."""
 from dataclasses import dataclass, field
-from typing import List, Set, Dict, Optional
+from typing import Iterable, List, Set, Dict, Optional
 from datetime import datetime
 import re
 from pathlib import Path
 
 from .file_parser import FileNameParser, ParsedName
 from .directory_parser import DirectoryAnalyzer, DirectoryGroup
+from .models import ScanResult
 
 @dataclass(frozen=True)  # Make it immutable and hashable
 class FilePattern:
@@ -180,26 +181,33 @@ class AutoTagger:
         
         # Add directory-based tags
         if directory_group:
-            if directory_group.project_code:
-                tags.add(FileTag(
-                    name=f"dir_project:{directory_group.project_code}",
-                    source='auto',
-                    confidence=0.95
-                ))
-            
-            if directory_group.pattern:
-                tags.add(FileTag(
-                    name=f"dir_pattern:{directory_group.pattern}",
-                    source='auto',
-                    confidence=0.9
-                ))
-            
-            if 'projects' in directory_group.metadata:
-                tags.add(FileTag(
-                    name="multi_project_dir",
-                    source='auto',
-                    confidence=0.9
-                ))
+            tags.update(self.directory_tags(directory_group))
+        
+        return tags
+    
+    def directory_tags(self, directory_group: DirectoryGroup) -> Set[FileTag]:
+        """Generate the tags a file gets from its directory group."""
+        tags = set()
+        if directory_group.project_code:
+            tags.add(FileTag(
+                name=f"dir_project:{directory_group.project_code}",
+                source='auto',
+                confidence=0.95
+            ))
+        
+        if directory_group.pattern:
+            tags.add(FileTag(
+                name=f"dir_pattern:{directory_group.pattern}",
+                source='auto',
+                confidence=0.9
+            ))
+        
+        if 'projects' in directory_group.metadata:
+            tags.add(FileTag(
+                name="multi_project_dir",
+                source='auto',
+                confidence=0.9
+            ))
         
         return tags
     
@@ -237,13 +245,50 @@ class MetadataService:
         self.current_root = root_path
         return self.directory_analyzer.analyze_directory(root_path)
     
+    def analyze_scan(self, result: ScanResult) -> DirectoryGroup:
+        """Analyze directory structure from scan results, without listing it again."""
+        self.current_root = Path(result.root_path)
+        return self.directory_analyzer.analyze_scan(result)
+    
+    def apply_directory_groups(self, file_paths: Iterable[Path]) -> List[FileMetadata]:
+        """Add the groups of the last analyze_scan() to files analyzed before it.
+        
+        For files streamed in before their directories were complete; their
+        directory group and the tags derived from it are filled in.
+        
+        Args:
+            file_paths: Paths of analyzed files
+        
+        Returns:
+            Updated metadata of each file
+        """
+        metadata_list = []
+        for file_path in file_paths:
+            metadata = self.metadata.get(file_path) or FileMetadata(file_path)
+            group = self.directory_analyzer.get_group_for_file(file_path)
+            metadata.directory_group = group
+            if group:
+                metadata.tags.update(self.auto_tagger.directory_tags(group))
+            self.metadata[file_path] = metadata
+            metadata_list.append(metadata)
+        return metadata_list
+    
     def analyze_file(self, file_path: Path) -> FileMetadata:
         """Analyze a file and generate metadata."""
+        return self._analyze_file(file_path, self.file_parser.parse_file_name(file_path))
+    
+    def analyze_files(self, file_paths: List[Path]) -> List[FileMetadata]:
+        """Analyze a batch of files, parsing their names in one call."""
+        parsed_names = self.file_parser.parse_many([file_path.name for file_path in file_paths])
+        return [
+            self._analyze_file(file_path, parsed_name)
+            for file_path, parsed_name in zip(file_paths, parsed_names)
+        ]
+    
+    def _analyze_file(self, file_path: Path, parsed_name: ParsedName) -> FileMetadata:
+        """Generate metadata for a file whose name is already parsed."""
         # Get or create metadata
         metadata = self.metadata.get(file_path) or FileMetadata(file_path)
-        
-        # Parse file name
-        parsed_name = self.file_parser.parse_file_name(file_path)
         metadata.parsed_name = parsed_name
         
         # Get directory group if available
@@ -2,20 +2,142 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional
+from functools import cached_property
+from pathlib import Path, PurePath
+from typing import Dict, List, Optional, Tuple
 
-@dataclass
+from .budget import IOBudget
+
+@dataclass(init=False)
 class FileInfo:
-    """Information about a single file in the system."""
+    """Information about a single file in the system.
+    
+    Holds the path string and raw stat timestamps as listed; the Path and
+    datetime attributes are created on first access and then cached.
+    
+    The original constructor form, with ``path``, ``relative_path``,
+    ``created_date`` and ``modified_date`` given by keyword or position,
+    is still accepted and converted as from_values() does.
+    """
     name: str
-    path: Path
-    relative_path: Path
+    path_str: str  # Full path as listed
+    rel_offset: int  # Start of the root-relative part of path_str
     extension: Optional[str]
     size_bytes: int
-    created_date: datetime
-    modified_date: datetime
+    st_ctime: float
+    st_mtime: float
     is_hidden: bool
+    directory_id: Optional[int] = None  # Id of the parent DirectoryInfo
+    link_count: int = 1  # Hard links to the file (st_nlink)
+    file_id: Optional[Tuple[int, int]] = None  # (st_dev, st_ino) if link_count > 1 or links are followed
+    
+    def __init__(
+        self,
+        name: str,
+        path_str: Optional[str] = None,
+        rel_offset: Optional[int] = None,
+        extension: Optional[str] = None,
+        size_bytes: int = 0,
+        st_ctime: Optional[float] = None,
+        st_mtime: Optional[float] = None,
+        is_hidden: bool = False,
+        directory_id: Optional[int] = None,
+        link_count: int = 1,
+        file_id: Optional[Tuple[int, int]] = None,
+        *,
+        path: Optional[Path] = None,
+        relative_path: Optional[Path] = None,
+        created_date: Optional[datetime] = None,
+        modified_date: Optional[datetime] = None
+    ):
+        """Initialize from raw values, or from the original materialized ones.
+        
+        Raises:
+            TypeError: If neither the path string nor the path is given
+        """
+        if type(path_str) is not str:
+            if isinstance(path_str, PurePath):
+                # Original positional form: path, relative_path, ..., created_date, modified_date
+                path, relative_path, created_date, modified_date = path_str, rel_offset, st_ctime, st_mtime
+            elif path is None:
+                raise TypeError("FileInfo needs path_str or path")
+        if path is not None:
+            path_str = str(path)
+            rel_offset = len(path_str) - len(str(relative_path))
+            st_ctime = created_date.timestamp()
+            st_mtime = modified_date.timestamp()
+            # Seed the cached attributes instead of recomputing them
+            self.path = path
+            self.relative_path = relative_path
+            self.created_date = created_date
+            self.modified_date = modified_date
+        
+        self.name = name
+        self.path_str = path_str
+        self.rel_offset = rel_offset
+        self.extension = extension
+        self.size_bytes = size_bytes
+        self.st_ctime = st_ctime
+        self.st_mtime = st_mtime
+        self.is_hidden = is_hidden
+        self.directory_id = directory_id
+        self.link_count = link_count
+        self.file_id = file_id
+    
+    @classmethod
+    def from_values(
+        cls,
+        name: str,
+        path: Path,
+        relative_path: Path,
+        extension: Optional[str],
+        size_bytes: int,
+        created_date: datetime,
+        modified_date: datetime,
+        is_hidden: bool,
+        directory_id: Optional[int] = None,
+        link_count: int = 1,
+        file_id: Optional[Tuple[int, int]] = None
+    ) -> 'FileInfo':
+        """Create a FileInfo from already materialized values."""
+        return cls(
+            name,
+            extension=extension,
+            size_bytes=size_bytes,
+            is_hidden=is_hidden,
+            directory_id=directory_id,
+            link_count=link_count,
+            file_id=file_id,
+            path=path,
+            relative_path=relative_path,
+            created_date=created_date,
+            modified_date=modified_date
+        )
+    
+    @property
+    def relative_path_str(self) -> str:
+        """Get the path relative to the scan root as a string."""
+        return self.path_str[self.rel_offset:]
+    
+    @cached_property
+    def path(self) -> Path:
+        """Get the full path."""
+        return Path(self.path_str)
+    
+    @cached_property
+    def relative_path(self) -> Path:
+        """Get the path relative to the scan root."""
+        return Path(self.relative_path_str)
+    
+    @cached_property
+    def created_date(self) -> datetime:
+        """Get the creation (ctime) date."""
+        return datetime.fromtimestamp(self.st_ctime)
+    
+    @cached_property
+    def modified_date(self) -> datetime:
+        """Get the modification date."""
+        return datetime.fromtimestamp(self.st_mtime)
 
     @property
     def formatted_size(self) -> str:
@@ -36,6 +158,20 @@ class DirectoryInfo:
     relative_path: Path
     depth: int
     parent_path: Optional[Path]
+    id: Optional[int] = None  # Assigned by DirectoryRegistry
+    parent_id: Optional[int] = None
+    truncated: bool = False  # Subdirectories not scanned due to max_depth
+    entry_count: Optional[int] = None  # Direct entries, recorded when truncated
+    mtime_ns: Optional[int] = None  # Directory mtime when it was listed
+    inode: Optional[int] = None
+    # Files directly inside the directory
+    file_count: int = 0
+    size_bytes: int = 0  # Hard-linked files count at their link with the smallest path
+    newest_mtime: Optional[float] = None  # POSIX timestamp of the newest file
+    # Whole subtree, filled in by ScanAccumulator.rollup()
+    tree_file_count: int = 0
+    tree_size_bytes: int = 0
+    tree_newest_mtime: Optional[float] = None
 
     @property
     def name(self) -> str:
@@ -51,6 +187,10 @@ class ScanResult:
     files: List[FileInfo]
     directories: List[DirectoryInfo]
     extension_stats: Dict[str, Dict[str, int]]
+    pruned_dirs: int = 0  # Subtrees skipped by hidden/ignore rules
+    interrupted: bool = False  # Scan was cancelled; results are partial
+    reused_dirs: int = 0  # Unchanged directories taken from a baseline
+    duplicate_links: int = 0  # Extra hard links to files whose size is already counted
 
     @property
     def formatted_total_size(self) -> str:
@@ -69,13 +209,24 @@ class ScanOptions:
     """Configuration options for directory scanning."""
     max_depth: Optional[int] = None
     follow_links: bool = False
-    ignore_patterns: List[str] = field(default_factory=list)
+    ignore_patterns: List[str] = field(default_factory=list)  # .gitignore syntax, anchored at the root
     include_hidden: bool = True
+    workers: int = 1  # Threads listing directories concurrently
+    processes: int = 1  # Worker processes scanning separate subtrees
+    ignore_files: List[str] = field(default_factory=list)  # e.g. .gitignore, read in every directory
+    io_budget: Optional[IOBudget] = None  # Pace listings and stats
 
     def __post_init__(self):
-        """Ensure ignore_patterns is a list."""
+        """Ensure pattern lists are lists and worker counts are positive."""
         if self.ignore_patterns is None:
             self.ignore_patterns = []
+        if self.ignore_files is None:
+            self.ignore_files = []
+        if isinstance(self.io_budget, dict):
+            # Options restored from a checkpoint's JSON
+            self.io_budget = IOBudget(**self.io_budget)
+        self.workers = max(1, self.workers or 1)
+        self.processes = max(1, self.processes or 1)
 
 # Domain Exceptions
 class ScanError(Exception):
@@ -89,3 +240,7 @@ class AccessError(ScanError):
 class InvalidPathError(ScanError):
     """Raised when a path is invalid or doesn't exist."""
     pass
+
+class WatchError(ScanError):
+    """Raised when a directory tree cannot be watched for changes."""
+    pass
@@ -0,0 +1,165 @@
+"""Named timers and counters for profiling the phases of a scan."""
+import json
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Callable, ContextManager, Dict, List, Optional
+
+@dataclass
+class PhaseTiming:
+    """Time spent under one timer name."""
+    seconds: float = 0.0  # Excluding timers nested inside
+    calls: int = 0
+
+@dataclass
+class ProfileReport:
+    """Timers and counters collected by a Profiler."""
+    wall_seconds: float
+    timers: Dict[str, PhaseTiming] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    threads: int = 1  # Threads that recorded anything
+
+    def phases(self) -> Dict[str, float]:
+        """Get the seconds of each phase, the part of a name before the first dot."""
+        totals: Dict[str, float] = {}
+        for name, timing in self.timers.items():
+            phase = name.split('.', 1)[0]
+            totals[phase] = totals.get(phase, 0.0) + timing.seconds
+        return totals
+
+    def to_json(self) -> str:
+        """Serialize the report, with the phase totals."""
+        data = asdict(self)
+        data['phases'] = self.phases()
+        return json.dumps(data, indent=2)
+
+class _Timer:
+    """Context manager adding its time, minus nested timers, to a name."""
+
+    __slots__ = ('profiler', 'name', 'start', 'nested')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> '_Timer':
+        self.nested = 0.0
+        self.profiler._stack().append(self)
+        self.start = self.profiler._clock()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = self.profiler._clock() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        self.profiler.add_time(self.name, elapsed - self.nested)
+
+class Profiler:
+    """Collects named timers and counters from any number of threads.
+
+    Each thread records into its own tables, merged by report(), so
+    recording takes no locks. Timers nest: a timer's time excludes that
+    of timers entered inside it, so the timers of a thread add up to the
+    time it spent in them and phases can be compared directly. Names are
+    "phase.detail", e.g. "stat.file"; report().phases() sums by phase.
+
+    Code on hot paths checks active() once and skips recording when it
+    returns None, so a disabled profiler costs a global lookup.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """Initialize profiler.
+
+        Args:
+            clock: Time source, in seconds
+        """
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._tables: List[tuple] = []  # (timers, counters, timer stack) of every thread
+        self.started = clock()
+        self.stopped: Optional[float] = None
+
+    def _thread_tables(self) -> tuple:
+        tables = getattr(self._local, 'tables', None)
+        if tables is None:
+            tables = self._local.tables = ({}, {}, [])
+            with self._lock:
+                self._tables.append(tables)
+        return tables
+
+    def _stack(self) -> List[_Timer]:
+        return self._thread_tables()[2]
+
+    def timer(self, name: str) -> _Timer:
+        """Get a context manager timing the code it wraps under a name."""
+        return _Timer(self, name)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Record time measured elsewhere."""
+        timers = self._thread_tables()[0]
+        timing = timers.get(name)
+        if timing is None:
+            timers[name] = PhaseTiming(seconds, calls)
+        else:
+            timing.seconds += seconds
+            timing.calls += calls
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add to a counter."""
+        counters = self._thread_tables()[1]
+        counters[name] = counters.get(name, 0) + n
+
+    def stop(self) -> None:
+        """Fix the wall time reported from now on."""
+        if self.stopped is None:
+            self.stopped = self._clock()
+
+    def report(self) -> ProfileReport:
+        """Merge the tables of all threads into a report."""
+        end = self.stopped if self.stopped is not None else self._clock()
+        report = ProfileReport(wall_seconds=end - self.started)
+        with self._lock:
+            tables = list(self._tables)
+        report.threads = max(1, sum(1 for timers, counters, _ in tables if timers or counters))
+        for timers, counters, _ in tables:
+            for name, timing in list(timers.items()):
+                merged = report.timers.setdefault(name, PhaseTiming())
+                merged.seconds += timing.seconds
+                merged.calls += timing.calls
+            for name, value in list(counters.items()):
+                report.counters[name] = report.counters.get(name, 0) + value
+        return report
+
+_active: Optional[Profiler] = None
+_NULL = nullcontext()
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """Start recording into a new or given profiler."""
+    global _active
+    _active = profiler or Profiler()
+    return _active
+
+def disable() -> Optional[Profiler]:
+    """Stop recording; returns the profiler that was active, stopped."""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+def active() -> Optional[Profiler]:
+    """Get the active profiler, or None when profiling is off."""
+    return _active
+
+def timed(name: str) -> ContextManager:
+    """Time a block under a name if profiling is on.
+
+    Costs a function call when off; per-file code should check active()
+    instead.
+    """
+    profiler = _active
+    return profiler.timer(name) if profiler is not None else _NULL
@@ -0,0 +1,135 @@
+"""Rate-limited scan progress with throughput and ETA."""
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..utils import format_duration, format_size
+
+@dataclass
+class ScanProgress:
+    """Snapshot of a running scan."""
+    files: int
+    bytes: int
+    directories: int
+    elapsed: float  # Seconds since the scan started
+    files_per_sec: float
+    bytes_per_sec: float
+    expected_files: Optional[int] = None  # Estimate, e.g. from the previous scan
+    eta: Optional[float] = None  # Seconds remaining, if an estimate exists
+    throttled: bool = False  # The I/O budget is holding the scan back
+
+    @property
+    def percentage(self) -> int:
+        """Get completion percentage, or -1 when unknown."""
+        if not self.expected_files:
+            return -1
+        # Estimates can be low; never claim completion before the scan ends
+        return min(99, int(self.files * 100 / self.expected_files))
+
+    def describe(self) -> str:
+        """Get a one-line status message."""
+        status = (
+            f"Scanning files... {self.files:,} found, {format_size(self.bytes)} "
+            f"({self.files_per_sec:,.0f} files/s, {format_size(int(self.bytes_per_sec))}/s)"
+        )
+        if self.eta is not None:
+            status += f", about {format_duration(self.eta)} left"
+        if self.throttled:
+            status += " (throttled by I/O budget)"
+        return status
+
+class ProgressTracker:
+    """Turns per-file counter updates into periodic ScanProgress snapshots.
+
+    update() is cheap enough to call for every file; it only builds a
+    snapshot once ``interval`` seconds have passed since the last one, so
+    consumers see a bounded number of updates however fast files arrive.
+    Rates are smoothed with an exponential moving average over those
+    intervals, and the ETA extrapolates the smoothed file rate to
+    ``expected_files``.
+    """
+
+    INTERVAL = 0.2  # Seconds between snapshots
+    SMOOTHING = 0.3  # Weight of the latest interval in the rate averages
+
+    def __init__(
+        self,
+        expected_files: Optional[int] = None,
+        interval: float = INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        initial_files: int = 0,
+        initial_bytes: int = 0
+    ):
+        """Initialize tracker.
+
+        Args:
+            expected_files: Optional estimate of the total file count
+            interval: Minimum seconds between snapshots
+            clock: Time source, in seconds
+            initial_files: Files already counted, e.g. by a resumed scan
+            initial_bytes: Bytes already counted
+        """
+        self.expected_files = expected_files
+        self.interval = interval
+        self._clock = clock
+        self._start = clock()
+        self._last_time = self._start
+        self._last_files = initial_files
+        self._last_bytes = initial_bytes
+        self._files_rate: Optional[float] = None
+        self._bytes_rate: Optional[float] = None
+
+    def update(self, files: int, size: int, directories: int) -> Optional[ScanProgress]:
+        """Record current totals.
+
+        Args:
+            files: Files found so far
+            size: Bytes found so far
+            directories: Directories found so far
+
+        Returns:
+            ScanProgress if a snapshot is due, otherwise None
+        """
+        now = self._clock()
+        if now - self._last_time < self.interval:
+            return None
+        return self.snapshot(files, size, directories, now)
+
+    def snapshot(
+        self,
+        files: int,
+        size: int,
+        directories: int,
+        now: Optional[float] = None
+    ) -> ScanProgress:
+        """Build a snapshot immediately, regardless of the interval."""
+        now = self._clock() if now is None else now
+        span = now - self._last_time
+        if span > 0:
+            files_rate = (files - self._last_files) / span
+            bytes_rate = (size - self._last_bytes) / span
+            if self._files_rate is None:
+                self._files_rate, self._bytes_rate = files_rate, bytes_rate
+            else:
+                a = self.SMOOTHING
+                self._files_rate += a * (files_rate - self._files_rate)
+                self._bytes_rate += a * (bytes_rate - self._bytes_rate)
+            self._last_time = now
+            self._last_files = files
+            self._last_bytes = size
+
+        files_rate = self._files_rate or 0.0
+        eta = None
+        if self.expected_files and files_rate > 0 and files < self.expected_files:
+            eta = (self.expected_files - files) / files_rate
+
+        return ScanProgress(
+            files=files,
+            bytes=size,
+            directories=directories,
+            elapsed=now - self._start,
+            files_per_sec=files_rate,
+            bytes_per_sec=self._bytes_rate or 0.0,
+            expected_files=self.expected_files,
+            eta=eta
+        )
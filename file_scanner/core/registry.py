@@ -0,0 +1,78 @@
+"""Directory registry assigning stable ids during a scan."""
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .models import DirectoryInfo
+
+class DirectoryRegistry:
+    """Indexes scanned directories by relative path.
+
+    Directories are registered once, parents before children, as the walker
+    lists them; a directory whose parent is not yet known registers the
+    parent first. Each one gets an integer id equal to its position in
+    ``directories``, so lookups by id or by relative path are O(1).
+    """
+
+    def __init__(self, root_path: Path):
+        """Initialize registry.
+
+        Args:
+            root_path: Root directory of the scan
+        """
+        self.root_path = root_path
+        self.directories: List[DirectoryInfo] = []
+        self._ids: Dict[str, int] = {}
+
+    def register(self, relative_path: str, depth: int) -> DirectoryInfo:
+        """Register a directory, returning the existing entry if already known.
+
+        Args:
+            relative_path: Path relative to the root ('' for the root itself)
+            depth: Directory depth (root is 0)
+
+        Returns:
+            DirectoryInfo with its id and parent id assigned
+        """
+        dir_id = self._ids.get(relative_path)
+        if dir_id is not None:
+            return self.directories[dir_id]
+
+        if relative_path:
+            path = self.root_path / relative_path
+            parent_path = path.parent
+            # Register missing ancestors so parents always precede children
+            parent_id = self.register(os.path.dirname(relative_path), depth - 1).id
+        else:
+            path = self.root_path
+            parent_id = None
+            parent_path = None
+
+        dir_info = DirectoryInfo(
+            path=path,
+            relative_path=Path(relative_path),
+            depth=depth,
+            parent_path=parent_path,
+            id=len(self.directories),
+            parent_id=parent_id
+        )
+        self._ids[relative_path] = dir_info.id
+        self.directories.append(dir_info)
+        return dir_info
+
+    def get_id(self, relative_path: str) -> Optional[int]:
+        """Get the id of a registered directory."""
+        return self._ids.get(relative_path)
+
+    def get(self, dir_id: int) -> DirectoryInfo:
+        """Get a directory by id."""
+        return self.directories[dir_id]
+
+    def __contains__(self, relative_path: str) -> bool:
+        return relative_path in self._ids
+
+    def __len__(self) -> int:
+        return len(self.directories)
+
+    def __iter__(self) -> Iterator[DirectoryInfo]:
+        return iter(self.directories)
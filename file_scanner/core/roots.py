@@ -0,0 +1,111 @@
+"""Planning and shared resources for scans of several roots."""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from ..utils import ensure_path
+
+@dataclass
+class RootPlan:
+    """A root to scan and the other roots nested inside it."""
+    path: Path
+    nested: List[Path] = field(default_factory=list)  # Outermost nested roots only
+
+    def relative_path(self, nested_root: Path) -> str:
+        """Get the path of a nested root relative to this one."""
+        return os.path.relpath(nested_root, self.path)
+
+def plan_roots(roots: Iterable[Union[str, Path]]) -> Tuple[List[RootPlan], List[Path]]:
+    """Resolve roots, drop duplicates and order nested roots first.
+
+    A root lying inside another one is scanned before it, so the outer
+    scan can take the shared subtree from the inner root's catalog. Only
+    the outermost of several nested levels is listed in ``nested``; its
+    catalog already covers the levels below.
+
+    Args:
+        roots: Directories to scan
+
+    Returns:
+        (plans in scan order, duplicate roots that were dropped)
+
+    Raises:
+        FileNotFoundError: If a root doesn't exist
+    """
+    unique: List[Path] = []
+    duplicates: List[Path] = []
+    for root in roots:
+        path = ensure_path(root)
+        if path in unique:
+            duplicates.append(path)
+        else:
+            unique.append(path)
+
+    plans = []
+    for path in unique:
+        inside = [other for other in unique if other != path and path in other.parents]
+        nested = [
+            inner for inner in inside
+            if not any(outer in inner.parents for outer in inside)
+        ]
+        plans.append(RootPlan(path, nested))
+
+    # Deeper roots first; the sort is stable, so input order breaks ties
+    plans.sort(key=lambda plan: len(plan.path.parts), reverse=True)
+    return plans, duplicates
+
+class WorkerPools:
+    """Thread and process pools shared by consecutive scans.
+
+    Scanners given the same WorkerPools list directories on one thread pool
+    and scan shards on one process pool, so ``workers`` and ``processes``
+    bound the I/O of the whole run rather than of each scan, and pools are
+    not started again for every root. Pools are created on first use.
+    """
+
+    def __init__(self, workers: int = 1, processes: int = 1):
+        """Initialize pools.
+
+        Args:
+            workers: Threads listing directories
+            processes: Worker processes scanning shards
+        """
+        self.workers = workers
+        self.processes = processes
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'WorkerPools':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def thread_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Get the listing thread pool, or None for sequential walks."""
+        if self.workers <= 1:
+            return None
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="scan-walker"
+            )
+        return self._thread_pool
+
+    def process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the shard process pool, or None for single-process scans."""
+        if self.processes <= 1:
+            return None
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self._process_pool
+
+    def close(self) -> None:
+        """Shut down the pools."""
+        if self._thread_pool:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._process_pool:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
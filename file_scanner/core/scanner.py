@@ -1,8 +1,12 @@
 """Core file system scanning module."""
-from datetime import datetime
+import os
+import stat
+from collections import deque
 from pathlib import Path
-from typing import Dict, Generator, List, Optional, Set, Protocol
-from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
+from typing import Callable, Iterable, Iterator, List, Optional, Protocol, Tuple
+from rich.progress import (
+    BarColumn, Progress, SpinnerColumn, TaskID, TextColumn, TimeElapsedColumn
+)
 from rich.tree import Tree
 from rich.console import Console
 from rich import print as rprint
@@ -11,10 +15,24 @@ from .models import (
     FileInfo, DirectoryInfo, ScanResult,
     ScanOptions, ScanError, AccessError, InvalidPathError
 )
-from ..utils import ensure_path, format_timestamp, get_relative_path
+from .accumulator import ScanAccumulator
+from .baseline import ScanBaseline
+from .budget import IOThrottle
+from .checkpoint import FrontierEntry, ScanCheckpoint
+from .columnar import ColumnarScanResult, FileColumns
+from .ignore import IgnoreMatcher
+from .progress import ProgressTracker, ScanProgress
+from .roots import WorkerPools
+from .sharding import Shard, iter_shards, plan_shards
+from .walker import DirectoryWalker, DirectoryListing
+from ..utils import ensure_path, format_duration, format_size, get_extension
 
 class ProgressUpdater(Protocol):
-    """Protocol for progress updates."""
+    """Protocol for progress updates.
+    
+    Updaters that also define ``report_progress(progress: ScanProgress)``
+    receive the snapshots themselves instead of a formatted status.
+    """
     def update_progress(self, status: str, percentage: int = -1): ...
 
 class FileScanner:
@@ -24,7 +42,11 @@ class FileScanner:
         self, 
         root_path: str | Path, 
         options: Optional[ScanOptions] = None,
-        progress_updater: Optional[ProgressUpdater] = None
+        progress_updater: Optional[ProgressUpdater] = None,
+        baseline: Optional[ScanBaseline] = None,
+        expected_files: Optional[int] = None,
+        pools: Optional[WorkerPools] = None,
+        throttle: Optional[IOThrottle] = None
     ):
         """Initialize scanner with root directory and options.
         
@@ -32,210 +54,462 @@ class FileScanner:
             root_path: Directory path to scan
             options: Scan configuration options
             progress_updater: Optional progress update handler
+            baseline: Optional previous scan of the same root; directories
+                whose mtime and inode are unchanged are not re-listed and
+                their files are taken from the baseline. Files rewritten in
+                place do not change their directory's mtime and are not
+                picked up, and the baseline should come from a scan with
+                the same filter options.
+            expected_files: Optional estimate of the file count, e.g. from
+                the previous scan, used for the ETA and percentage
+            pools: Optional thread and process pools shared with other
+                scans, used in place of per-scan pools
+            throttle: Optional throttle shared with other scans; by
+                default one is created for ``options.io_budget``
         
         Raises:
             InvalidPathError: If path doesn't exist or isn't a directory
         """
         self.root_path = ensure_path(root_path)
+        # Relative paths start after the root and its separator
+        self._rel_offset = len(os.path.join(self.root_path, ''))
         self.options = options or ScanOptions()
+        self._ignore = (
+            IgnoreMatcher.from_patterns(self.options.ignore_patterns)
+            if self.options.ignore_patterns else None
+        )
+        # One budget for all of this scan's threads
+        if throttle is None and self.options.io_budget:
+            throttle = IOThrottle(self.options.io_budget)
+        self.throttle = throttle
         self.progress_updater = progress_updater
+        self.baseline = baseline
+        self.expected_files = expected_files
+        self.pools = pools
         self.console = Console()
         
+        # Walker answering ignore-file lookups for single paths; keeps the
+        # rules it read per directory
+        self._ignore_walker: Optional[DirectoryWalker] = None
+        
+        # State of the running iter_scan, for checkpoints
+        self._frontier: Callable[[], List[FrontierEntry]] = list
+        self._accumulator: Optional[ScanAccumulator] = None
+        # (relative path, pruned subdirectories) of the listing yielded last
+        self._last_listing: Optional[Tuple[str, int]] = None
+        
         if not self.root_path.is_dir():
             raise InvalidPathError(f"Path is not a directory: {root_path}")
     
-    def _should_process_path(self, path: Path) -> bool:
-        """Check if a path should be processed based on options."""
+    def _should_process_path(self, path: Path, is_dir: bool = False) -> bool:
+        """Check if a path should be processed based on options.
+        
+        Only the path itself is checked; its ancestors are assumed to
+        have passed.
+        """
         # Check if path is hidden
         if not self.options.include_hidden and path.name.startswith('.'):
             return False
-            
-        # Check ignore patterns
-        if self.options.ignore_patterns:
-            for pattern in self.options.ignore_patterns:
-                if path.match(pattern):
-                    return False
+        
+        # Check ignore rules, including those of ignore files above the path
+        if self._ignore or self.options.ignore_files:
+            rel_path = os.path.relpath(path, self.root_path)
+            if rel_path == os.curdir:
+                return True
+            ignore = self._ignore
+            if self.options.ignore_files:
+                if self._ignore_walker is None:
+                    self._ignore_walker = DirectoryWalker(
+                        str(self.root_path), 
+                        ignore=self._ignore, 
+                        ignore_files=self.options.ignore_files
+                    )
+                ignore = self._ignore_walker.matcher_for(os.path.dirname(rel_path))
+            if ignore and ignore.ignores(rel_path, is_dir):
+                return False
         
         return True
     
-    def _scan_files(self) -> Generator[Path, None, None]:
-        """Generate all files in directory tree."""
-        try:
-            for file_path in self.root_path.rglob("*"):
-                try:
-                    if (file_path.is_file() and 
-                        (self.options.follow_links or not file_path.is_symlink()) and
-                        self._should_process_path(file_path)):
-                        yield file_path
-                except PermissionError:
-                    if not self.progress_updater:
-                        rprint(f"[yellow]Warning: Permission denied: {file_path}[/]")
-                except Exception as e:
-                    if not self.progress_updater:
-                        rprint(f"[yellow]Warning: Error processing {file_path}: {str(e)}[/]")
-        except KeyboardInterrupt:
+    def forget_ignore_rules(self, relative_path: str = '') -> None:
+        """Re-read the ignore files of a directory and below on the next check.
+        
+        stat_file() and the other single-path checks keep the ignore rules
+        they read; call this after an ignore file changes.
+        
+        Args:
+            relative_path: Directory whose ignore files changed ('' for all)
+        """
+        if self._ignore_walker is not None:
+            self._ignore_walker.forget_ignore_rules(relative_path)
+    
+    def _should_process_entry(self, entry: os.DirEntry) -> bool:
+        """Check if a directory entry should be processed based on options."""
+        # Ignore rules are applied by the walker, which knows the entry's
+        # relative path and the ignore files above it
+        return self.options.include_hidden or not entry.name.startswith('.')
+    
+    def _report_error(self, path: str, error: Exception) -> None:
+        """Report an entry that could not be read."""
+        if self.progress_updater:
             return
+        if isinstance(error, PermissionError):
+            rprint(f"[yellow]Warning: Permission denied: {path}[/]")
+        else:
+            rprint(f"[yellow]Warning: Error processing {path}: {str(error)}[/]")
+    
+    def _create_walker(self) -> DirectoryWalker:
+        """Create a directory walker configured from scan options."""
+        entry_filter = None if self.options.include_hidden else self._should_process_entry
+        return DirectoryWalker(
+            str(self.root_path),
+            follow_links=self.options.follow_links,
+            max_depth=self.options.max_depth,
+            workers=self.options.workers,
+            file_filter=entry_filter,
+            dir_filter=entry_filter,
+            on_error=self._report_error,
+            baseline=self.baseline,
+            executor=self.pools.thread_pool() if self.pools else None,
+            ignore=self._ignore,
+            ignore_files=self.options.ignore_files,
+            throttle=self.throttle
+        )
+    
+    def _create_file_info(
+        self, 
+        dir_info: DirectoryInfo, 
+        entry: os.DirEntry, 
+        stats: os.stat_result
+    ) -> FileInfo:
+        """Create FileInfo from a walker entry and its cached stat result."""
+        name = entry.name
+        return FileInfo(
+            name=name,
+            path_str=entry.path,
+            rel_offset=self._rel_offset,
+            extension=get_extension(name),
+            size_bytes=stats.st_size,
+            st_ctime=stats.st_ctime,
+            st_mtime=stats.st_mtime,
+            is_hidden=name.startswith('.'),
+            directory_id=dir_info.id,
+            link_count=stats.st_nlink or 1,  # Not reported by scandir on Windows
+            file_id=self._file_id(stats)
+        )
+    
+    def _file_id(self, stats: os.stat_result) -> Optional[Tuple[int, int]]:
+        """Get the (st_dev, st_ino) identity of a file that other paths may reach.
+        
+        Hard-linked files always have one; with follow_links every file
+        does, since symbolic links can point to any of them.
+        """
+        if self.options.follow_links or stats.st_nlink > 1:
+            return (stats.st_dev, stats.st_ino)
+        return None
+    
+    def stat_file(self, relative_path: str) -> Optional[FileInfo]:
+        """Stat a single file under the root.
+        
+        Used to refresh individual entries without listing their directory.
+        The file's own name is checked against the hidden/ignore options;
+        its ancestors are assumed to have passed them.
+        
+        Args:
+            relative_path: Path of the file relative to the root
+        
+        Returns:
+            FileInfo without a directory_id, or None if the path is missing,
+            filtered out or not a regular file
+        """
+        path = self.root_path / relative_path
+        if not self._should_process_path(path):
+            return None
+        
+        if self.throttle:
+            self.throttle.acquire()
+        try:
+            stats = os.stat(path, follow_symlinks=self.options.follow_links)
+        except OSError:
+            return None
+        if not stat.S_ISREG(stats.st_mode):
+            return None
+        
+        return FileInfo(
+            name=path.name,
+            path_str=str(path),
+            rel_offset=self._rel_offset,
+            extension=get_extension(path.name),
+            size_bytes=stats.st_size,
+            st_ctime=stats.st_ctime,
+            st_mtime=stats.st_mtime,
+            is_hidden=path.name.startswith('.'),
+            link_count=stats.st_nlink or 1,  # Not reported by scandir on Windows
+            file_id=self._file_id(stats)
+        )
     
     def scan(self) -> ScanResult:
         """Perform directory scan."""
-        extension_stats: Dict[str, Dict[str, int]] = {}
-        files: List[FileInfo] = []
-        directories: List[DirectoryInfo] = []
-        total_size = 0
+        accumulator = ScanAccumulator(self.root_path)
+        files = list(self.iter_scan(accumulator))
+        return accumulator.to_result(files)
+    
+    def scan_columnar(self) -> ColumnarScanResult:
+        """Perform directory scan, storing files in compact columns.
         
+        Each FileInfo is discarded once its values are copied into the
+        columns; ``result.files`` recreates them on access.
+        """
+        accumulator = ScanAccumulator(self.root_path)
+        columns = FileColumns()
+        for file_info in self.iter_scan(accumulator):
+            columns.append(file_info)
+        return accumulator.to_columnar(columns)
+    
+    def scan_subtree(
+        self, 
+        relative_path: str = '', 
+        depth: Optional[int] = None,
+        recursive: bool = True
+    ) -> ScanResult:
+        """Scan part of the tree without progress output.
+        
+        Directory ids are local to the returned result; ancestors of the
+        subtree are registered without being listed.
+        
+        Args:
+            relative_path: Directory to start from, relative to the root
+            depth: Depth of that directory; derived from the path if omitted
+            recursive: If False, only the directory itself is listed
+        
+        Returns:
+            ScanResult for the subtree; partial if interrupted
+        """
+        if depth is None:
+            depth = len(Path(relative_path).parts)
+        
+        accumulator = ScanAccumulator(self.root_path, self.options.follow_links)
+        files = []
         try:
-            # Use rich progress only in CLI mode
-            if self.progress_updater:
-                # GUI mode - use progress updater
-                self.progress_updater.update_progress("Counting files...", -1)
-                file_paths = list(self._scan_files())
-                total_files = len(file_paths)
-                
-                # Process files with percentage updates
-                for i, file_path in enumerate(file_paths, 1):
-                    percentage = int((i / total_files) * 100)
-                    self.progress_updater.update_progress(
-                        f"Analyzing files... ({i}/{total_files})", 
-                        percentage
-                    )
-                    
-                    try:
-                        # Get file stats
-                        stats = file_path.stat()
-                        
-                        # Create FileInfo
-                        file_info = FileInfo(
-                            name=file_path.name,
-                            path=file_path,
-                            relative_path=get_relative_path(file_path, self.root_path),
-                            extension=file_path.suffix.lower() if file_path.suffix else None,
-                            size_bytes=stats.st_size,
-                            created_date=datetime.fromtimestamp(stats.st_ctime),
-                            modified_date=datetime.fromtimestamp(stats.st_mtime),
-                            is_hidden=file_path.name.startswith('.')
-                        )
-                        files.append(file_info)
-                        
-                        # Update extension stats
-                        ext = file_info.extension or "(no extension)"
-                        if ext not in extension_stats:
-                            extension_stats[ext] = {"count": 0, "size": 0}
-                        extension_stats[ext]["count"] += 1
-                        extension_stats[ext]["size"] += stats.st_size
-                        
-                        total_size += stats.st_size
-                        
-                        # Process directories
-                        dir_path = file_path.parent
-                        current_path = self.root_path
-                        for part in get_relative_path(dir_path, self.root_path).parts:
-                            current_path = current_path / part
-                            if current_path not in {d.path for d in directories}:
-                                rel_path = get_relative_path(current_path, self.root_path)
-                                
-                                dir_info = DirectoryInfo(
-                                    path=current_path,
-                                    relative_path=rel_path,
-                                    depth=len(rel_path.parts),
-                                    parent_path=current_path.parent if current_path != self.root_path else None
-                                )
-                                directories.append(dir_info)
-                                
-                    except PermissionError:
-                        continue
-                    except Exception as e:
-                        continue
-                
-            else:
-                # CLI mode - use rich progress
-                with Progress(
-                    SpinnerColumn(),
-                    *Progress.get_default_columns(),
-                    TimeElapsedColumn(),
-                    console=self.console
-                ) as progress:
-                    # Count files
-                    count_task = progress.add_task(
-                        "[yellow]Counting files...", total=None
-                    )
-                    
-                    file_paths = list(self._scan_files())
-                    total_files = len(file_paths)
-                    progress.remove_task(count_task)
-                    
-                    # Process files
-                    process_task = progress.add_task(
-                        "[green]Analyzing files...", total=total_files
-                    )
-                    
-                    for file_path in file_paths:
-                        # Update progress
-                        progress.update(process_task, advance=1)
-                        
-                        try:
-                            # Get file stats
-                            stats = file_path.stat()
-                            
-                            # Create FileInfo
-                            file_info = FileInfo(
-                                name=file_path.name,
-                                path=file_path,
-                                relative_path=get_relative_path(file_path, self.root_path),
-                                extension=file_path.suffix.lower() if file_path.suffix else None,
-                                size_bytes=stats.st_size,
-                                created_date=datetime.fromtimestamp(stats.st_ctime),
-                                modified_date=datetime.fromtimestamp(stats.st_mtime),
-                                is_hidden=file_path.name.startswith('.')
-                            )
-                            files.append(file_info)
-                            
-                            # Update extension stats
-                            ext = file_info.extension or "(no extension)"
-                            if ext not in extension_stats:
-                                extension_stats[ext] = {"count": 0, "size": 0}
-                            extension_stats[ext]["count"] += 1
-                            extension_stats[ext]["size"] += stats.st_size
-                            
-                            total_size += stats.st_size
-                            
-                            # Process directories
-                            dir_path = file_path.parent
-                            current_path = self.root_path
-                            for part in get_relative_path(dir_path, self.root_path).parts:
-                                current_path = current_path / part
-                                if current_path not in {d.path for d in directories}:
-                                    rel_path = get_relative_path(current_path, self.root_path)
-                                    
-                                    dir_info = DirectoryInfo(
-                                        path=current_path,
-                                        relative_path=rel_path,
-                                        depth=len(rel_path.parts),
-                                        parent_path=current_path.parent if current_path != self.root_path else None
-                                    )
-                                    directories.append(dir_info)
-                                    
-                        except PermissionError:
-                            rprint(f"[yellow]Warning: Permission denied: {file_path}[/]")
-                        except Exception as e:
-                            rprint(f"[yellow]Warning: Error processing {file_path}: {str(e)}[/]")
-            
-            return ScanResult(
-                root_path=self.root_path,
-                total_files=total_files,
-                total_size=total_size,
-                files=files,
-                directories=directories,
-                extension_stats=extension_stats
+            listings = self._create_walker().walk(relative_path, depth, recursive)
+            files.extend(self._iter_listings(listings, accumulator))
+        except KeyboardInterrupt:
+            accumulator.interrupted = True
+        return accumulator.to_result(files)
+    
+    def iter_scan(
+        self, 
+        accumulator: Optional[ScanAccumulator] = None,
+        resume_from: Optional[ScanCheckpoint] = None
+    ) -> Iterator[FileInfo]:
+        """Scan the directory tree, yielding files as they are found.
+        
+        Nothing is retained per file, so consumers that write entries out as
+        they arrive run in memory proportional to the number of directories.
+        Aggregate statistics and the directory list build up in the
+        accumulator; a file's directory is registered before the file is
+        yielded. An interrupted scan ends the stream early and sets
+        ``accumulator.interrupted``. While the stream is suspended,
+        checkpoint() describes what remains to be scanned.
+        
+        Args:
+            accumulator: Optional accumulator receiving directories and totals
+            resume_from: Optional checkpoint of an earlier scan; only its
+                frontier is walked, and the accumulator should already hold
+                the earlier results
+        
+        Yields:
+            FileInfo for each scanned file
+        """
+        accumulator = accumulator or ScanAccumulator(self.root_path)
+        accumulator.follow_links = self.options.follow_links
+        self._accumulator = accumulator
+        self._last_listing = None
+        entries = resume_from.frontier if resume_from else [('', 0, True)]
+        
+        tracker = ProgressTracker(
+            self.expected_files,
+            initial_files=accumulator.total_files,
+            initial_bytes=accumulator.total_size
+        )
+        
+        # Use rich progress only in CLI mode
+        progress = None
+        scan_task = None
+        if self.progress_updater:
+            # GUI mode - use progress updater
+            self.progress_updater.update_progress("Scanning files...", -1)
+        else:
+            # CLI mode - use rich progress
+            progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[green]Scanning files..."),
+                BarColumn(),
+                TextColumn("{task.fields[status]}"),
+                TimeElapsedColumn(),
+                console=self.console
             )
-            
+            progress.start()
+            scan_task = progress.add_task(
+                "scan", total=self.expected_files, status="starting"
+            )
+        
+        if self.options.processes > 1:
+            if resume_from:
+                shards = [Shard(*entry) for entry in entries]
+            else:
+                shards = plan_shards(self._create_walker(), self.options.processes)
+            unfinished = set()
+            self._frontier = lambda: [
+                (s.relative_path, s.depth, s.recursive) for s in unfinished
+            ]
+            files = iter_shards(self, shards, accumulator, unfinished)
+        else:
+            listings = self._walk_entries(self._create_walker(), entries)
+            files = self._iter_listings(listings, accumulator)
+        
+        try:
+            for file_info in files:
+                yield file_info
+                
+                # Update progress at most once per tracker interval
+                snapshot = tracker.update(
+                    accumulator.total_files,
+                    accumulator.total_size,
+                    len(accumulator.directories)
+                )
+                if snapshot is not None:
+                    self._report_progress(snapshot, progress, scan_task)
         except KeyboardInterrupt:
+            accumulator.interrupted = True
             if not self.progress_updater:
                 rprint("\n[yellow]Scan interrupted. Returning partial results...[/]")
-            return ScanResult(
-                root_path=self.root_path,
-                total_files=len(files),
-                total_size=total_size,
-                files=files,
-                directories=directories,
-                extension_stats=extension_stats
+        finally:
+            files.close()
+            if progress:
+                # Show the final totals rather than the last sampled ones
+                self._report_progress(
+                    tracker.snapshot(
+                        accumulator.total_files,
+                        accumulator.total_size,
+                        len(accumulator.directories)
+                    ),
+                    progress,
+                    scan_task
+                )
+                progress.stop()
+    
+    def checkpoint(self) -> ScanCheckpoint:
+        """Describe what the running iter_scan has not yielded yet.
+        
+        Meant to be called by the stream's consumer between files; every
+        file yielded so far lies outside the returned frontier.
+        
+        Returns:
+            ScanCheckpoint with the frontier and this scanner's options
+        """
+        frontier = self._frontier()
+        pruned_dirs = self._accumulator.pruned_dirs if self._accumulator else 0
+        # The listing yielded last is walked again if it is on the frontier,
+        # counting its pruned subdirectories a second time
+        if self._last_listing is not None:
+            rel_path, pruned = self._last_listing
+            if any(entry[0] == rel_path for entry in frontier):
+                pruned_dirs -= pruned
+        return ScanCheckpoint(
+            frontier=frontier,
+            options=self.options,
+            pruned_dirs=pruned_dirs
+        )
+    
+    def _walk_entries(
+        self, 
+        walker: DirectoryWalker, 
+        entries: List[FrontierEntry]
+    ) -> Iterator[DirectoryListing]:
+        """Walk several starting directories in order, tracking the frontier."""
+        remaining = deque(entries)
+        self._frontier = lambda: walker.frontier() + list(remaining)
+        while remaining:
+            yield from walker.walk(*remaining.popleft())
+        # Left in place if the walk is closed early, for a final checkpoint
+        self._frontier = list
+    
+    def _report_progress(
+        self, 
+        snapshot: ScanProgress, 
+        progress: Optional[Progress], 
+        scan_task: Optional[TaskID]
+    ) -> None:
+        """Send a progress snapshot to the rich display or the updater."""
+        if self.throttle is not None:
+            snapshot.throttled = self.throttle.throttled
+        if progress:
+            status = (
+                f"{snapshot.files:,} files, {format_size(snapshot.bytes)} "
+                f"[dim]{snapshot.files_per_sec:,.0f} files/s, "
+                f"{format_size(int(snapshot.bytes_per_sec))}/s[/]"
+            )
+            if snapshot.eta is not None:
+                status += f" ETA {format_duration(snapshot.eta)}"
+            if snapshot.throttled:
+                status += " [yellow]throttled[/]"
+            total = snapshot.expected_files
+            if total is not None and snapshot.files >= total:
+                total = None  # Estimate exceeded; fall back to a spinner
+            progress.update(
+                scan_task, completed=snapshot.files, total=total, status=status
+            )
+        elif hasattr(self.progress_updater, 'report_progress'):
+            self.progress_updater.report_progress(snapshot)
+        else:
+            self.progress_updater.update_progress(
+                snapshot.describe(), snapshot.percentage
             )
+    
+    def _iter_listings(
+        self, 
+        listings: Iterable[DirectoryListing],
+        accumulator: ScanAccumulator
+    ) -> Iterator[FileInfo]:
+        """Turn walker listings into FileInfo records.
+        
+        Args:
+            listings: Directory listings, parents before children
+            accumulator: Accumulator receiving directories and totals
+        
+        Yields:
+            FileInfo for each file in the listings
+        """
+        registry = accumulator.registry
+        
+        for listing in listings:
+            dir_info = registry.register(listing.relative_path, listing.depth)
+            accumulator.pruned_dirs += listing.pruned
+            self._last_listing = (listing.relative_path, listing.pruned)
+            
+            if listing.stats is not None:
+                dir_info.mtime_ns = listing.stats.st_mtime_ns
+                dir_info.inode = listing.stats.st_ino
+            
+            # Mark directories whose subtrees lie beyond max_depth
+            if listing.truncated:
+                dir_info.truncated = True
+                dir_info.entry_count = listing.entry_count
+            
+            if listing.reused:
+                accumulator.reused_dirs += 1
+                for file_info in self.baseline.get_files(listing.relative_path):
+                    file_info.directory_id = dir_info.id
+                    accumulator.add_file(file_info)
+                    yield file_info
+                continue
+            
+            for entry, stats in listing.files:
+                try:
+                    file_info = self._create_file_info(dir_info, entry, stats)
+                except Exception as e:
+                    self._report_error(entry.path, e)
+                    continue
+                
+                accumulator.add_file(file_info)
+                yield file_info
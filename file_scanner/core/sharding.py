@@ -0,0 +1,275 @@
+"""Multi-process scanning of independent subtrees."""
+import heapq
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set, Tuple
+
+from .accumulator import ScanAccumulator
+from .baseline import ScanBaseline
+from .budget import IOBudget, IOThrottle
+from .models import FileInfo, ScanOptions, ScanResult
+from .walker import DirectoryWalker
+
+if TYPE_CHECKING:
+    from .scanner import FileScanner
+
+# Aim for several shards per process so fast workers pick up the slack
+SHARDS_PER_PROCESS = 4
+# Upper bound on directories probed while planning
+MAX_EXPANSIONS = 64
+# Entries counted to weigh one subtree, and in all subtrees together;
+# beyond these, subtrees are weighed by fewer or only their direct entries
+PROBE_ENTRIES = 10_000
+MAX_PROBED_ENTRIES = 200_000
+
+@dataclass(frozen=True)
+class Shard:
+    """A unit of scan work handed to a worker process."""
+    relative_path: str  # '' for the scan root
+    depth: int
+    recursive: bool = True  # False lists only the directory itself
+    weight: int = 0  # Estimated cost from the pre-listing
+
+def _probe(walker: DirectoryWalker, path: str, rel_path: str) -> Tuple[int, List[str]]:
+    """Count a directory's entries and return its accepted subdirectories.
+
+    Only d_type information is used, so no file is stat'ed. The listing,
+    and the stat of each followed link, are paid from the walker's I/O
+    budget.
+    """
+    count = 0
+    subdirs = []
+    ignore = walker.matcher_for(rel_path)
+    throttle = walker.throttle
+    if throttle:
+        throttle.acquire()
+    with os.scandir(path) as it:
+        for entry in it:
+            count += 1
+            try:
+                if walker.follow_links and throttle and entry.is_symlink():
+                    throttle.acquire()
+                if not entry.is_dir(follow_symlinks=walker.follow_links):
+                    continue
+            except OSError:
+                continue
+            if walker.dir_filter is not None and not walker.dir_filter(entry):
+                continue
+            if walker.follow_links and entry.is_symlink() and _inside_root(walker, entry.path):
+                continue  # Scanned through its real path; may be a cycle
+            child_rel = f"{rel_path}{os.sep}{entry.name}" if rel_path else entry.name
+            if ignore and ignore.ignores(child_rel, True):
+                continue
+            subdirs.append(entry.name)
+    return count, subdirs
+
+def _weigh(walker: DirectoryWalker, path: str, rel_path: str, depth: int, limit: int) -> int:
+    """Count the entries of a subtree, breadth first.
+
+    The subtree's own directory is always listed; deeper directories only
+    until ``limit`` entries were counted, so the weight of a large
+    subtree is a lower bound.
+
+    Raises:
+        OSError: If the subtree's directory cannot be listed
+    """
+    weight, subdirs = _probe(walker, path, rel_path)
+    pending = deque([(path, rel_path, depth, subdirs)])
+    max_depth = walker.max_depth
+    while pending and weight < limit:
+        path, rel_path, depth, subdirs = pending.popleft()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for name in subdirs:
+            if weight >= limit:
+                break
+            child_rel = f"{rel_path}{os.sep}{name}"
+            child_path = os.path.join(path, name)
+            try:
+                count, grandchildren = _probe(walker, child_path, child_rel)
+            except OSError:
+                continue
+            weight += count
+            pending.append((child_path, child_rel, depth + 1, grandchildren))
+    return weight
+
+def _inside_root(walker: DirectoryWalker, path: str) -> bool:
+    """Check whether a path resolves to a location inside the walked tree.
+
+    Worker processes track visited directories separately, so shards must
+    not start at links back into the tree.
+    """
+    target = os.path.realpath(path)
+    return target == walker.root_path or target.startswith(os.path.join(walker.root_path, ''))
+
+def plan_shards(walker: DirectoryWalker, processes: int) -> List[Shard]:
+    """Partition a tree into shards sized by a cheap pre-listing.
+
+    The root is split into its own files plus one recursive shard per
+    subdirectory, each weighted by the entries in its subtree, counted
+    from d_type alone and up to PROBE_ENTRIES per subtree. The heaviest
+    shard is split the same way while it would dominate a worker's share
+    of the total, so a deep but narrow subtree is split down to its
+    heavy directories rather than left to one worker. A single directory
+    is listed by one worker, however large.
+
+    Args:
+        walker: Walker configured with the scan's filters and depth limit
+        processes: Number of worker processes
+
+    Returns:
+        Shards ordered from heaviest to lightest
+    """
+    max_depth = walker.max_depth
+    if max_depth is not None and max_depth <= 0:
+        return [Shard('', 0)]
+
+    flat: List[Shard] = []
+    heap: List[Tuple[int, int, str, int]] = []  # (-weight, seq, rel_path, depth)
+    seq = 0
+    probe_budget = MAX_PROBED_ENTRIES
+
+    def expand(rel_path: str, depth: int) -> None:
+        nonlocal seq, probe_budget
+        path = os.path.join(walker.root_path, rel_path) if rel_path else walker.root_path
+        count, subdirs = _probe(walker, path, rel_path)
+        flat.append(Shard(rel_path, depth, recursive=False, weight=count))
+
+        for name in subdirs:
+            child_rel = f"{rel_path}{os.sep}{name}" if rel_path else name
+            try:
+                weight = _weigh(
+                    walker, os.path.join(path, name), child_rel, depth + 1,
+                    min(PROBE_ENTRIES, probe_budget)
+                )
+            except OSError:
+                weight = 0  # The worker will report the error
+            probe_budget = max(0, probe_budget - weight)
+            heapq.heappush(heap, (-weight, seq, child_rel, depth + 1))
+            seq += 1
+
+    try:
+        expand('', 0)
+    except OSError:
+        return [Shard('', 0)]
+
+    target = processes * SHARDS_PER_PROCESS
+    expansions = 0
+    while heap and expansions < MAX_EXPANSIONS:
+        neg_weight, _, rel_path, depth = heap[0]
+        total = sum(s.weight for s in flat) + sum(-w for w, *_ in heap)
+        balanced = -neg_weight <= total / (processes * 2)
+        if (balanced and len(heap) + len(flat) >= target) or \
+                (max_depth is not None and depth >= max_depth):
+            break
+
+        heapq.heappop(heap)
+        try:
+            expand(rel_path, depth)
+        except OSError:
+            heapq.heappush(heap, (0, seq, rel_path, depth))
+            seq += 1
+            break
+        expansions += 1
+
+    shards = flat + [
+        Shard(rel_path, depth, recursive=True, weight=-neg_weight)
+        for neg_weight, _, rel_path, depth in heap
+    ]
+    shards.sort(key=lambda s: s.weight, reverse=True)
+    return shards
+
+# Throttle of this worker process, kept across shards so each shard does
+# not start with a full bucket
+_process_throttle: Optional[Tuple[IOBudget, IOThrottle]] = None
+
+def _scan_shard(
+    root_path: str,
+    options: ScanOptions,
+    shard: Shard,
+    baseline: Optional[ScanBaseline] = None
+) -> ScanResult:
+    """Scan a single shard; runs in a worker process."""
+    from .scanner import FileScanner
+
+    global _process_throttle
+    throttle = None
+    if options.io_budget:
+        if _process_throttle is None or _process_throttle[0] != options.io_budget:
+            _process_throttle = (options.io_budget, IOThrottle(options.io_budget))
+        throttle = _process_throttle[1]
+
+    scanner = FileScanner(root_path, options, baseline=baseline, throttle=throttle)
+    return scanner.scan_subtree(shard.relative_path, shard.depth, shard.recursive)
+
+def merge_scan_results(root_path: Path, results: List[ScanResult]) -> ScanResult:
+    """Merge partial scan results of disjoint subtrees into one result.
+
+    Directories are re-registered parents first, so ids are reassigned
+    and every file's directory_id is remapped accordingly.
+
+    Args:
+        root_path: Common root of all partial results
+        results: Partial results whose relative paths share that root
+
+    Returns:
+        Combined ScanResult
+    """
+    accumulator = ScanAccumulator(root_path)
+    files: List[FileInfo] = []
+    for result in results:
+        files.extend(accumulator.add_result(result))
+    return accumulator.to_result(files)
+
+def iter_shards(
+    scanner: 'FileScanner',
+    shards: List[Shard],
+    accumulator: ScanAccumulator,
+    unfinished: Optional[Set[Shard]] = None
+) -> Iterator[FileInfo]:
+    """Scan shards in a process pool, yielding files as each shard finishes.
+
+    Shards are submitted heaviest first and handed out as workers free up,
+    so small shards fill in around large ones. Each finished shard is merged
+    into the accumulator before its files are yielded.
+
+    Args:
+        scanner: Scanner providing the root path and options
+        shards: Shards from plan_shards
+        accumulator: Accumulator receiving directories and totals
+        unfinished: Optional set kept up to date with the shards whose
+            files have not all been yielded yet
+
+    Yields:
+        FileInfo for each scanned file, grouped by shard
+    """
+    root = str(scanner.root_path)
+    if unfinished is None:
+        unfinished = set()
+    unfinished.update(shards)
+
+    shared_pool = scanner.pools.process_pool() if scanner.pools else None
+    pool = shared_pool or ProcessPoolExecutor(max_workers=scanner.options.processes)
+    options = scanner.options
+    if options.io_budget:
+        # Every worker process paces itself to an equal share
+        options = replace(options, io_budget=options.io_budget.scaled(1 / options.processes))
+    futures = {}
+    try:
+        futures = {
+            pool.submit(_scan_shard, root, options, shard, scanner.baseline): shard
+            for shard in shards
+        }
+        for future in as_completed(futures):
+            yield from accumulator.add_result(future.result())
+            unfinished.discard(futures[future])
+    finally:
+        if pool is shared_pool:
+            # Leave the pool to later scans, minus this scan's queued shards
+            for future in futures:
+                future.cancel()
+        else:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,463 @@
+"""Single-pass directory traversal built on os.scandir."""
+import os
+import stat
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from . import profiling
+from .baseline import ScanBaseline
+from .budget import IOThrottle
+from .ignore import IgnoreMatcher
+
+# Callback signatures
+EntryFilter = Callable[[os.DirEntry], bool]
+ErrorHandler = Callable[[str, OSError], None]
+
+# (path, relative path, depth, ignore rules in effect) of a queued directory
+QueuedDirectory = Tuple[str, str, int, Optional[IgnoreMatcher]]
+
+LINK_CACHE_SIZE = 10_000  # Stat results of multiply-linked files kept for their other links
+
+@dataclass
+class DirectoryListing:
+    """Entries collected from a single directory listing."""
+    path: str
+    relative_path: str  # '' for the root directory
+    depth: int
+    files: List[Tuple[os.DirEntry, os.stat_result]] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)  # Names of child directories
+    entry_count: int = 0  # All entries in the directory, including skipped ones
+    truncated: bool = False  # Subdirectories exist but lie beyond max_depth
+    pruned: int = 0  # Subdirectories rejected by the directory filter
+    stats: Optional[os.stat_result] = None  # Stat of the directory itself
+    reused: bool = False  # Unchanged since the baseline; files were not listed
+    ignore: Optional[IgnoreMatcher] = None  # Rules applied to this directory's entries
+
+class DirectoryWalker:
+    """Walks a directory tree with one scandir call per directory.
+
+    File type checks reuse the d_type reported by the directory listing,
+    and each accepted file costs at most one stat call, whose result is
+    cached on the DirEntry and handed to the consumer. With more than one
+    worker, listings and stats run on a thread pool, which hides the
+    round-trip latency of network filesystems.
+
+    Files with several hard links are stat'ed once: the listing's inode
+    number identifies further links, which reuse the first link's stat
+    result. At most LINK_CACHE_SIZE results are kept, the oldest dropped
+    first, since files whose other links lie outside the tree are never
+    released. When following links, symbolic links to directories are
+    descended into, and every directory is identified by (st_dev, st_ino)
+    so one reached again, such as through a link cycle, is skipped.
+
+    With a throttle, every directory stat, listing and file stat first
+    takes one operation from its budget. With profiling enabled before
+    the walker is created, listings and stats are timed.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        follow_links: bool = False,
+        max_depth: Optional[int] = None,
+        workers: int = 1,
+        file_filter: Optional[EntryFilter] = None,
+        dir_filter: Optional[EntryFilter] = None,
+        on_error: Optional[ErrorHandler] = None,
+        baseline: Optional[ScanBaseline] = None,
+        executor: Optional[Executor] = None,
+        ignore: Optional[IgnoreMatcher] = None,
+        ignore_files: Sequence[str] = (),
+        throttle: Optional[IOThrottle] = None
+    ):
+        """Initialize walker.
+
+        Args:
+            root_path: Directory to walk
+            follow_links: Include files and directories reached through
+                symbolic links
+            max_depth: Deepest directory level to list (root is 0); the
+                subdirectories of directories at this level are not opened
+            workers: Number of threads listing directories concurrently;
+                1 walks sequentially in the calling thread
+            file_filter: Optional predicate deciding which files to keep;
+                called before the file is stat'ed
+            dir_filter: Optional predicate deciding which subdirectories to
+                descend into; rejected subtrees are never opened
+            on_error: Optional callback for entries that could not be read
+            baseline: Optional previous scan; directories whose mtime and
+                inode are unchanged are not listed, their stored
+                subdirectories are walked instead and the listing is
+                flagged as reused
+            executor: Optional thread pool shared with other walks; used
+                instead of a private pool when workers > 1
+            ignore: Optional rules for paths relative to the root;
+                ignored subdirectories are never opened
+            ignore_files: Names of per-directory ignore files (such as
+                .gitignore) whose rules apply below the directory
+            throttle: Optional I/O budget shared by all listing threads
+        """
+        self.root_path = os.fspath(root_path)
+        self.follow_links = follow_links
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.file_filter = file_filter
+        self.dir_filter = dir_filter
+        self.on_error = on_error
+        self.baseline = baseline
+        self.executor = executor
+        self.ignore = ignore
+        self.ignore_files = tuple(ignore_files)
+        self.throttle = throttle
+        self.profiler = profiling.active()
+        self.pruned_dirs = 0
+        # Directories listed so far, by (st_dev, st_ino); only when following links
+        self._visited: Set[Tuple[int, int]] = set()
+        self._visited_lock = threading.Lock()
+        # Stat results of multiply-linked files and how many links remain
+        self._links: Dict[Tuple[int, int], List] = OrderedDict()
+        self._links_lock = threading.Lock()
+        # Results of matcher_for() by relative directory
+        self._matchers: Dict[str, Optional[IgnoreMatcher]] = {}
+        # Directories of the current walk whose subtrees are not yet yielded
+        self._frontier: Callable[[], List[Tuple[str, int, bool]]] = list
+
+    def _report(self, path: str, error: OSError) -> None:
+        """Forward an error to the error handler, if any."""
+        if self.on_error:
+            self.on_error(path, error)
+
+    def frontier(self) -> List[Tuple[str, int, bool]]:
+        """Get the directories of the current walk not yet fully yielded.
+
+        Returns (relative path, depth, recursive) for every directory still
+        waiting to be listed, plus the directory whose listing was yielded
+        last: while the walk is suspended, its subdirectories have not been
+        queued yet. Walking these entries again covers everything the walk
+        has not yielded.
+        """
+        return self._frontier()
+
+    def walk(
+        self, 
+        relative_path: str = '', 
+        depth: int = 0, 
+        recursive: bool = True
+    ) -> Iterator[DirectoryListing]:
+        """Yield a listing for every directory in the tree, parents first.
+
+        Args:
+            relative_path: Subdirectory of the root to start from
+            depth: Depth of the starting directory
+            recursive: If False, only the starting directory is listed
+        """
+        path = os.path.join(self.root_path, relative_path) if relative_path else self.root_path
+        start = (path, relative_path, depth, self._inherited_ignore(relative_path))
+
+        if not recursive:
+            self._frontier = lambda: [(relative_path, depth, False)]
+            listing = self._list_directory(*start)
+            if listing is not None:
+                # Subdirectories are walked separately by the caller
+                listing.truncated = False
+                self.pruned_dirs += listing.pruned
+                yield listing
+            self._frontier = list
+            return
+
+        if self.workers > 1:
+            yield from self._walk_parallel(start)
+            return
+
+        stack = [start]
+        current = []
+        self._frontier = lambda: [(rel, d, True) for _, rel, d, _ in current + stack]
+
+        while stack:
+            current[:] = [stack.pop()]
+            listing = self._list_directory(*current[0])
+            if listing is None:
+                continue
+
+            self.pruned_dirs += listing.pruned
+            yield listing
+
+            # Push in reverse so children are visited in listing order
+            stack.extend(reversed(self._children(listing)))
+
+        # A walk that was closed early keeps its frontier
+        self._frontier = list
+
+    def _walk_parallel(self, start: QueuedDirectory) -> Iterator[DirectoryListing]:
+        """Walk the tree with several directory listings in flight.
+
+        Directories wait in a shared queue and are listed by a thread pool;
+        listings are yielded from the calling thread as they complete, so
+        consumers never see concurrent calls. A directory is only queued
+        after its parent has been yielded, which keeps parents first.
+        """
+        pending = deque([start])
+        running = set()
+        in_flight = {}  # Submitted directories whose children are not yet queued
+        self._frontier = lambda: [
+            (rel, d, True) for _, rel, d, _ in list(in_flight.values()) + list(pending)
+        ]
+
+        pool = self.executor or ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="scan-walker"
+        )
+        try:
+            while pending or running:
+                # Keep a bounded number of listings in flight
+                while pending and len(running) < self.workers * 2:
+                    next_dir = pending.popleft()
+                    future = pool.submit(self._list_directory, *next_dir)
+                    in_flight[future] = next_dir
+                    running.add(future)
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing = future.result()
+                    if listing is not None:
+                        self.pruned_dirs += listing.pruned
+                        yield listing
+                        pending.extend(self._children(listing))
+                    del in_flight[future]
+        finally:
+            # A shared pool outlives the walk; listings still running finish
+            # in the background
+            if pool is not self.executor:
+                pool.shutdown(wait=True)
+
+        self._frontier = list
+
+    def matcher_for(self, relative_path: str) -> Optional[IgnoreMatcher]:
+        """Get the ignore rules applying to the entries of a directory.
+
+        Reads the ignore files of the directory and all its ancestors, so
+        it also works for directories the walk has not reached. The rules
+        of each directory are kept, so later calls only read the ignore
+        files of directories not seen before; call forget_ignore_rules()
+        when ignore files change.
+
+        Args:
+            relative_path: Directory relative to the root ('' for the root)
+        """
+        if not self.ignore_files:
+            return self.ignore
+
+        # Directories from the nearest one already known down to this one
+        missing = []
+        known = relative_path
+        while known not in self._matchers:
+            missing.append(known)
+            if not known:
+                break
+            known = os.path.dirname(known)
+        ignore = self._matchers.get(known, self.ignore)
+
+        for rel_path in reversed(missing):
+            path = os.path.join(self.root_path, rel_path) if rel_path else self.root_path
+            ignore = self._matchers[rel_path] = self._read_ignore_files(path, rel_path, ignore)
+        return ignore
+
+    def forget_ignore_rules(self, relative_path: str = '') -> None:
+        """Drop the rules matcher_for() kept for a directory and those below it.
+
+        Args:
+            relative_path: Directory whose ignore files changed ('' for all)
+        """
+        if not relative_path:
+            self._matchers.clear()
+            return
+        prefix = relative_path + os.sep
+        for rel_path in [p for p in self._matchers if p == relative_path or p.startswith(prefix)]:
+            del self._matchers[rel_path]
+
+    def _inherited_ignore(self, relative_path: str) -> Optional[IgnoreMatcher]:
+        """Get the rules a directory inherits from its parent."""
+        if not relative_path or not self.ignore_files:
+            return self.ignore
+        return self.matcher_for(os.path.dirname(relative_path))
+
+    def _read_ignore_files(
+        self,
+        path: str,
+        rel_path: str,
+        ignore: Optional[IgnoreMatcher],
+        names: Optional[Sequence[str]] = None
+    ) -> Optional[IgnoreMatcher]:
+        """Add the rules of a directory's ignore files to the inherited ones.
+
+        Args:
+            path: Directory path
+            rel_path: Directory relative to the root
+            ignore: Rules inherited from the parent
+            names: Ignore files known to exist; all configured names are
+                tried if omitted
+        """
+        for name in self.ignore_files if names is None else names:
+            try:
+                with open(os.path.join(path, name), encoding='utf-8', errors='replace') as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            ignore = (ignore or IgnoreMatcher()).extend(lines, rel_path)
+        return ignore
+
+    def _list_directory(
+        self, 
+        path: str, 
+        rel_path: str, 
+        depth: int, 
+        ignore: Optional[IgnoreMatcher] = None
+    ) -> Optional[DirectoryListing]:
+        """List and classify one directory; returns None if it can't be read."""
+        # Stat before listing, so changes made during the listing show up
+        # as a newer mtime on the next rescan
+        if self.throttle:
+            self.throttle.acquire()
+        try:
+            with profiling.timed('stat.directory'):
+                dir_stats = os.stat(path)
+        except OSError as e:
+            self._report(path, e)
+            return None
+
+        if self.follow_links:
+            key = (dir_stats.st_dev, dir_stats.st_ino)
+            with self._visited_lock:
+                if key in self._visited:
+                    return None  # Reached again through a symbolic link
+                self._visited.add(key)
+
+        listing = DirectoryListing(
+            path=path, relative_path=rel_path, depth=depth, stats=dir_stats, ignore=ignore
+        )
+
+        # Directories at the depth limit are listed for their entry count
+        within_depth = self.max_depth is None or depth < self.max_depth
+        if self.baseline is not None and within_depth:
+            known = self.baseline.get_directory(rel_path)
+            if known is not None and known.matches(dir_stats):
+                listing.reused = True
+                listing.subdirs = list(known.subdirs)
+                # Not listed, so the ignore files can only be tried
+                listing.ignore = self._read_ignore_files(path, rel_path, ignore)
+                return listing
+
+        if self.throttle:
+            self.throttle.acquire()
+        try:
+            with profiling.timed('walk.list'), os.scandir(path) as it:
+                if self.ignore_files:
+                    # The directory's own ignore files apply to its entries
+                    entries = list(it)
+                    present = {entry.name for entry in entries}
+                    listing.ignore = self._read_ignore_files(
+                        path, rel_path, ignore,
+                        [name for name in self.ignore_files if name in present]
+                    )
+                    it = entries
+                for entry in it:
+                    listing.entry_count += 1
+                    self._collect(entry, listing)
+        except OSError as e:
+            self._report(path, e)
+            return None
+
+        if self.max_depth is not None and depth >= self.max_depth:
+            listing.truncated = bool(listing.subdirs)
+
+        return listing
+
+    def _children(self, listing: DirectoryListing) -> List[QueuedDirectory]:
+        """Get the subdirectories to descend into."""
+        if listing.truncated:
+            return []
+
+        rel_path = listing.relative_path
+        return [
+            (
+                os.path.join(listing.path, name),
+                f"{rel_path}{os.sep}{name}" if rel_path else name,
+                listing.depth + 1,
+                listing.ignore
+            )
+            for name in listing.subdirs
+        ]
+
+    def _collect(self, entry: os.DirEntry, listing: DirectoryListing) -> None:
+        """Sort a single entry into the listing's files or subdirectories."""
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                self._add_subdir(entry, listing)
+                return
+
+            if entry.is_file(follow_symlinks=False):
+                if self.file_filter and not self.file_filter(entry):
+                    return
+                if self._ignored(listing, entry.name, False):
+                    return
+                listing.files.append((entry, self._stat_file(entry, listing)))
+            elif self.follow_links and entry.is_symlink():
+                if self.throttle:
+                    self.throttle.acquire()
+                st = entry.stat()
+                if stat.S_ISDIR(st.st_mode):
+                    self._add_subdir(entry, listing)
+                    return
+                if not stat.S_ISREG(st.st_mode):
+                    return
+                if self.file_filter and not self.file_filter(entry):
+                    return
+                if self._ignored(listing, entry.name, False):
+                    return
+                listing.files.append((entry, st))
+        except OSError as e:
+            self._report(entry.path, e)
+
+    def _add_subdir(self, entry: os.DirEntry, listing: DirectoryListing) -> None:
+        """Queue a subdirectory unless a filter rejects it."""
+        if (self.dir_filter and not self.dir_filter(entry)) or \
+                self._ignored(listing, entry.name, True):
+            listing.pruned += 1
+        else:
+            listing.subdirs.append(entry.name)
+
+    def _stat_file(self, entry: os.DirEntry, listing: DirectoryListing) -> os.stat_result:
+        """Stat a file, reusing the result of an earlier link to the same inode."""
+        # Entries share the device of their directory; inode() is free on POSIX
+        key = (listing.stats.st_dev, entry.inode())
+        if key in self._links:
+            with self._links_lock:
+                known = self._links.get(key)
+                if known is not None:
+                    known[1] -= 1
+                    if known[1] <= 0:
+                        del self._links[key]  # All links seen
+                    return known[0]
+
+        if self.throttle:
+            self.throttle.acquire()
+        if self.profiler:
+            with self.profiler.timer('stat.file'):
+                st = entry.stat(follow_symlinks=False)
+        else:
+            st = entry.stat(follow_symlinks=False)
+        if st.st_nlink > 1:
+            with self._links_lock:
+                if len(self._links) >= LINK_CACHE_SIZE:
+                    self._links.popitem(last=False)
+                self._links[key] = [st, st.st_nlink - 1]
+        return st
+
+    def _ignored(self, listing: DirectoryListing, name: str, is_dir: bool) -> bool:
+        """Check an entry of a listing against the ignore rules in effect."""
+        if not listing.ignore:
+            return False
+        rel_path = listing.relative_path
+        return listing.ignore.ignores(f"{rel_path}{os.sep}{name}" if rel_path else name, is_dir)
@@ -2,9 +2,11 @@
 from .base import DatabaseManager
 from .stats import StatsManager
 from .catalog import CatalogManager
+from .hash_cache import HashCache
 
 __all__ = [
     'DatabaseManager',
     'StatsManager',
-    'CatalogManager'
+    'CatalogManager',
+    'HashCache'
 ]
@@ -1,6 +1,9 @@
 """File catalog database management module."""
+import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -9,10 +12,33 @@ from rich import print as rprint
 import sqlite3
 
 from .base import DatabaseManager
-from ..core.models import ScanResult
+from ..core import profiling
+from ..core.accumulator import ScanAccumulator
+from ..core.baseline import BaselineDirectory
+from ..core.checkpoint import ScanCheckpoint
+from ..core.duplicates import DuplicateCandidate
+from ..core.models import DirectoryInfo, FileInfo, ScanResult
 from ..utils import format_timestamp, format_size
 from ..utils.formatting import create_file_table, create_directory_tree
 
+# Directory totals: own files, then the whole subtree; mtimes are POSIX timestamps
+ROLLUP_COLUMNS = (
+    ("file_count", "INTEGER"),
+    ("size_bytes", "INTEGER"),
+    ("newest_mtime", "REAL"),
+    ("tree_file_count", "INTEGER"),
+    ("tree_size_bytes", "INTEGER"),
+    ("tree_newest_mtime", "REAL"),
+)
+
+def _db_timestamp(timestamp: float) -> str:
+    """Format a POSIX timestamp as sqlite3 stores a local datetime.
+    
+    Writers use this on the raw stat times instead of the cached
+    FileInfo datetimes, so no datetime stays alive per file.
+    """
+    return datetime.fromtimestamp(timestamp).isoformat(' ')
+
 class CatalogManager(DatabaseManager):
     """Manages detailed file catalog database operations."""
     
@@ -61,6 +87,15 @@ class CatalogManager(DatabaseManager):
                 parent_path TEXT,
                 FOREIGN KEY (catalog_id) REFERENCES catalogs (id)
             )
+            """,
+            # Traversal checkpoints of unfinished catalogs
+            """
+            CREATE TABLE IF NOT EXISTS scan_checkpoints (
+                catalog_id INTEGER PRIMARY KEY,
+                checkpoint TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (catalog_id) REFERENCES catalogs (id)
+            )
             """
         ]
         
@@ -85,73 +120,892 @@ class CatalogManager(DatabaseManager):
                 "total_size_bytes",
                 "INTEGER DEFAULT 0"
             )
+        
+        # Add depth-limit markers to directories if they don't exist
+        directories_columns = self._get_table_columns("directories")
+        
+        if "truncated" not in directories_columns:
+            self._add_column(
+                "directories",
+                "truncated",
+                "BOOLEAN DEFAULT 0"
+            )
+        
+        if "entry_count" not in directories_columns:
+            self._add_column(
+                "directories",
+                "entry_count",
+                "INTEGER"
+            )
+        
+        if "parent_id" not in directories_columns:
+            self._add_column(
+                "directories",
+                "parent_id",
+                "INTEGER REFERENCES directories (id)"
+            )
+        
+        # Link files to their directory row
+        files_columns = self._get_table_columns("files")
+        
+        if "directory_id" not in files_columns:
+            self._add_column(
+                "files",
+                "directory_id",
+                "INTEGER REFERENCES directories (id)"
+            )
+        
+        # Directory state used by incremental rescans
+        if "mtime_ns" not in directories_columns:
+            self._add_column(
+                "directories",
+                "mtime_ns",
+                "INTEGER"
+            )
+        
+        if "inode" not in directories_columns:
+            self._add_column(
+                "directories",
+                "inode",
+                "INTEGER"
+            )
+        
+        # Hard link identity, for counting linked files' sizes once
+        if "link_count" not in files_columns:
+            self._add_column(
+                "files",
+                "link_count",
+                "INTEGER DEFAULT 1"
+            )
+        
+        if "device" not in files_columns:
+            self._add_column(
+                "files",
+                "device",
+                "INTEGER"
+            )
+        
+        if "inode" not in files_columns:
+            self._add_column(
+                "files",
+                "inode",
+                "INTEGER"
+            )
+        
+        # Content digest from the optional hashing stage, "algorithm:hex"
+        if "content_hash" not in files_columns:
+            self._add_column(
+                "files",
+                "content_hash",
+                "TEXT"
+            )
+        
+        # Per-directory totals; NULL for directories cataloged before them
+        for column, column_type in ROLLUP_COLUMNS:
+            if column not in directories_columns:
+                self._add_column("directories", column, column_type)
+        
+        self.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_files_directory ON files (directory_id)"
+        )
+        
+        # Path lookups for watch-mode upserts
+        self.execute_update(
+            """
+            CREATE INDEX IF NOT EXISTS idx_files_catalog_path
+            ON files (catalog_id, relative_path)
+            """
+        )
+        self.execute_update(
+            """
+            CREATE INDEX IF NOT EXISTS idx_directories_catalog_path
+            ON directories (catalog_id, relative_path)
+            """
+        )
+        self.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories (parent_id)"
+        )
+        
+        # Size buckets for duplicate detection
+        self.execute_update(
+            "CREATE INDEX IF NOT EXISTS idx_files_catalog_size ON files (catalog_id, size_bytes)"
+        )
+    
+    BATCH_SIZE = 1000
+    CHECKPOINT_INTERVAL = 30.0  # Seconds between saved checkpoints
     
     def create_catalog(self, scan_result: ScanResult) -> int:
         """Create a new catalog from scan results."""
-        # Insert catalog entry
-        catalog_id = self.execute_insert(
-            """
-            INSERT INTO catalogs (
-                root_path, total_files, total_size_bytes, status
-            ) VALUES (?, ?, ?, 'active')
-            """,
-            (str(scan_result.root_path), scan_result.total_files, scan_result.total_size)
-        )
+        return self.create_catalog_from_stream(scan_result.files, scan_result)
+    
+    def create_catalog_from_stream(
+        self, 
+        files: Iterable[FileInfo], 
+        summary: Union[ScanResult, ScanAccumulator],
+        checkpoint: Optional[Callable[[], ScanCheckpoint]] = None,
+        resume: Optional['CatalogResume'] = None
+    ) -> int:
+        """Create a new catalog, writing files as they arrive.
+        
+        Files are inserted in batches while the iterable is consumed, so a
+        stream from FileScanner.iter_scan is cataloged without holding the
+        whole tree in memory. Directories are inserted as they appear in
+        ``summary.directories``, ahead of the files that reference them.
+        Totals are read from the summary once the stream is exhausted,
+        along with each directory's own and subtree totals.
         
-        # Process directories
-        dir_queries = []
-        for dir_info in scan_result.directories:
-            dir_queries.append((
+        With a checkpoint callable (FileScanner.checkpoint), a traversal
+        checkpoint is stored with a batch commit every CHECKPOINT_INTERVAL
+        seconds and when the stream ends interrupted, so the catalog can be
+        continued with load_resume().
+        
+        Args:
+            files: Files to catalog
+            summary: ScanResult or ScanAccumulator describing the scan
+            checkpoint: Optional callable describing the unscanned frontier
+            resume: Optional state from load_resume(); files are added to
+                that catalog instead of a new one
+        
+        Returns:
+            ID of the catalog
+        """
+        if resume:
+            catalog_id = resume.catalog_id
+            self.execute_update(
+                "UPDATE catalogs SET status = 'scanning' WHERE id = ?",
+                (catalog_id,)
+            )
+        else:
+            # Insert catalog entry; totals are filled in at the end
+            catalog_id = self.execute_insert(
                 """
-                INSERT INTO directories (
-                    catalog_id, directory_path, relative_path,
-                    depth, parent_path
-                ) VALUES (?, ?, ?, ?, ?)
+                INSERT INTO catalogs (
+                    root_path, total_files, total_size_bytes, status
+                ) VALUES (?, 0, 0, 'scanning')
                 """,
-                (
-                    catalog_id,
-                    str(dir_info.path),
-                    str(dir_info.relative_path),
-                    dir_info.depth,
-                    str(dir_info.parent_path) if dir_info.parent_path else None
+                (str(summary.root_path),)
+            )
+        
+        directories = summary.directories
+        row_ids: Dict[int, int] = dict(resume.row_ids) if resume else {}
+        status = 'partial'
+        last_checkpoint = 0.0
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            def insert_new_directories() -> None:
+                """Insert directories registered since the last call."""
+                with profiling.timed('persist.catalog_directories'):
+                    for dir_info in directories[len(row_ids):]:
+                        cursor.execute(
+                            """
+                            INSERT INTO directories (
+                                catalog_id, directory_path, relative_path,
+                                depth, parent_path, parent_id, truncated, entry_count,
+                                mtime_ns, inode
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            """,
+                            (
+                                catalog_id,
+                                str(dir_info.path),
+                                str(dir_info.relative_path),
+                                dir_info.depth,
+                                str(dir_info.parent_path) if dir_info.parent_path else None,
+                                row_ids.get(dir_info.parent_id),
+                                dir_info.truncated,
+                                dir_info.entry_count,
+                                dir_info.mtime_ns,
+                                dir_info.inode
+                            )
+                        )
+                        row_ids[dir_info.id] = cursor.lastrowid
+            
+            def insert_files(batch: List[Tuple]) -> None:
+                """Insert a batch of file rows and commit."""
+                with profiling.timed('persist.catalog_files'):
+                    cursor.executemany(
+                        """
+                        INSERT INTO files (
+                            catalog_id, directory_id, file_name, directory_path,
+                            relative_path, extension, size_bytes, created_date,
+                            modified_date, is_hidden, link_count, device, inode
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        batch
+                    )
+                
+                nonlocal last_checkpoint
+                if checkpoint and time.monotonic() - last_checkpoint >= self.CHECKPOINT_INTERVAL:
+                    save_checkpoint()
+                    last_checkpoint = time.monotonic()
+                with profiling.timed('persist.commit'):
+                    conn.commit()
+            
+            def save_checkpoint() -> None:
+                """Store the current frontier along with everything before it."""
+                # Finished directories without files must survive a crash too
+                insert_new_directories()
+                with profiling.timed('persist.checkpoint'):
+                    cursor.execute(
+                        """
+                        INSERT OR REPLACE INTO scan_checkpoints (catalog_id, checkpoint)
+                        VALUES (?, ?)
+                        """,
+                        (catalog_id, checkpoint().to_json())
+                    )
+            
+            try:
+                # Process files in batches to handle large file sets
+                batch = []
+                try:
+                    for file_info in files:
+                        if len(directories) > len(row_ids):
+                            insert_new_directories()
+                        
+                        batch.append((
+                            catalog_id,
+                            row_ids.get(file_info.directory_id),
+                            file_info.name,
+                            os.path.dirname(file_info.path_str),
+                            file_info.relative_path_str,
+                            file_info.extension,
+                            file_info.size_bytes,
+                            _db_timestamp(file_info.st_ctime),
+                            _db_timestamp(file_info.st_mtime),
+                            file_info.is_hidden,
+                            file_info.link_count,
+                            *(file_info.file_id or (None, None))
+                        ))
+                        
+                        if len(batch) >= self.BATCH_SIZE:
+                            insert_files(batch)
+                            batch = []
+                except KeyboardInterrupt:
+                    # Keep what was received; the stream stops where it is
+                    summary.interrupted = True
+                    if hasattr(files, 'close'):
+                        files.close()
+                
+                if batch:
+                    insert_files(batch)
+                
+                # Directories without files, and depth markers set late
+                insert_new_directories()
+                for dir_info in directories:
+                    if dir_info.truncated:
+                        cursor.execute(
+                            """
+                            UPDATE directories SET truncated = 1, entry_count = ?
+                            WHERE id = ?
+                            """,
+                            (dir_info.entry_count, row_ids[dir_info.id])
+                        )
+                
+                with profiling.timed('persist.catalog_rollups'):
+                    if isinstance(summary, ScanAccumulator):
+                        summary.rollup()
+                    cursor.executemany(
+                        """
+                        UPDATE directories SET
+                            file_count = ?, size_bytes = ?, newest_mtime = ?,
+                            tree_file_count = ?, tree_size_bytes = ?, tree_newest_mtime = ?
+                        WHERE id = ?
+                        """,
+                        (
+                            (
+                                d.file_count, d.size_bytes, d.newest_mtime,
+                                d.tree_file_count, d.tree_size_bytes, d.tree_newest_mtime,
+                                row_ids[d.id]
+                            )
+                            for d in directories
+                        )
+                    )
+                
+                if not summary.interrupted:
+                    status = 'active'
+                    cursor.execute(
+                        "DELETE FROM scan_checkpoints WHERE catalog_id = ?",
+                        (catalog_id,)
+                    )
+                elif checkpoint:
+                    save_checkpoint()
+            finally:
+                # Record totals, even for a partial catalog
+                cursor.execute(
+                    """
+                    UPDATE catalogs 
+                    SET total_files = ?, total_size_bytes = ?, status = ?
+                    WHERE id = ?
+                    """,
+                    (summary.total_files, summary.total_size, status, catalog_id)
                 )
-            ))
+                conn.commit()
+        
+        return catalog_id
+    
+    def apply_changes(
+        self, 
+        catalog_id: int, 
+        directories: Iterable[DirectoryInfo] = (),
+        files: Iterable[FileInfo] = (),
+        removed: Iterable[str] = ()
+    ) -> None:
+        """Apply a batch of changes to an existing catalog in one transaction.
         
-        if dir_queries:
-            self.execute_transaction(dir_queries)
+        Removals are applied first, so a path that was replaced within the
+        batch can be removed and re-added. Catalog totals are adjusted by
+        the difference instead of being recounted; directory totals are
+        recomputed only for the directories touched and their ancestors.
         
-        # Process files
-        file_queries = []
-        for file_info in scan_result.files:
-            file_queries.append((
+        Args:
+            catalog_id: Catalog to update
+            directories: New or re-listed directories, parents first
+            files: Files to insert or update, matched by relative path
+            removed: Relative paths of removed files or directories;
+                a directory is removed with everything below it
+        """
+        file_delta = 0
+        size_delta = 0
+        touched: Set[str] = set()  # Directories whose own files changed
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            dir_rows: Dict[str, Optional[int]] = {}
+            
+            def directory_row(relative_path: str) -> Optional[int]:
+                """Look up a directory's row id by relative path."""
+                if relative_path not in dir_rows:
+                    cursor.execute(
+                        """
+                        SELECT id FROM directories
+                        WHERE catalog_id = ? AND relative_path = ?
+                        """,
+                        (catalog_id, relative_path)
+                    )
+                    row = cursor.fetchone()
+                    dir_rows[relative_path] = row['id'] if row else None
+                return dir_rows[relative_path]
+            
+            for relative_path in removed:
+                # Match the path itself and everything below it
+                key = str(Path(relative_path))
+                params = (catalog_id, key, key + os.sep, key + chr(ord(os.sep) + 1))
+                where = """
+                    WHERE catalog_id = ? AND (
+                        relative_path = ? OR (relative_path >= ? AND relative_path < ?)
+                    )
                 """
-                INSERT INTO files (
-                    catalog_id, file_name, directory_path, relative_path,
-                    extension, size_bytes, created_date, modified_date,
-                    is_hidden
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    catalog_id,
+                cursor.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM files" + where,
+                    params
+                )
+                count, size = cursor.fetchone()
+                file_delta -= count
+                size_delta -= size
+                cursor.execute("DELETE FROM files" + where, params)
+                cursor.execute("DELETE FROM directories" + where, params)
+                dir_rows.clear()
+                touched.add(os.path.dirname(key) or '.')
+            
+            for dir_info in directories:
+                key = str(dir_info.relative_path)
+                touched.add(key)
+                row_id = directory_row(key)
+                if row_id is not None:
+                    cursor.execute(
+                        """
+                        UPDATE directories
+                        SET truncated = ?, entry_count = ?, mtime_ns = ?, inode = ?
+                        WHERE id = ?
+                        """,
+                        (
+                            dir_info.truncated, dir_info.entry_count,
+                            dir_info.mtime_ns, dir_info.inode, row_id
+                        )
+                    )
+                    continue
+                
+                parent_id = None
+                if dir_info.depth > 0:
+                    parent_id = directory_row(str(dir_info.relative_path.parent))
+                cursor.execute(
+                    """
+                    INSERT INTO directories (
+                        catalog_id, directory_path, relative_path,
+                        depth, parent_path, parent_id, truncated, entry_count,
+                        mtime_ns, inode
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        catalog_id,
+                        str(dir_info.path),
+                        key,
+                        dir_info.depth,
+                        str(dir_info.parent_path) if dir_info.parent_path else None,
+                        parent_id,
+                        dir_info.truncated,
+                        dir_info.entry_count,
+                        dir_info.mtime_ns,
+                        dir_info.inode
+                    )
+                )
+                dir_rows[key] = cursor.lastrowid
+            
+            for file_info in files:
+                key = file_info.relative_path_str
+                touched.add(os.path.dirname(key) or '.')
+                values = (
+                    directory_row(os.path.dirname(key) or '.'),
                     file_info.name,
-                    str(file_info.path.parent),
-                    str(file_info.relative_path),
+                    os.path.dirname(file_info.path_str),
                     file_info.extension,
                     file_info.size_bytes,
-                    file_info.created_date,
-                    file_info.modified_date,
-                    file_info.is_hidden
+                    _db_timestamp(file_info.st_ctime),
+                    _db_timestamp(file_info.st_mtime),
+                    file_info.is_hidden,
+                    file_info.link_count,
+                    *(file_info.file_id or (None, None))
                 )
-            ))
+                
+                cursor.execute(
+                    """
+                    SELECT id, size_bytes FROM files
+                    WHERE catalog_id = ? AND relative_path = ?
+                    """,
+                    (catalog_id, key)
+                )
+                row = cursor.fetchone()
+                if row:
+                    cursor.execute(
+                        """
+                        UPDATE files SET
+                            directory_id = ?, file_name = ?, directory_path = ?,
+                            extension = ?, size_bytes = ?, created_date = ?,
+                            modified_date = ?, is_hidden = ?, link_count = ?,
+                            device = ?, inode = ?, content_hash = NULL
+                        WHERE id = ?
+                        """,
+                        values + (row['id'],)
+                    )
+                    size_delta += file_info.size_bytes - row['size_bytes']
+                else:
+                    cursor.execute(
+                        """
+                        INSERT INTO files (
+                            directory_id, file_name, directory_path, extension,
+                            size_bytes, created_date, modified_date, is_hidden,
+                            link_count, device, inode, catalog_id, relative_path
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        values + (catalog_id, key)
+                    )
+                    file_delta += 1
+                    size_delta += file_info.size_bytes
+            
+            self._refresh_rollups(
+                cursor,
+                [row_id for row_id in map(directory_row, touched) if row_id is not None]
+            )
+            cursor.execute(
+                """
+                UPDATE catalogs
+                SET total_files = total_files + ?,
+                    total_size_bytes = total_size_bytes + ?
+                WHERE id = ?
+                """,
+                (file_delta, size_delta, catalog_id)
+            )
+            conn.commit()
+    
+    def _refresh_rollups(self, cursor: sqlite3.Cursor, row_ids: Iterable[int]) -> None:
+        """Recompute totals of changed directories and their ancestors.
         
-        if file_queries:
-            # Process in batches to handle large file sets
-            batch_size = 1000
-            for i in range(0, len(file_queries), batch_size):
-                batch = file_queries[i:i + batch_size]
-                self.execute_transaction(batch)
+        Own totals are recounted from the directories' files; subtree
+        totals are rebuilt from the children's, deepest directories first.
+        Hard-linked files count once per link here, unlike in a full scan.
         
-        return catalog_id
+        Args:
+            cursor: Cursor of the open transaction
+            row_ids: Directory rows whose own files changed
+        """
+        depths: Dict[int, int] = {}
+        for row_id in row_ids:
+            cursor.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), MAX(modified_date)
+                FROM files WHERE directory_id = ?
+                """,
+                (row_id,)
+            )
+            count, size, newest = cursor.fetchone()
+            cursor.execute(
+                """
+                UPDATE directories SET file_count = ?, size_bytes = ?, newest_mtime = ?
+                WHERE id = ?
+                """,
+                (count, size, datetime.fromisoformat(newest).timestamp() if newest else None, row_id)
+            )
+            
+            # Collect the ancestors up to the root, stopping at known ones
+            while row_id is not None and row_id not in depths:
+                cursor.execute("SELECT parent_id, depth FROM directories WHERE id = ?", (row_id,))
+                parent_id, depth = cursor.fetchone()
+                depths[row_id] = depth
+                row_id = parent_id
+        
+        for row_id in sorted(depths, key=depths.get, reverse=True):
+            cursor.execute(
+                """
+                UPDATE directories SET
+                    tree_file_count = COALESCE(file_count, 0) + (
+                        SELECT COALESCE(SUM(tree_file_count), 0)
+                        FROM directories WHERE parent_id = ?
+                    ),
+                    tree_size_bytes = COALESCE(size_bytes, 0) + (
+                        SELECT COALESCE(SUM(tree_size_bytes), 0)
+                        FROM directories WHERE parent_id = ?
+                    ),
+                    tree_newest_mtime = (
+                        SELECT MAX(m) FROM (
+                            SELECT newest_mtime AS m
+                            UNION ALL
+                            SELECT MAX(tree_newest_mtime) FROM directories WHERE parent_id = ?
+                        )
+                    )
+                WHERE id = ?
+                """,
+                (row_id, row_id, row_id, row_id)
+            )
+    
+    def count_files(self, catalog_id: int, unhashed_only: bool = False) -> int:
+        """Count the files of a catalog.
+        
+        Args:
+            catalog_id: Catalog to read
+            unhashed_only: Count only files without a content hash
+        
+        Returns:
+            Number of files
+        """
+        query = "SELECT COUNT(*) AS count FROM files WHERE catalog_id = ?"
+        if unhashed_only:
+            query += " AND content_hash IS NULL"
+        return self.execute_query(query, (catalog_id,))[0]['count']
+    
+    def iter_file_paths(
+        self, 
+        catalog_id: int, 
+        unhashed_only: bool = False,
+        after_id: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, Path, Optional[Tuple[int, int]]]]:
+        """Stream the files of a catalog without loading them all.
+        
+        Files come in row id order, so a large catalog can be read a page
+        at a time by passing the last row id seen as ``after_id``, with no
+        cursor left open in between.
+        
+        Args:
+            catalog_id: Catalog to read
+            unhashed_only: Skip files that already have a content hash
+            after_id: Only read files with a larger row id
+            limit: Optional maximum number of files
+        
+        Yields:
+            (row id, absolute path, (device, inode) of hard-linked files
+            or None) for each file
+        """
+        query = """
+            SELECT id, directory_path, file_name, device, inode FROM files
+            WHERE catalog_id = ? AND id > ?
+        """
+        if unhashed_only:
+            query += " AND content_hash IS NULL"
+        query += " ORDER BY id"
+        params: Tuple = (catalog_id, after_id)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._get_connection() as conn:
+            for row_id, dir_path, name, device, inode in conn.execute(query, params):
+                yield row_id, Path(dir_path) / name, (device, inode) if inode is not None else None
+    
+    def iter_duplicate_candidates(
+        self, 
+        catalog_id: int, 
+        min_size: int = 1
+    ) -> Iterator[DuplicateCandidate]:
+        """Stream files whose size occurs more than once in a catalog.
+        
+        Args:
+            catalog_id: Catalog to read
+            min_size: Smallest file size to consider
+        
+        Yields:
+            DuplicateCandidate for each file, ordered by size
+        """
+        query = """
+            SELECT directory_path, file_name, size_bytes, device, inode
+            FROM files
+            WHERE catalog_id = ? AND size_bytes IN (
+                SELECT size_bytes FROM files
+                WHERE catalog_id = ? AND size_bytes >= ?
+                GROUP BY size_bytes HAVING COUNT(*) > 1
+            )
+            ORDER BY size_bytes
+        """
+        with self._get_connection() as conn:
+            for dir_path, name, size, device, inode in conn.execute(
+                query, (catalog_id, catalog_id, min_size)
+            ):
+                yield DuplicateCandidate(
+                    Path(dir_path) / name,
+                    size,
+                    (device, inode) if inode is not None else None
+                )
+    
+    def set_content_hashes(self, hashes: Iterable[Tuple[int, str]]) -> None:
+        """Store content hashes.
+        
+        Args:
+            hashes: (row id, "algorithm:hex digest") pairs
+        """
+        with self._get_connection() as conn:
+            conn.executemany(
+                "UPDATE files SET content_hash = ? WHERE id = ?",
+                ((content_hash, row_id) for row_id, content_hash in hashes)
+            )
+            conn.commit()
+    
+    def load_resume(self, catalog_id: int) -> Optional['CatalogResume']:
+        """Prepare an unfinished catalog for resuming its scan.
+        
+        Rows stored for the checkpoint's frontier are discarded, since they
+        may only partly cover it; everything else is kept and loaded into a
+        ScanAccumulator with the same directories and totals.
+        
+        Args:
+            catalog_id: Catalog of the interrupted scan
+        
+        Returns:
+            CatalogResume, or None if the catalog has no checkpoint
+        """
+        rows = self.execute_query(
+            """
+            SELECT c.root_path, k.checkpoint
+            FROM catalogs c JOIN scan_checkpoints k ON k.catalog_id = c.id
+            WHERE c.id = ?
+            """,
+            (catalog_id,)
+        )
+        if not rows:
+            return None
+        
+        root_path = Path(rows[0]['root_path'])
+        checkpoint = ScanCheckpoint.from_json(rows[0]['checkpoint'])
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            for rel_path, _, recursive in checkpoint.frontier:
+                key = str(Path(rel_path))
+                if recursive:
+                    # Drop the subtree's files and its directories below the root
+                    if rel_path:
+                        below = (key + os.sep, key + chr(ord(os.sep) + 1))
+                        cursor.execute(
+                            """
+                            DELETE FROM files WHERE catalog_id = ? AND (
+                                relative_path >= ? AND relative_path < ?
+                            )
+                            """,
+                            (catalog_id,) + below
+                        )
+                        cursor.execute(
+                            """
+                            DELETE FROM directories WHERE catalog_id = ? AND (
+                                relative_path >= ? AND relative_path < ?
+                            )
+                            """,
+                            (catalog_id,) + below
+                        )
+                    else:
+                        cursor.execute(
+                            "DELETE FROM files WHERE catalog_id = ?", (catalog_id,)
+                        )
+                        cursor.execute(
+                            "DELETE FROM directories WHERE catalog_id = ? AND depth > 0",
+                            (catalog_id,)
+                        )
+                else:
+                    # Drop only the files directly inside the directory
+                    cursor.execute(
+                        """
+                        DELETE FROM files WHERE catalog_id = ? AND directory_id IN (
+                            SELECT id FROM directories
+                            WHERE catalog_id = ? AND relative_path = ?
+                        )
+                        """,
+                        (catalog_id, catalog_id, key)
+                    )
+            conn.commit()
+        
+        # Rebuild the accumulator from what is left
+        accumulator = ScanAccumulator(root_path)
+        accumulator.pruned_dirs = checkpoint.pruned_dirs
+        row_ids: Dict[int, int] = {}
+        
+        dir_rows = self.execute_query(
+            """
+            SELECT id, relative_path, depth, truncated, entry_count, mtime_ns, inode
+            FROM directories WHERE catalog_id = ?
+            ORDER BY depth, id
+            """,
+            (catalog_id,)
+        )
+        for row in dir_rows:
+            rel_path = '' if row['relative_path'] == '.' else row['relative_path']
+            dir_info = accumulator.registry.register(rel_path, row['depth'])
+            dir_info.truncated = bool(row['truncated'])
+            dir_info.entry_count = row['entry_count']
+            dir_info.mtime_ns = row['mtime_ns']
+            dir_info.inode = row['inode']
+            row_ids[dir_info.id] = row['id']
+        
+        # Own totals are recounted, since stored ones may predate the frontier's cleanup
+        by_row = {row_id: accumulator.registry.get(dir_id) for dir_id, row_id in row_ids.items()}
+        own_rows = self.execute_query(
+            """
+            SELECT directory_id, COUNT(*) AS count, SUM(size_bytes) AS size,
+                   MAX(modified_date) AS newest
+            FROM files WHERE catalog_id = ?
+            GROUP BY directory_id
+            """,
+            (catalog_id,)
+        )
+        for row in own_rows:
+            dir_info = by_row.get(row['directory_id'])
+            if dir_info is not None:
+                dir_info.file_count = row['count']
+                dir_info.size_bytes = row['size']
+                dir_info.newest_mtime = datetime.fromisoformat(row['newest']).timestamp()
+        
+        ext_rows = self.execute_query(
+            """
+            SELECT extension, COUNT(*) AS count, SUM(size_bytes) AS size
+            FROM files WHERE catalog_id = ?
+            GROUP BY extension
+            """,
+            (catalog_id,)
+        )
+        for row in ext_rows:
+            ext = row['extension'] or "(no extension)"
+            accumulator.extension_stats[ext] = {"count": row['count'], "size": row['size']}
+            accumulator.total_files += row['count']
+            accumulator.total_size += row['size']
+        
+        # Count the size of each multiply-linked file once, as the scan did
+        link_rows = self.execute_query(
+            """
+            SELECT directory_id, relative_path, extension, size_bytes, link_count,
+                   device, inode
+            FROM files WHERE catalog_id = ? AND inode IS NOT NULL
+            ORDER BY id
+            """,
+            (catalog_id,)
+        )
+        for row in link_rows:
+            dir_info = by_row.get(row['directory_id'])
+            accumulator.dedupe_link(
+                (row['device'], row['inode']),
+                row['link_count'],
+                row['relative_path'],
+                dir_info.id if dir_info is not None else None,
+                row['extension'],
+                row['size_bytes']
+            )
+        
+        return CatalogResume(catalog_id, root_path, checkpoint, accumulator, row_ids)
+    
+    def get_previous_total(self, root_path: Union[str, Path]) -> Optional[int]:
+        """Get the file count of the latest complete catalog of a root.
+        
+        Args:
+            root_path: Root directory of the scan
+        
+        Returns:
+            Total files, or None if the root was never cataloged
+        """
+        catalogs = self.execute_query(
+            """
+            SELECT total_files FROM catalogs
+            WHERE root_path = ? AND status = 'active'
+            ORDER BY id DESC LIMIT 1
+            """,
+            (str(root_path),)
+        )
+        return catalogs[0]['total_files'] if catalogs else None
+    
+    def load_baseline(
+        self, 
+        root_path: Union[str, Path], 
+        catalog_id: Optional[int] = None
+    ) -> Optional['CatalogBaseline']:
+        """Load the latest complete catalog of a root as a rescan baseline.
+        
+        Args:
+            root_path: Root directory of the scan
+            catalog_id: Optional catalog to load instead of the latest one
+        
+        Returns:
+            CatalogBaseline, or None if no usable catalog exists
+        """
+        if catalog_id is None:
+            catalogs = self.execute_query(
+                """
+                SELECT id FROM catalogs
+                WHERE root_path = ? AND status = 'active'
+                ORDER BY id DESC LIMIT 1
+                """,
+                (str(root_path),)
+            )
+            if not catalogs:
+                return None
+            catalog_id = catalogs[0]['id']
+        
+        rows = self.execute_query(
+            """
+            SELECT id, relative_path, parent_id, truncated, mtime_ns, inode
+            FROM directories WHERE catalog_id = ?
+            """,
+            (catalog_id,)
+        )
+        
+        subdirs: Dict[int, List[str]] = {}
+        for row in rows:
+            if row['parent_id'] is not None:
+                subdirs.setdefault(row['parent_id'], []).append(
+                    os.path.basename(row['relative_path'])
+                )
+        
+        directories: Dict[str, BaselineDirectory] = {}
+        row_ids: Dict[str, int] = {}
+        for row in rows:
+            # Truncated directories were never descended into
+            if row['mtime_ns'] is None or row['truncated']:
+                continue
+            rel_path = '' if row['relative_path'] == '.' else row['relative_path']
+            directories[rel_path] = BaselineDirectory(
+                row['mtime_ns'], row['inode'], tuple(subdirs.get(row['id'], ()))
+            )
+            row_ids[rel_path] = row['id']
+        
+        # Catalogs written before directory state was recorded
+        if '' not in directories:
+            return None
+        
+        return CatalogBaseline(self.db_path, directories, row_ids)
     
     def get_file_info(self, catalog_id: int, path_pattern: Optional[str] = None) -> None:
         """Display detailed file information for a catalog."""
@@ -225,9 +1079,10 @@ class CatalogManager(DatabaseManager):
         
         # Get directories
         dir_query = """
-            SELECT relative_path, depth
+            SELECT relative_path, depth, truncated, entry_count,
+                   tree_file_count, tree_size_bytes
             FROM directories
-            WHERE catalog_id = ?
+            WHERE catalog_id = ? AND depth > 0
             ORDER BY depth, relative_path
         """
         
@@ -237,3 +1092,84 @@ class CatalogManager(DatabaseManager):
         tree = create_directory_tree(Path(root_path), directories, self.console)
         self.console.print("\n[bold]Directory Structure:[/]")
         self.console.print(tree)
+
+@dataclass
+class CatalogResume:
+    """State needed to continue an interrupted catalog."""
+    catalog_id: int
+    root_path: Path
+    checkpoint: ScanCheckpoint
+    accumulator: ScanAccumulator  # Directories and totals already cataloged
+    row_ids: Dict[int, int]  # Accumulator directory id -> directories row id
+
+class CatalogBaseline:
+    """Previous catalog of a root, used as a ScanBaseline.
+    
+    Directory state is loaded up front; files are read per directory on
+    demand. The connection is opened lazily and not pickled, so the
+    baseline can be handed to worker processes.
+    """
+    
+    def __init__(
+        self, 
+        db_path: Path, 
+        directories: Dict[str, BaselineDirectory], 
+        row_ids: Dict[str, int]
+    ):
+        """Initialize baseline.
+        
+        Args:
+            db_path: Path to the catalog database
+            directories: Stored directory state by relative path
+            row_ids: Directory row ids by relative path
+        """
+        self.db_path = db_path
+        self.directories = directories
+        self.row_ids = row_ids
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+    
+    def get_directory(self, relative_path: str) -> Optional[BaselineDirectory]:
+        """Get stored state for a directory ('' for the root)."""
+        return self.directories.get(relative_path)
+    
+    def get_files(self, relative_path: str) -> List[FileInfo]:
+        """Get the stored files directly inside a directory."""
+        row_id = self.row_ids.get(relative_path)
+        if row_id is None:
+            return []
+        
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        
+        rows = self._conn.execute(
+            """
+            SELECT file_name, directory_path, relative_path, extension,
+                   size_bytes, created_date, modified_date, is_hidden,
+                   link_count, device, inode
+            FROM files WHERE directory_id = ?
+            """,
+            (row_id,)
+        ).fetchall()
+        
+        files = []
+        for (name, dir_path, rel_path, ext, size, created, modified, hidden,
+                link_count, device, inode) in rows:
+            modified_date = datetime.fromisoformat(modified)
+            files.append(FileInfo.from_values(
+                name=name,
+                path=Path(dir_path) / name,
+                relative_path=Path(rel_path),
+                extension=ext,
+                size_bytes=size,
+                created_date=datetime.fromisoformat(created) if created else modified_date,
+                modified_date=modified_date,
+                is_hidden=bool(hidden),
+                link_count=link_count or 1,
+                file_id=(device, inode) if inode is not None else None
+            ))
+        return files
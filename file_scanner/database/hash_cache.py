@@ -0,0 +1,89 @@
+"""Persistent cache of file content digests."""
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from .base import DatabaseManager
+from ..core.hashing import HashKey
+
+class HashCache(DatabaseManager):
+    """Digests keyed by (dev, inode, size, mtime_ns).
+
+    One row is kept per inode and algorithm; size and mtime_ns must match
+    for a hit, so a changed file misses and its new digest replaces the
+    old one. Lookups come from hashing threads, each on its own
+    connection; close() closes them once those threads are done.
+    """
+
+    def __init__(self, db_path: str = "file_catalog.db"):
+        """Initialize hash cache."""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._generation = 0  # Bumped by close(), retiring older thread connections
+        super().__init__(db_path)
+
+    def _create_tables(self) -> None:
+        """Create the digest table if it doesn't exist."""
+        self.execute_update(
+            """
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (device, inode, algorithm)
+            ) WITHOUT ROWID
+            """
+        )
+
+    def get(self, key: HashKey, algorithm: str) -> Optional[str]:
+        """Get the cached digest of a file version, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.generation != self._generation:
+            # Closed by close() from another thread, so not tied to this one
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            with self._lock:
+                self._connections.append(conn)
+                self._local.conn = conn
+                self._local.generation = self._generation
+        device, inode, size, mtime_ns = key
+        row = conn.execute(
+            """
+            SELECT digest FROM file_hashes
+            WHERE device = ? AND inode = ? AND algorithm = ?
+                AND size_bytes = ? AND mtime_ns = ?
+            """,
+            (device, inode, algorithm, size, mtime_ns)
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """Close the connections opened by get().
+
+        Must only be called while no lookups are running; later lookups
+        open new connections.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+
+    def put_many(self, entries: Iterable[Tuple[HashKey, str]], algorithm: str) -> None:
+        """Store digests, replacing those of older versions of the files."""
+        with self._get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO file_hashes (
+                    device, inode, algorithm, size_bytes, mtime_ns, digest
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (device, inode, algorithm, size, mtime_ns, digest)
+                    for (device, inode, size, mtime_ns), digest in entries
+                )
+            )
+            conn.commit()
@@ -1,5 +1,12 @@
 """Database and metadata services."""
 from .database_service import DatabaseService, DatabaseEntry, ScanInfo
+from .hash_service import HashService, HashSummary
 from .logger_service import LoggerService
+from .root_scan_service import MultiRootScanService, RootScan
+from .watcher_service import WatcherService, WatchBatch
 
-__all__ = ['DatabaseService', 'DatabaseEntry', 'ScanInfo', 'LoggerService']
+__all__ = [
+    'DatabaseService', 'DatabaseEntry', 'ScanInfo', 'LoggerService',
+    'WatcherService', 'WatchBatch', 'MultiRootScanService', 'RootScan',
+    'HashService', 'HashSummary'
+]
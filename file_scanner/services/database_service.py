@@ -2,14 +2,17 @@
 import sqlite3
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from typing import List, Iterator, Optional, Protocol, Tuple, Set
+from typing import Iterable, List, Iterator, Optional, Protocol, Tuple, Set, Union
 from pathlib import Path
 import json
 import os
 
+from ..core import memory, profiling
+from ..core.accumulator import ScanAccumulator
 from ..core.models import FileInfo, ScanResult
 from ..core.metadata import MetadataService, FileMetadata, FileTag, FilePattern
 from ..core.directory_parser import DirectoryGroup
+from ..utils import format_size
 
 @dataclass
 class DatabaseEntry:
@@ -372,109 +375,206 @@ class DatabaseService:
     
     def notify_batch_added(self, entries: List[DatabaseEntry]) -> None:
         """Notify observers of new entries."""
-        for observer in self._observers:
-            observer.on_entries_added(entries)
+        with profiling.timed('ui.observers'):
+            for observer in self._observers:
+                observer.on_entries_added(entries)
     
     def process_scan_result(self, result: ScanResult) -> None:
         """Process scan result and update database."""
+        self.process_scan_stream(result.files, result)
+        
+        profiler = memory.active()
+        if profiler:
+            # Columnar results build FileInfo objects on access; size the columns
+            files = result.files
+            profiler.measure('ScanResult.files', getattr(files, 'columns', files), result.total_files)
+    
+    def process_scan_stream(
+        self, 
+        files: Iterable[FileInfo], 
+        summary: Union[ScanResult, ScanAccumulator]
+    ) -> None:
+        """Process files as they arrive and update database.
+        
+        Entries are analyzed, saved and sent to observers batch by batch
+        while the iterable is consumed, e.g. from FileScanner.iter_scan.
+        Totals are read from the summary once the stream is exhausted.
+        With a ScanAccumulator, directories are only complete then, so
+        directory groups are built from the scan afterwards and their tags
+        and info added to the entries already saved.
+        
+        Args:
+            files: Files to process
+            summary: ScanResult or ScanAccumulator describing the scan
+        """
         self.clear()
         
         try:
             # Save scan to database
             scan_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Analyze directory structure first
-            root_path = Path(result.root_path)
-            directory_group = self.metadata_service.analyze_directory(root_path)
+            # Analyze directory structure first, unless files are still arriving
+            root_path = Path(summary.root_path)
+            streamed: Optional[List[FileInfo]] = None
+            if isinstance(summary, ScanAccumulator):
+                streamed = []
+                self.metadata_service.current_root = None  # No groups yet
+            else:
+                with profiling.timed('analysis.directory'):
+                    self.metadata_service.analyze_scan(summary)
+                memory.checkpoint('analyze directory')
             
             with sqlite3.connect(self.db_path) as conn:
-                # Insert scan record
+                # Insert scan record; totals are updated at the end
                 cursor = conn.execute(
                     """
                     INSERT INTO scans (scan_date, root_path, total_files, total_size)
-                    VALUES (?, ?, ?, ?)
+                    VALUES (?, ?, 0, ?)
                     """,
-                    (
-                        scan_date,
-                        str(result.root_path),
-                        result.total_files,
-                        result.formatted_total_size
-                    )
+                    (scan_date, str(summary.root_path), format_size(0))
                 )
                 scan_id = cursor.lastrowid
+                # Rows above this id are this scan's, in insertion order
+                last_file_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM files").fetchone()[0]
                 
                 # Update current scan info
                 self._current_scan = ScanInfo(
                     timestamp=scan_date,
-                    root_path=str(result.root_path),
-                    total_files=result.total_files,
-                    total_size=result.formatted_total_size
+                    root_path=str(summary.root_path),
+                    total_files=0,
+                    total_size=format_size(0)
                 )
                 
                 # Notify observers of scan time
                 for observer in self._observers:
                     observer.set_scan_time(scan_date)
                 
-                # Insert files in batches
-                batch = []
-                for file_info in result.files:
-                    # Analyze file metadata
-                    metadata = self.metadata_service.analyze_file(
-                        Path(result.root_path) / file_info.relative_path
+                # Analyze and insert files in batches
+                pending = []
+                for file_info in files:
+                    pending.append(file_info)
+                    if len(pending) >= self.BATCH_SIZE:
+                        self._process_batch(conn, scan_id, root_path, pending)
+                        if streamed is not None:
+                            streamed.extend(pending)
+                        pending = []
+                
+                # Process remaining files
+                if pending:
+                    self._process_batch(conn, scan_id, root_path, pending)
+                    if streamed is not None:
+                        streamed.extend(pending)
+                memory.checkpoint('analyze and save files')
+                
+                if streamed is not None:
+                    with profiling.timed('analysis.directory'):
+                        self.metadata_service.analyze_scan(summary.to_result(streamed))
+                        self._apply_directory_groups(conn, last_file_id, root_path, streamed)
+                    memory.checkpoint('analyze directory')
+                
+                profiler = memory.active()
+                if profiler:
+                    files_seen = len(self._entries)
+                    profiler.measure(
+                        'MetadataService.metadata', self.metadata_service.metadata, files_seen
                     )
-                    
-                    # Create entry
-                    entry = DatabaseEntry.from_file_info(file_info, metadata)
-                    self._entries.append(entry)
-                    batch.append((entry, metadata))
-                    
-                    if len(batch) >= self.BATCH_SIZE:
-                        # Save batch to database
-                        self._save_batch(conn, scan_id, batch)
-                        # Notify observers
-                        self.notify_batch_added([e for e, _ in batch])
-                        batch = []
+                    profiler.measure('DatabaseService._entries', self._entries, files_seen)
                 
-                # Process remaining entries
-                if batch:
-                    self._save_batch(conn, scan_id, batch)
-                    self.notify_batch_added([e for e, _ in batch])
+                # Record final totals
+                self._current_scan.total_files = summary.total_files
+                self._current_scan.total_size = summary.formatted_total_size
+                conn.execute(
+                    "UPDATE scans SET total_files = ?, total_size = ? WHERE id = ?",
+                    (summary.total_files, summary.formatted_total_size, scan_id)
+                )
         
         except Exception as e:
             if self.logger:
                 self.logger.log_error(f"Failed to save scan: {str(e)}")
             raise
     
+    def _process_batch(self, conn: sqlite3.Connection, scan_id: int, 
+                       root_path: Path, files: List[FileInfo]) -> None:
+        """Analyze, save and publish a batch of files."""
+        # Analyze file metadata; names are parsed together
+        with profiling.timed('analysis.file'):
+            metadata_list = self.metadata_service.analyze_files(
+                [root_path / file_info.relative_path for file_info in files]
+            )
+        
+        # Create entries
+        with profiling.timed('analysis.entry'):
+            batch = [
+                (DatabaseEntry.from_file_info(file_info, metadata), metadata)
+                for file_info, metadata in zip(files, metadata_list)
+            ]
+        self._entries.extend(entry for entry, _ in batch)
+        
+        # Save batch to database and notify observers
+        self._save_batch(conn, scan_id, batch)
+        self.notify_batch_added([entry for entry, _ in batch])
+    
+    def _apply_directory_groups(self, conn: sqlite3.Connection, after_id: int,
+                                root_path: Path, files: List[FileInfo]) -> None:
+        """Add directory tags and info to the saved entries of streamed files.
+        
+        The entries' rows are those with ids above after_id, in order.
+        """
+        metadata_list = self.metadata_service.apply_directory_groups(
+            [root_path / file_info.relative_path for file_info in files]
+        )
+        analyzer = self.metadata_service.directory_analyzer
+        row_ids = [
+            row[0] for row in conn.execute("SELECT id FROM files WHERE id > ? ORDER BY id", (after_id,))
+        ]
+        updates = []
+        # Entries were cleared when the scan started, so they match the files
+        for row_id, entry, metadata in zip(row_ids, self._entries, metadata_list):
+            if metadata.directory_group is None:
+                continue
+            entry.tags = {tag.name for tag in metadata.tags}
+            entry.directory_info = analyzer.format_group_info(metadata.directory_group)
+            updates.append((
+                json.dumps(list(entry.tags)) if entry.tags else None,
+                entry.directory_info,
+                row_id
+            ))
+        with profiling.timed('persist.save_batch'):
+            conn.executemany(
+                "UPDATE files SET tags = ?, directory_info = ? WHERE id = ?", updates
+            )
+    
     def _save_batch(self, conn: sqlite3.Connection, scan_id: int, 
                    batch: List[Tuple[DatabaseEntry, FileMetadata]]) -> None:
         """Save a batch of entries to database."""
-        conn.executemany(
-            """
-            INSERT INTO files (
-                scan_id, name, path, size, created, modified, extension,
-                tags, category, subcategory, patterns, parsed_info, directory_info
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            [
-                (
-                    scan_id,
-                    entry.name,
-                    entry.path,
-                    entry.size,
-                    entry.created,
-                    entry.modified,
-                    entry.extension,
-                    json.dumps(list(entry.tags)) if entry.tags else None,
-                    entry.category,
-                    entry.subcategory,
-                    json.dumps(list(entry.patterns)) if entry.patterns else None,
-                    entry.parsed_info,
-                    entry.directory_info
+        with profiling.timed('persist.save_batch'):
+            conn.executemany(
+                """
+                INSERT INTO files (
+                    scan_id, name, path, size, created, modified, extension,
+                    tags, category, subcategory, patterns, parsed_info, directory_info
                 )
-                for entry, _ in batch
-            ]
-        )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        scan_id,
+                        entry.name,
+                        entry.path,
+                        entry.size,
+                        entry.created,
+                        entry.modified,
+                        entry.extension,
+                        json.dumps(list(entry.tags)) if entry.tags else None,
+                        entry.category,
+                        entry.subcategory,
+                        json.dumps(list(entry.patterns)) if entry.patterns else None,
+                        entry.parsed_info,
+                        entry.directory_info
+                    )
+                    for entry, _ in batch
+                ]
+            )
     
     @property
     def columns(self) -> List[str]:
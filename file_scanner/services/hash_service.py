@@ -0,0 +1,155 @@
+"""Service adding content hashes to a catalog."""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..core.budget import IOBudget, IOThrottle
+from ..core.duplicates import EDGE_BYTES, DuplicateFinder, DuplicateReport
+from ..core.hashing import DEFAULT_ALGORITHM, FileHasher, HashResult
+from ..database.catalog import CatalogManager
+from ..database.hash_cache import HashCache
+
+@dataclass
+class HashSummary:
+    """Totals of one hashing run."""
+    total: int = 0  # Files without a hash when the run started, each hard link included
+    files: int = 0  # Files hashed or taken from the cache
+    cached: int = 0  # Files whose digest came from the cache
+    bytes_read: int = 0  # Bytes actually hashed; hard links are read once
+    failed: int = 0  # Files that could not be read, or changed while read
+
+class HashService:
+    """Hashes the files of a catalog and stores the digests.
+
+    This is the optional stage after a scan: files are hashed on a
+    FileHasher's threads, digests are looked up in and added to a
+    HashCache, and written to ``files.content_hash`` in batches. Files of
+    a catalog that already have a hash are skipped, so an interrupted run
+    can be repeated. Hard links to one file are read once and their rows
+    all get its digest.
+
+    find_duplicates() instead reads only files that might have a
+    duplicate, and shares the same cache.
+    """
+
+    BATCH_SIZE = 1000
+    PAGE_SIZE = 10_000  # Catalog rows read before hashing them
+
+    def __init__(
+        self,
+        catalog_manager: CatalogManager,
+        workers: int = 4,
+        algorithm: str = DEFAULT_ALGORITHM,
+        cache: Optional[HashCache] = None,
+        io_budget: Optional[IOBudget] = None
+    ):
+        """Initialize service.
+
+        Args:
+            catalog_manager: Catalog holding the files
+            workers: Threads reading and hashing files
+            algorithm: Any hashlib algorithm name
+            cache: Digest cache; defaults to one in the catalog database
+            io_budget: Optional limits on the stats and reads issued
+        """
+        self.catalog_manager = catalog_manager
+        self.cache = cache or HashCache(str(catalog_manager.db_path))
+        self.throttle = IOThrottle(io_budget) if io_budget else None
+        self.hasher = FileHasher(workers, algorithm, self.cache, throttle=self.throttle)
+        self.summary = HashSummary()
+
+    def hash_catalog(self, catalog_id: int) -> Iterator[HashResult]:
+        """Hash the catalog's files that have no hash yet.
+
+        Files are read from the catalog PAGE_SIZE rows at a time, so memory
+        does not grow with the catalog. Within a page, hard links to one
+        file are hashed once; a link in a later page finds the digest in
+        the cache. Digests are stored as results are consumed; progress so
+        far is in ``summary``.
+
+        Args:
+            catalog_id: Catalog to hash
+
+        Yields:
+            HashResult for each file; ``ref`` is the row ids of its links
+        """
+        self.summary = HashSummary(
+            total=self.catalog_manager.count_files(catalog_id, unhashed_only=True)
+        )
+        batch = []
+        last_id = 0
+        try:
+            while True:
+                # The page is read completely, closing the cursor before any write
+                files, last_id = self._read_page(catalog_id, last_id)
+                if not files:
+                    break
+
+                for result in self.hasher.hash_files(files):
+                    rows = len(result.ref)
+                    self.summary.files += rows
+                    if result.digest is None:
+                        self.summary.failed += rows
+                    else:
+                        if result.cached:
+                            self.summary.cached += rows
+                        else:
+                            self.summary.bytes_read += result.size_bytes
+                        batch.extend((row_id, result.content_hash) for row_id in result.ref)
+                        if len(batch) >= self.BATCH_SIZE:
+                            self.catalog_manager.set_content_hashes(batch)
+                            batch = []
+                    yield result
+        finally:
+            if batch:
+                self.catalog_manager.set_content_hashes(batch)
+
+    def _read_page(
+        self,
+        catalog_id: int,
+        after_id: int
+    ) -> Tuple[List[Tuple[List[int], Path]], int]:
+        """Read a page of unhashed files, grouping the rows of hard links.
+
+        Returns:
+            ((row ids, path) per file in the order of their first row,
+            last row id read)
+        """
+        files: List[Tuple[List[int], Path]] = []
+        links: Dict[Tuple[int, int], List[int]] = {}
+        last_id = after_id
+        for row_id, path, file_id in self.catalog_manager.iter_file_paths(
+            catalog_id, unhashed_only=True, after_id=after_id, limit=self.PAGE_SIZE
+        ):
+            if file_id is None:
+                files.append(([row_id], path))
+            elif file_id in links:
+                links[file_id].append(row_id)
+            else:
+                links[file_id] = [row_id]
+                files.append((links[file_id], path))
+            last_id = row_id
+        return files, last_id
+
+    def find_duplicates(
+        self,
+        catalog_id: int,
+        min_size: int = 1,
+        edge: int = EDGE_BYTES
+    ) -> DuplicateReport:
+        """Find files with identical content in a catalog.
+
+        Only files sharing their size with another file are read, first
+        at both ends and then, if those match, in full (see
+        DuplicateFinder).
+
+        Args:
+            catalog_id: Catalog to search
+            min_size: Smallest file size to consider
+            edge: Bytes hashed at each end of a file in the partial pass
+
+        Returns:
+            DuplicateReport
+        """
+        finder = DuplicateFinder(self.hasher, edge)
+        return finder.find(self.catalog_manager.iter_duplicate_candidates(catalog_id, min_size))
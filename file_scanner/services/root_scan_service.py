@@ -0,0 +1,125 @@
+"""Service scanning several roots into one catalog each."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from ..core.accumulator import ScanAccumulator
+from ..core.baseline import NestedRootBaseline, ScanBaseline
+from ..core.ignore import IgnoreMatcher
+from ..core.models import ScanOptions, ScanResult
+from ..core.roots import RootPlan, WorkerPools, plan_roots
+from ..core.scanner import FileScanner
+from ..database.catalog import CatalogManager
+
+@dataclass
+class RootScan:
+    """Outcome of scanning one root."""
+    root_path: Path
+    catalog_id: int
+    result: ScanResult
+    nested: List[Path] = field(default_factory=list)  # Roots taken from their own catalogs
+
+class MultiRootScanService:
+    """Scans many roots in one process, one catalog per root.
+
+    Duplicate roots are dropped and roots nested inside others are scanned
+    first (see plan_roots). The outer scan then uses the catalogs just
+    written for its nested roots as its baseline, so each shared subtree is
+    listed once; the outer scan only stats its directories to confirm they
+    have not changed in between. Anchored ignore patterns and ignore files
+    are evaluated relative to each root, so with those the nested roots'
+    catalogs may lack files the outer root keeps, and the outer scan lists
+    the shared subtrees again. All scans share one WorkerPools, so the
+    options' workers and processes are a budget for the whole run.
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[Union[str, Path]],
+        catalog_manager: CatalogManager,
+        options: Optional[ScanOptions] = None,
+        incremental: bool = False,
+        logger=None
+    ):
+        """Initialize service.
+
+        Args:
+            roots: Directories to scan
+            catalog_manager: Catalog receiving one catalog per root
+            options: Scan options shared by all roots
+            incremental: Reuse unchanged directories from each root's
+                previous catalog
+            logger: Optional LoggerService
+
+        Raises:
+            FileNotFoundError: If a root doesn't exist
+        """
+        self.catalog_manager = catalog_manager
+        self.options = options or ScanOptions()
+        self.incremental = incremental
+        self.logger = logger
+        self.plans, self.duplicates = plan_roots(roots)
+        # Rules that depend on the root make nested catalogs unusable
+        self.reuse_nested = not self.options.ignore_files and not any(
+            rule.anchored
+            for rule in IgnoreMatcher.from_patterns(self.options.ignore_patterns).rules
+        )
+
+    def scan(self) -> Iterator[RootScan]:
+        """Scan the roots in plan order.
+
+        Stops after the first interrupted root; its RootScan is still
+        yielded with ``result.interrupted`` set.
+
+        Yields:
+            RootScan for each root as it completes
+        """
+        catalog_ids: Dict[Path, int] = {}
+
+        with WorkerPools(self.options.workers, self.options.processes) as pools:
+            for plan in self.plans:
+                scanner = FileScanner(
+                    plan.path,
+                    self.options,
+                    baseline=self._create_baseline(plan, catalog_ids),
+                    expected_files=self.catalog_manager.get_previous_total(plan.path),
+                    pools=pools
+                )
+                accumulator = ScanAccumulator(scanner.root_path)
+                catalog_id = self.catalog_manager.create_catalog_from_stream(
+                    scanner.iter_scan(accumulator), accumulator, checkpoint=scanner.checkpoint
+                )
+                catalog_ids[plan.path] = catalog_id
+
+                result = accumulator.to_result()
+                if self.logger:
+                    self.logger.log_action(
+                        f"Cataloged {plan.path} as {catalog_id}: "
+                        f"{result.total_files:,} files, {result.formatted_total_size}"
+                    )
+                yield RootScan(
+                    plan.path, catalog_id, result, plan.nested if self.reuse_nested else []
+                )
+
+                if result.interrupted:
+                    return
+
+    def _create_baseline(
+        self,
+        plan: RootPlan,
+        catalog_ids: Dict[Path, int]
+    ) -> Optional[ScanBaseline]:
+        """Combine the nested roots' new catalogs with the previous catalog."""
+        fallback = None
+        if self.incremental:
+            fallback = self.catalog_manager.load_baseline(plan.path)
+
+        nested: Dict[str, ScanBaseline] = {}
+        for inner in plan.nested if self.reuse_nested else []:
+            baseline = self.catalog_manager.load_baseline(inner, catalog_ids[inner])
+            if baseline is not None:
+                nested[plan.relative_path(inner)] = baseline
+
+        if not nested:
+            return fallback
+        return NestedRootBaseline(str(plan.path), nested, fallback)
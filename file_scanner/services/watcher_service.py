@@ -0,0 +1,293 @@
+"""Service keeping a file catalog current from inotify events."""
+import errno
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..core.accumulator import ScanAccumulator
+from ..core.inotify import (
+    Inotify, IN_ATTRIB, IN_CLOSE_WRITE, IN_CREATE, IN_DELETE, IN_DONT_FOLLOW,
+    IN_EXCL_UNLINK, IN_IGNORED, IN_MODIFY, IN_MOVED_FROM, IN_MOVED_TO,
+    IN_ONLYDIR, IN_Q_OVERFLOW
+)
+from ..core.models import DirectoryInfo, FileInfo
+from ..core.scanner import FileScanner
+from ..database.catalog import CatalogManager
+
+@dataclass
+class WatchBatch:
+    """Summary of one batch of changes applied to the catalog."""
+    files: int = 0  # Files inserted or updated
+    directories: int = 0  # Directories added
+    removed: int = 0  # Paths removed
+    rescanned: bool = False  # The event queue overflowed; a new catalog was built
+
+class WatcherService:
+    """Watches a scanned tree and applies changes to its catalog.
+
+    After an initial scan into a new catalog, every cataloged directory is
+    watched with inotify. Events are buffered per path until the tree has
+    been quiet for ``settle`` seconds (or ``max_delay`` has passed since the
+    first buffered event), then each changed path is stat'ed once and the
+    batch is written with CatalogManager.apply_changes. New directories are
+    scanned with the scanner's options; other directories are never listed
+    again.
+
+    Changes made during the initial scan, before a directory is watched,
+    are only picked up when that path changes again. If the kernel event
+    queue overflows, the tree is rescanned into a new catalog.
+    """
+
+    WATCH_MASK = (
+        IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO |
+        IN_CLOSE_WRITE | IN_MODIFY | IN_ATTRIB |
+        IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK
+    )
+    # Directory events that change the tree structure
+    STRUCTURE_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+
+    SETTLE_SECONDS = 0.5
+    MAX_DELAY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        scanner: FileScanner,
+        catalog_manager: CatalogManager,
+        settle: float = SETTLE_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        logger=None
+    ):
+        """Initialize watcher.
+
+        Args:
+            scanner: Scanner for the watched root and its options
+            catalog_manager: Catalog receiving the changes
+            settle: Quiet period that ends a burst of events
+            max_delay: Longest time a change waits before being written
+            logger: Optional LoggerService
+        """
+        self.scanner = scanner
+        self.catalog_manager = catalog_manager
+        self.settle = settle
+        self.max_delay = max_delay
+        self.logger = logger
+        self.catalog_id: Optional[int] = None
+
+        self._inotify: Optional[Inotify] = None
+        self._paths: Dict[int, str] = {}  # Watch descriptor -> relative path
+        self._wds: Dict[str, int] = {}  # Relative path -> watch descriptor
+        self._pending: Dict[str, bool] = {}  # Relative path -> structural dir change
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._overflowed = False
+        self._watch_limit_reported = False
+
+    def start(self) -> int:
+        """Scan the tree into a new catalog and start watching it.
+
+        Returns:
+            ID of the new catalog
+
+        Raises:
+            WatchError: If inotify is not available
+        """
+        self.close()
+        self._inotify = Inotify()
+        self.scanner.forget_ignore_rules()
+
+        accumulator = ScanAccumulator(self.scanner.root_path)
+        self.catalog_id = self.catalog_manager.create_catalog_from_stream(
+            self.scanner.iter_scan(accumulator), accumulator
+        )
+
+        for dir_info in accumulator.directories:
+            self._watch(self._key(dir_info))
+
+        if self.logger:
+            self.logger.log_action(
+                f"Watching {len(self._wds):,} directories under {self.scanner.root_path}"
+            )
+        return self.catalog_id
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[WatchBatch]:
+        """Wait for events and write the buffered batch once it has settled.
+
+        Args:
+            timeout: Longest time to wait for events; None waits until
+                a batch is due
+
+        Returns:
+            WatchBatch if changes were written, otherwise None
+        """
+        if self._pending:
+            due = min(self._last_event + self.settle, self._first_event + self.max_delay)
+            wait = max(0.0, due - time.monotonic())
+            timeout = wait if timeout is None else min(timeout, wait)
+
+        for event in self._inotify.read_events(timeout):
+            if event.mask & IN_Q_OVERFLOW:
+                self._overflowed = True
+                continue
+            if event.mask & IN_IGNORED:
+                rel_path = self._paths.pop(event.wd, None)
+                if rel_path is not None and self._wds.get(rel_path) == event.wd:
+                    del self._wds[rel_path]
+                continue
+
+            dir_path = self._paths.get(event.wd)
+            if dir_path is None or not event.name:
+                continue
+
+            rel_path = os.path.join(dir_path, event.name) if dir_path else event.name
+            if event.is_dir:
+                # Attribute changes on directories don't affect the catalog
+                if event.mask & self.STRUCTURE_MASK:
+                    self._buffer(rel_path, True)
+            else:
+                self._buffer(rel_path, self._pending.get(rel_path, False))
+
+        if self._overflowed:
+            return self._rescan()
+
+        if not self._pending:
+            return None
+
+        now = time.monotonic()
+        if now - self._last_event < self.settle and now - self._first_event < self.max_delay:
+            return None
+        return self.flush()
+
+    def flush(self) -> WatchBatch:
+        """Write all buffered changes to the catalog now."""
+        pending, self._pending = self._pending, {}
+        batch = WatchBatch()
+        directories: List[DirectoryInfo] = []
+        files: List[FileInfo] = []
+        removed: List[str] = []
+
+        # Ignore rules change with ignore files and with replaced directories
+        ignore_files = self.scanner.options.ignore_files
+        for rel_path, is_dir in pending.items():
+            if is_dir:
+                self.scanner.forget_ignore_rules(rel_path)
+            elif os.path.basename(rel_path) in ignore_files:
+                self.scanner.forget_ignore_rules(os.path.dirname(rel_path))
+
+        # Replace whole subtrees. A moved directory keeps its watch, which
+        # is returned again when its new path is watched, so every old path
+        # is unwatched before any new one is watched.
+        for rel_path, is_dir in pending.items():
+            if is_dir:
+                self._unwatch(rel_path)
+                removed.append(rel_path)
+
+        for rel_path, is_dir in pending.items():
+            if not is_dir or not self._should_scan_directory(rel_path):
+                # Also covers a directory replaced by a file
+                file_info = self.scanner.stat_file(rel_path)
+                if file_info is not None:
+                    files.append(file_info)
+                elif not is_dir:
+                    removed.append(rel_path)
+                continue
+
+            result = self.scanner.scan_subtree(rel_path)
+            for dir_info in result.directories:
+                # Ancestors are registered by the subtree scan but not listed
+                if dir_info.mtime_ns is None:
+                    continue
+                directories.append(dir_info)
+                self._watch(self._key(dir_info))
+            files.extend(result.files)
+
+        if directories or files or removed:
+            self.catalog_manager.apply_changes(
+                self.catalog_id, directories, files, removed
+            )
+
+        batch.files = len(files)
+        batch.directories = len(directories)
+        batch.removed = len(removed)
+        if self.logger:
+            self.logger.log_action(
+                f"Catalog {self.catalog_id}: {batch.files:,} files updated, "
+                f"{batch.directories:,} directories added, {batch.removed:,} paths removed"
+            )
+        return batch
+
+    def run(self) -> None:
+        """Apply changes until interrupted."""
+        try:
+            while True:
+                self.poll()
+        finally:
+            if self._pending:
+                self.flush()
+            self.close()
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        self._paths.clear()
+        self._wds.clear()
+        self._pending.clear()
+        self._overflowed = False
+
+    def _buffer(self, rel_path: str, is_dir: bool) -> None:
+        """Record a changed path for the next batch."""
+        now = time.monotonic()
+        if not self._pending:
+            self._first_event = now
+        self._last_event = now
+        self._pending[rel_path] = is_dir
+
+    def _rescan(self) -> WatchBatch:
+        """Rebuild the catalog after events were lost."""
+        if self.logger:
+            self.logger.log_error("inotify event queue overflowed; rescanning")
+        self.start()
+        return WatchBatch(rescanned=True)
+
+    def _should_scan_directory(self, rel_path: str) -> bool:
+        """Check whether a new directory belongs in the catalog."""
+        path = self.scanner.root_path / rel_path
+        if not path.is_dir() or path.is_symlink():
+            return False
+        max_depth = self.scanner.options.max_depth
+        if max_depth is not None and rel_path.count(os.sep) + 1 > max_depth:
+            return False
+        return self.scanner._should_process_path(path, is_dir=True)
+
+    def _key(self, dir_info: DirectoryInfo) -> str:
+        """Get the watch key of a directory ('' for the root)."""
+        return str(dir_info.relative_path) if dir_info.depth else ''
+
+    def _watch(self, rel_path: str) -> None:
+        """Start watching a directory."""
+        path = os.path.join(self.scanner.root_path, rel_path)
+        try:
+            wd = self._inotify.add_watch(path, self.WATCH_MASK)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                if not self._watch_limit_reported and self.logger:
+                    self.logger.log_error(
+                        "inotify watch limit reached; raise fs.inotify.max_user_watches"
+                    )
+                self._watch_limit_reported = True
+            elif self.logger:
+                self.logger.log_error(f"Cannot watch {path}: {e.strerror}")
+            return
+
+        self._paths[wd] = rel_path
+        self._wds[rel_path] = wd
+
+    def _unwatch(self, rel_path: str) -> None:
+        """Stop watching a directory and everything below it."""
+        prefix = rel_path + os.sep
+        for key in [k for k in self._wds if k == rel_path or k.startswith(prefix)]:
+            wd = self._wds.pop(key)
+            self._paths.pop(wd, None)
+            self._inotify.rm_watch(wd)
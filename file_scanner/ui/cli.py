@@ -1,22 +1,60 @@
 """Command-line interface handling."""
 import argparse
 import sys
+from datetime import datetime
 from pathlib import Path
-from typing import NoReturn
+from typing import List, NoReturn, Optional
 from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
 from rich import print as rprint
 
+from ..core.accumulator import ScanAccumulator
+from ..core import memory, profiling
+from ..core.budget import IOBudget
+from ..core.hashing import DEFAULT_ALGORITHM
+from ..core.ignore import DEFAULT_IGNORE_FILES
 from ..core.models import ScanOptions
 from ..core.scanner import FileScanner
 from ..database.stats import StatsManager
 from ..database.catalog import CatalogManager
+from ..services.hash_service import HashService, HashSummary
+from ..services.root_scan_service import MultiRootScanService
+from ..services.watcher_service import WatcherService
+from ..utils import ensure_path, format_size, format_timestamp, parse_size
 from ..utils.formatting import (
     create_scan_header,
     create_scan_summary,
     create_file_table,
-    create_directory_tree
+    create_directory_tree,
+    create_duplicates_table,
+    create_memory_containers_table,
+    create_memory_samples_table,
+    create_profile_table
 )
 
+def add_budget_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add I/O budget options to a command."""
+    parser.add_argument(
+        '--max-ops',
+        type=float,
+        metavar='N',
+        help='Limit directory listings, stats and reads to N per second'
+    )
+    parser.add_argument(
+        '--max-bandwidth',
+        type=parse_size,
+        metavar='SIZE',
+        help='Limit file reads to SIZE per second (e.g. 20MB)'
+    )
+    parser.add_argument(
+        '--budget-window',
+        type=str,
+        nargs='+',
+        metavar='HH:MM-HH:MM',
+        help='Only apply the limits during these local times (e.g. 08:00-18:00)'
+    )
+
 def create_arg_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser."""
     parser = argparse.ArgumentParser(
@@ -31,28 +69,118 @@ def create_arg_parser() -> argparse.ArgumentParser:
     scan_parser.add_argument(
         'directory',
         type=str,
-        help='Directory path to scan'
+        nargs='*',
+        help='Directory paths to scan, one catalog each (omit with --resume)'
     )
     scan_parser.add_argument(
-        '--depth',
+        '--roots-file',
+        type=str,
+        help='File listing directories to scan, one per line (# starts a comment)'
+    )
+    
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        'watch', help='Scan a directory and keep its catalog up to date'
+    )
+    watch_parser.add_argument(
+        'directory',
+        type=str,
+        help='Directory path to watch'
+    )
+    watch_parser.add_argument(
+        '--settle',
+        type=float,
+        default=WatcherService.SETTLE_SECONDS,
+        help='Seconds without events before a batch of changes is written'
+    )
+    
+    # Scan options
+    for p in [scan_parser, watch_parser]:
+        p.add_argument(
+            '--depth',
+            type=int,
+            help='Maximum directory depth to scan (root is 0)'
+        )
+        p.add_argument(
+            '--no-hidden',
+            action='store_true',
+            help='Ignore hidden files and directories'
+        )
+        p.add_argument(
+            '--ignore',
+            type=str,
+            nargs='+',
+            help='Patterns to ignore, in .gitignore syntax (e.g., *.tmp build/ !keep.tmp)'
+        )
+        p.add_argument(
+            '--ignore-files',
+            type=str,
+            nargs='*',
+            metavar='NAME',
+            help='Honor per-directory ignore files '
+                 f"(default names: {', '.join(DEFAULT_IGNORE_FILES)})"
+        )
+        p.add_argument(
+            '--follow-links',
+            action='store_true',
+            help='Follow symbolic links'
+        )
+        p.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Threads listing directories in parallel (useful on network shares)'
+        )
+        p.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Worker processes scanning separate subtrees'
+        )
+    
+    scan_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse unchanged directories from the last catalog of this path'
+    )
+    scan_parser.add_argument(
+        '--resume',
         type=int,
-        help='Maximum depth for directory tree display'
+        metavar='CATALOG_ID',
+        help='Continue an interrupted scan from its last checkpoint'
     )
     scan_parser.add_argument(
-        '--no-hidden',
+        '--hash',
         action='store_true',
-        help='Ignore hidden files and directories'
+        help='Hash file contents after the scan (unchanged files come from the hash cache)'
+    )
+    scan_parser.add_argument(
+        '--hash-workers',
+        type=int,
+        default=4,
+        help='Threads hashing files'
     )
     scan_parser.add_argument(
-        '--ignore',
+        '--profile',
+        action='store_true',
+        help='Time the walk, stat, analysis and persistence phases and print a breakdown'
+    )
+    scan_parser.add_argument(
+        '--profile-output',
         type=str,
-        nargs='+',
-        help='Patterns to ignore (e.g., *.tmp)'
+        metavar='FILE',
+        help='Also write the phase breakdown to FILE as JSON (implies --profile)'
     )
     scan_parser.add_argument(
-        '--follow-links',
+        '--memory-profile',
         action='store_true',
-        help='Follow symbolic links'
+        help='Trace memory use at each phase and per data structure (slows the scan)'
+    )
+    scan_parser.add_argument(
+        '--memory-profile-output',
+        type=str,
+        metavar='FILE',
+        help='Also write the memory report to FILE as JSON (implies --memory-profile)'
     )
     
     # List command
@@ -79,6 +207,52 @@ def create_arg_parser() -> argparse.ArgumentParser:
         help='Catalog ID to show tree for'
     )
     
+    # Hash command
+    hash_parser = subparsers.add_parser('hash', help='Add content hashes to a catalog')
+    hash_parser.add_argument(
+        'catalog_id',
+        type=int,
+        help='Catalog ID to hash'
+    )
+    hash_parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Threads hashing files'
+    )
+    hash_parser.add_argument(
+        '--algorithm',
+        type=str,
+        default=DEFAULT_ALGORITHM,
+        help='hashlib algorithm name'
+    )
+    
+    # Dupes command
+    dupes_parser = subparsers.add_parser('dupes', help='Find duplicate files in a catalog')
+    dupes_parser.add_argument(
+        'catalog_id',
+        type=int,
+        help='Catalog ID to search'
+    )
+    dupes_parser.add_argument(
+        '--min-size',
+        type=parse_size,
+        default=1,
+        help='Smallest file size to consider, e.g. 1M (empty files are skipped by default)'
+    )
+    dupes_parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Threads hashing files'
+    )
+    dupes_parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='Number of duplicate sets to show'
+    )
+    
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Show scan statistics')
     stats_parser.add_argument(
@@ -87,8 +261,14 @@ def create_arg_parser() -> argparse.ArgumentParser:
         help='Scan ID to analyze'
     )
     
+    for p in [scan_parser, watch_parser, hash_parser, dupes_parser]:
+        add_budget_arguments(p)
+    
     # Database options
-    for p in [scan_parser, list_parser, files_parser, tree_parser, stats_parser]:
+    for p in [
+        scan_parser, watch_parser, list_parser, files_parser, tree_parser,
+        hash_parser, dupes_parser, stats_parser
+    ]:
         p.add_argument(
             '--stats-db',
             type=str,
@@ -104,29 +284,271 @@ def create_arg_parser() -> argparse.ArgumentParser:
     
     return parser
 
+def create_io_budget(args: argparse.Namespace) -> Optional[IOBudget]:
+    """Create an I/O budget from command arguments, if any limit is set."""
+    if args.max_ops is None and args.max_bandwidth is None:
+        return None
+    return IOBudget(args.max_ops, args.max_bandwidth, args.budget_window)
+
+def create_scan_options(args: argparse.Namespace) -> ScanOptions:
+    """Create scan options from command arguments."""
+    return ScanOptions(
+        max_depth=args.depth,
+        follow_links=args.follow_links,
+        ignore_patterns=args.ignore,
+        include_hidden=not args.no_hidden,
+        workers=args.workers,
+        processes=args.processes,
+        # A bare --ignore-files selects the default names
+        ignore_files=(
+            list(DEFAULT_IGNORE_FILES) if args.ignore_files == [] else args.ignore_files
+        ),
+        io_budget=create_io_budget(args)
+    )
+
+def read_roots_file(path: str) -> List[str]:
+    """Read directory paths from a roots file, skipping blanks and comments."""
+    roots = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                roots.append(line)
+    return roots
+
+def run_hash_stage(
+    catalog_manager: CatalogManager,
+    catalog_id: int,
+    workers: int,
+    algorithm: str = DEFAULT_ALGORITHM,
+    io_budget: Optional[IOBudget] = None
+) -> HashSummary:
+    """Hash a catalog's unhashed files with a progress bar."""
+    service = HashService(catalog_manager, workers, algorithm, io_budget=io_budget)
+    results = service.hash_catalog(catalog_id)
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn()
+    ) as progress:
+        task = None
+        for result in results:
+            if task is None:
+                task = progress.add_task("Hashing files...", total=service.summary.total)
+            throttled = service.throttle is not None and service.throttle.throttled
+            progress.update(
+                task,
+                advance=len(result.ref),  # Rows of every hard link to the file
+                description="Hashing files... [yellow]throttled[/]" if throttled else "Hashing files..."
+            )
+    
+    summary = service.summary
+    rprint(
+        f"[green]Hashed {summary.files:,} files[/] "
+        f"({summary.cached:,} from cache, {format_size(summary.bytes_read)} read"
+        + (f", [red]{summary.failed:,} failed[/]" if summary.failed else "") + ")"
+    )
+    return summary
+
+def report_profile(args: argparse.Namespace, console: Console) -> None:
+    """Stop profiling and print or export the phase breakdown."""
+    profiler = profiling.disable()
+    if profiler is None:
+        return
+    report = profiler.report()
+    console.print()
+    console.print(create_profile_table(report))
+    if args.processes > 1:
+        rprint("[dim]Walk and stat phases of worker processes are not included.[/]")
+    if args.profile_output:
+        Path(args.profile_output).write_text(report.to_json())
+        rprint(f"Profile written to {args.profile_output}")
+
+def report_memory(args: argparse.Namespace, console: Console) -> None:
+    """Stop memory profiling and print or export the report."""
+    profiler = memory.disable()
+    if profiler is None:
+        return
+    report = profiler.report()
+    console.print()
+    console.print(create_memory_samples_table(report))
+    if report.containers:
+        console.print(create_memory_containers_table(report))
+    if args.memory_profile_output:
+        Path(args.memory_profile_output).write_text(report.to_json())
+        rprint(f"Memory report written to {args.memory_profile_output}")
+
+def handle_dupes_command(args: argparse.Namespace, console: Console) -> None:
+    """Find and report duplicate files in a catalog."""
+    catalog_manager = CatalogManager(args.catalog_db)
+    service = HashService(catalog_manager, args.workers, io_budget=create_io_budget(args))
+    with console.status("Comparing files..."):
+        report = service.find_duplicates(args.catalog_id, args.min_size)
+    
+    if not report.sets:
+        rprint("[green]No duplicate files found.[/]")
+    else:
+        console.print(create_duplicates_table(report, args.limit))
+        if len(report.sets) > args.limit:
+            rprint(f"[dim]… {len(report.sets) - args.limit:,} more sets[/]")
+        rprint(
+            f"[bold]Duplicate Sets:[/] {len(report.sets):,}  "
+            f"[bold]Reclaimable:[/] [red]{format_size(report.reclaimable_bytes)}[/]"
+        )
+    rprint(
+        f"[dim]{report.candidates:,} files shared a size; "
+        f"{report.edge_hashed:,} compared by their ends, {report.full_hashed:,} hashed whole, "
+        f"{format_size(report.bytes_read)} read"
+        + (f", {report.failed:,} unreadable or changed" if report.failed else "") + "[/]"
+    )
+
+def handle_multi_root_scan(
+    args: argparse.Namespace,
+    roots: List[str],
+    options: ScanOptions,
+    stats_manager: StatsManager,
+    catalog_manager: CatalogManager,
+    console: Console
+) -> None:
+    """Scan several roots in one run and summarize them."""
+    service = MultiRootScanService(roots, catalog_manager, options, args.incremental)
+    for duplicate in service.duplicates:
+        rprint(f"[yellow]Skipping duplicate root: {duplicate}[/]")
+    
+    table = Table(title="Scanned Roots")
+    table.add_column("Root", style="blue")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Nested Roots", justify="right")
+    table.add_column("Catalog ID", justify="right")
+    table.add_column("Scan ID", justify="right")
+    
+    interrupted = None
+    for root_scan in service.scan():
+        result = root_scan.result
+        with profiling.timed('persist.stats'):
+            scan_id = stats_manager.save_scan_results(result)
+        table.add_row(
+            str(root_scan.root_path),
+            f"{result.total_files:,}",
+            result.formatted_total_size,
+            str(len(root_scan.nested)),
+            str(root_scan.catalog_id),
+            str(scan_id)
+        )
+        if result.interrupted:
+            interrupted = root_scan
+        elif args.hash:
+            run_hash_stage(
+                catalog_manager, root_scan.catalog_id, args.hash_workers,
+                io_budget=options.io_budget
+            )
+    
+    console.print(table)
+    if interrupted:
+        skipped = len(service.plans) - table.row_count
+        rprint(
+            f"\n[yellow]Scan interrupted; catalog {interrupted.catalog_id} is partial "
+            f"and {skipped} root(s) were not scanned.[/]"
+        )
+        rprint(f"Continue with: python -m file_scanner scan --resume {interrupted.catalog_id}")
+    else:
+        rprint(f"\n[green]Scanned {table.row_count} roots successfully![/]")
+
 def handle_scan_command(args: argparse.Namespace, console: Console) -> NoReturn:
     """Handle scan command execution."""
+    if args.profile or args.profile_output:
+        profiling.enable()
+    if args.memory_profile or args.memory_profile_output:
+        memory.enable()
+    
     try:
         # Configure scan options
-        options = ScanOptions(
-            max_depth=args.depth,
-            follow_links=args.follow_links,
-            ignore_patterns=args.ignore,
-            include_hidden=not args.no_hidden
-        )
+        options = create_scan_options(args)
         
         # Initialize managers
         stats_manager = StatsManager(args.stats_db)
         catalog_manager = CatalogManager(args.catalog_db)
         
-        # Perform scan
-        scanner = FileScanner(args.directory, options)
-        scan_result = scanner.scan()
+        resume = None
+        if args.resume is not None:
+            resume = catalog_manager.load_resume(args.resume)
+            if resume is None:
+                rprint(f"[red]Catalog {args.resume} has no checkpoint to resume[/]")
+                sys.exit(1)
+            
+            # Filters must match the interrupted scan; parallelism may change
+            options = resume.checkpoint.options
+            options.workers = args.workers
+            options.processes = args.processes
+            if options.io_budget is None or args.max_ops is not None or args.max_bandwidth is not None:
+                options.io_budget = create_io_budget(args)
+            scanner = FileScanner(resume.root_path, options)
+            accumulator = resume.accumulator
+            rprint(
+                f"[yellow]Resuming catalog {resume.catalog_id}: "
+                f"{accumulator.total_files:,} files already cataloged, "
+                f"{len(resume.checkpoint.frontier):,} directories to go[/]"
+            )
+        else:
+            roots = list(args.directory)
+            if args.roots_file:
+                roots.extend(read_roots_file(args.roots_file))
+            if not roots:
+                rprint("[red]A directory, --roots-file or --resume is required[/]")
+                sys.exit(1)
+            
+            if len(roots) > 1:
+                handle_multi_root_scan(
+                    args, roots, options, stats_manager, catalog_manager, console
+                )
+                report_profile(args, console)
+                report_memory(args, console)
+                return
+            
+            root_path = ensure_path(roots[0])
+            baseline = None
+            if args.incremental:
+                baseline = catalog_manager.load_baseline(root_path)
+                if baseline is None:
+                    rprint("[yellow]No previous catalog for this path; running a full scan[/]")
+            
+            scanner = FileScanner(
+                root_path, 
+                options, 
+                baseline=baseline,
+                expected_files=catalog_manager.get_previous_total(root_path)
+            )
+            accumulator = ScanAccumulator(scanner.root_path)
+        
+        # Perform scan, streaming files into the catalog as they are found
+        catalog_id = catalog_manager.create_catalog_from_stream(
+            scanner.iter_scan(accumulator, resume.checkpoint if resume else None),
+            accumulator,
+            checkpoint=scanner.checkpoint,
+            resume=resume
+        )
+        scan_result = accumulator.to_result()
+        memory.checkpoint('scan and catalog')
+        profiler = memory.active()
+        if profiler:
+            # Files were streamed to the catalog; only directories are held
+            profiler.measure(
+                'ScanAccumulator.directories', accumulator.directories, scan_result.total_files
+            )
+        
+        if args.hash and not scan_result.interrupted:
+            run_hash_stage(
+                catalog_manager, catalog_id, args.hash_workers, io_budget=options.io_budget
+            )
+            memory.checkpoint('hash')
         
-        # Save results to both databases
+        # Save statistics
         rprint("\n[yellow]Saving results to databases...[/]")
-        scan_id = stats_manager.save_scan_results(scan_result)
-        catalog_id = catalog_manager.create_catalog(scan_result)
+        with profiling.timed('persist.stats'):
+            scan_id = stats_manager.save_scan_results(scan_result)
+        memory.checkpoint('save statistics')
         
         # Display results
         for line in create_scan_header(scan_result):
@@ -135,7 +557,11 @@ def handle_scan_command(args: argparse.Namespace, console: Console) -> NoReturn:
         console.print("\n[bold]File Type Distribution:[/]")
         console.print(create_scan_summary(scan_result, console))
         
-        rprint(f"\n[green]Scan completed successfully![/]")
+        if scan_result.interrupted:
+            rprint(f"\n[yellow]Scan interrupted; catalog {catalog_id} is partial.[/]")
+            rprint(f"Continue with: python -m file_scanner scan --resume {catalog_id}")
+        else:
+            rprint(f"\n[green]Scan completed successfully![/]")
         rprint(f"[bold]Scan ID:[/] {scan_id}")
         rprint(f"[bold]Catalog ID:[/] {catalog_id}")
         rprint("\nView results with:")
@@ -143,10 +569,50 @@ def handle_scan_command(args: argparse.Namespace, console: Console) -> NoReturn:
         rprint(f"  python -m file_scanner files {catalog_id}")
         rprint(f"  python -m file_scanner tree {catalog_id}")
         
+        report_profile(args, console)
+        report_memory(args, console)
+        
     except Exception as e:
         rprint(f"[red]Error during scan: {str(e)}[/]")
         sys.exit(1)
 
+def handle_watch_command(args: argparse.Namespace, console: Console) -> NoReturn:
+    """Handle watch command execution."""
+    try:
+        scanner = FileScanner(args.directory, create_scan_options(args))
+        catalog_manager = CatalogManager(args.catalog_db)
+        watcher = WatcherService(scanner, catalog_manager, settle=args.settle)
+        
+        catalog_id = watcher.start()
+        rprint(f"\n[green]Watching[/] [blue]{scanner.root_path}[/]")
+        rprint(f"[bold]Catalog ID:[/] {catalog_id}")
+        rprint("[dim]Press Ctrl+C to stop[/]")
+        
+        try:
+            while True:
+                batch = watcher.poll()
+                if batch is None:
+                    continue
+                if batch.rescanned:
+                    rprint(f"[yellow]Events were lost; rescanned into catalog {watcher.catalog_id}[/]")
+                else:
+                    rprint(
+                        f"[dim]{format_timestamp(datetime.now())}[/] "
+                        f"{batch.files:,} updated, {batch.directories:,} new directories, "
+                        f"{batch.removed:,} removed"
+                    )
+        finally:
+            if watcher.catalog_id is not None:
+                watcher.flush()
+            watcher.close()
+        
+    except KeyboardInterrupt:
+        rprint("\n[yellow]Stopped watching.[/]")
+        sys.exit(0)
+    except Exception as e:
+        rprint(f"[red]Error during watch: {str(e)}[/]")
+        sys.exit(1)
+
 def main() -> NoReturn:
     """Main entry point for the CLI."""
     parser = create_arg_parser()
@@ -157,9 +623,15 @@ def main() -> NoReturn:
         parser.print_help()
         sys.exit(1)
     
+    if getattr(args, 'budget_window', None) and \
+            args.max_ops is None and args.max_bandwidth is None:
+        parser.error("--budget-window needs --max-ops or --max-bandwidth")
+    
     try:
         if args.command == 'scan':
             handle_scan_command(args, console)
+        elif args.command == 'watch':
+            handle_watch_command(args, console)
         elif args.command == 'list':
             stats_manager = StatsManager(args.stats_db)
             stats_manager.list_scans()
@@ -169,6 +641,14 @@ def main() -> NoReturn:
         elif args.command == 'tree':
             catalog_manager = CatalogManager(args.catalog_db)
             catalog_manager.get_directory_tree(args.catalog_id)
+        elif args.command == 'dupes':
+            handle_dupes_command(args, console)
+        elif args.command == 'hash':
+            catalog_manager = CatalogManager(args.catalog_db)
+            run_hash_stage(
+                catalog_manager, args.catalog_id, args.workers, args.algorithm,
+                create_io_budget(args)
+            )
         elif args.command == 'stats':
             stats_manager = StatsManager(args.stats_db)
             stats_manager.get_scan_details(args.scan_id)
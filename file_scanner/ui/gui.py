@@ -1,6 +1,8 @@
 """GUI implementation using PySide6."""
+from pathlib import Path
 from typing import Optional
 import signal
+from rich.console import Console
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout,
@@ -10,6 +12,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QThread, Signal, Qt, QTimer
 from PySide6.QtGui import QCloseEvent
 
+from ..core import memory
 from ..core.models import ScanOptions, ScanResult
 from ..core.scanner import FileScanner
 from ..services import DatabaseService
@@ -19,18 +22,25 @@ from .panels import (
     ConfigPanel, DatabasePanel
 )
 from .progress import ProgressHandler
+from ..utils.formatting import create_memory_samples_table, create_memory_containers_table
 from .theme import COMBINED_STYLE
 
 class ScanWorker(QThread):
     """Worker thread for file scanning operations."""
     
-    scan_completed = Signal(object)  # Emits ScanResult
+    scan_completed = Signal(object)  # Emits ColumnarScanResult
     scan_error = Signal(str)  # Emits error message
     
-    def __init__(self, path: str, options: Optional[ScanOptions] = None):
+    def __init__(
+        self, 
+        path: str, 
+        options: Optional[ScanOptions] = None,
+        expected_files: Optional[int] = None
+    ):
         super().__init__()
         self.path = path
         self.options = options or ScanOptions()
+        self.expected_files = expected_files
         self.progress_handler = ProgressHandler()
     
     def run(self):
@@ -40,11 +50,12 @@ class ScanWorker(QThread):
             scanner = FileScanner(
                 self.path, 
                 self.options,
-                progress_updater=self.progress_handler
+                progress_updater=self.progress_handler,
+                expected_files=self.expected_files
             )
             
-            # Execute scan
-            result = scanner.scan()
+            # Execute scan, keeping files in compact columns
+            result = scanner.scan_columnar()
             self.scan_completed.emit(result)
             
         except Exception as e:
@@ -177,11 +188,17 @@ class MainWindow(QMainWindow):
         # Log scan start
         self.logger.log_scan_start(path)
         
+        # Use the previous scan of the same path as an estimate for the ETA
+        expected_files = None
+        scan_info = self.database_service.get_last_scan_info()
+        if scan_info and scan_info.root_path == str(Path(path).resolve()):
+            expected_files = scan_info.total_files
+        
         # Clear previous results
         self.database_service.clear()
         
         # Start scan in worker thread with current options
-        self.current_scan = ScanWorker(path, self.current_options)
+        self.current_scan = ScanWorker(path, self.current_options, expected_files)
         
         # Connect signals
         self.current_scan.scan_completed.connect(self._handle_scan_completed)
@@ -189,18 +206,25 @@ class MainWindow(QMainWindow):
         self.current_scan.progress_handler.progress_updated.connect(
             self.results_panel.update_progress
         )
+        self.current_scan.progress_handler.scan_progress.connect(
+            self.results_panel.update_scan_progress
+        )
         
         # Start scanning
         self.current_scan.start()
     
     def _handle_scan_completed(self, result: ScanResult):
         """Handle scan completion."""
+        memory.checkpoint('scan')
+        
         # Update UI
         self.scan_panel.set_scanning(False)
         self.results_panel.show_results(result)
+        memory.checkpoint('show results')
         
         # Update database through service
         self.database_service.process_scan_result(result)
+        self._report_memory(result)
         
         # Log completion
         self.logger.log_scan_complete(
@@ -216,6 +240,22 @@ class MainWindow(QMainWindow):
         # Cleanup
         self.current_scan = None
     
+    def _report_memory(self, result: ScanResult):
+        """Print memory use by phase and data structure when memory profiling."""
+        profiler = memory.active()
+        if profiler is None:
+            return
+        
+        report = profiler.report()
+        console = Console()
+        console.print(create_memory_samples_table(report))
+        console.print(create_memory_containers_table(report))
+        self.logger.log_action(
+            "Memory per file: " + ", ".join(
+                f"{c.name} {c.bytes_per_file:,.0f} B" for c in report.containers
+            )
+        )
+    
     def _handle_scan_error(self, error_msg: str):
         """Handle scan errors."""
         # Update UI
@@ -122,6 +122,13 @@ class AdvancedSettingsWidget(QWidget):
         self.max_depth.setValue(0)
         self.max_depth.setToolTip("Maximum directory depth to scan (0 for unlimited)")
         layout.addRow("Maximum Depth:", self.max_depth)
+        
+        # Worker threads option
+        self.workers = QSpinBox()
+        self.workers.setRange(1, 64)
+        self.workers.setValue(1)
+        self.workers.setToolTip("Threads listing directories in parallel (useful on network shares)")
+        layout.addRow("Worker Threads:", self.workers)
 
 class ConfigPanel(PanelWidget):
     """Panel for configuring scan options."""
@@ -156,6 +163,7 @@ class ConfigPanel(PanelWidget):
         self.general_settings.include_hidden.stateChanged.connect(self._emit_config)
         self.general_settings.follow_links.stateChanged.connect(self._emit_config)
         self.advanced_settings.max_depth.valueChanged.connect(self._emit_config)
+        self.advanced_settings.workers.valueChanged.connect(self._emit_config)
         self.filter_settings.pattern_list.model().rowsInserted.connect(self._emit_config)
         self.filter_settings.pattern_list.model().rowsRemoved.connect(self._emit_config)
     
@@ -170,6 +178,7 @@ class ConfigPanel(PanelWidget):
             include_hidden=self.general_settings.include_hidden.isChecked(),
             follow_links=self.general_settings.follow_links.isChecked(),
             max_depth=self.advanced_settings.max_depth.value() if self.advanced_settings.max_depth.value() > 0 else None,
+            workers=self.advanced_settings.workers.value(),
             ignore_patterns=[
                 self.filter_settings.pattern_list.item(i).text()
                 for i in range(self.filter_settings.pattern_list.count())
@@ -10,6 +10,7 @@ from PySide6.QtCore import Qt, Signal, QSortFilterProxyModel, QSize
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QCursor
 
 from ..widgets import PanelWidget
+from ...core import memory
 from ...services import DatabaseService, DatabaseEntry
 
 class FileDetailsDialog(QDialog):
@@ -417,6 +418,10 @@ class DatabasePanel(PanelWidget):
     
     def on_entries_added(self, entries: list[DatabaseEntry]):
         """Handle new database entries."""
+        # Qt's items live outside the Python heap; size them by RSS growth
+        profiler = memory.active()
+        rss_before = memory.current_rss() if profiler else None
+        
         for entry in entries:
             row_items = [
                 QStandardItem(str(value))
@@ -436,6 +441,9 @@ class DatabasePanel(PanelWidget):
             ]
             self.table_view.source_model.appendRow(row_items)
         
+        if rss_before is not None:
+            profiler.add_native('Qt model', memory.current_rss() - rss_before, len(entries))
+        
         # Update status
         total_rows = self.table_view.source_model.rowCount()
         self.status_label.setText(f"{total_rows:,} files")
@@ -7,6 +7,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Slot
 
 from ...core.models import ScanResult
+from ...core.progress import ScanProgress
 from ..widgets import PanelWidget, SettingsTabWidget
 
 class SummaryWidget(QWidget):
@@ -30,6 +31,8 @@ class SummaryWidget(QWidget):
             f"Total Directories: {len(result.directories)}\n"
             f"Unique Extensions: {len(result.extension_stats)}"
         )
+        if result.pruned_dirs:
+            summary += f"\nPruned Directories: {result.pruned_dirs:,}"
         self.text_display.setText(summary)
 
 class ExtensionsWidget(QWidget):
@@ -150,6 +153,10 @@ class ResultsPanel(PanelWidget):
             self.progress_bar.setRange(0, 100)
             self.progress_bar.setValue(percentage)
     
+    def update_scan_progress(self, progress: ScanProgress):
+        """Update progress display from a scan progress snapshot."""
+        self.update_progress(progress.describe(), progress.percentage)
+    
     def show_error(self, message: str):
         """Display error message."""
         self.status_label.setText("Error")
@@ -1,10 +1,13 @@
 """Progress handling for GUI operations."""
 from PySide6.QtCore import QObject, Signal
 
+from ..core.progress import ScanProgress
+
 class ProgressHandler(QObject):
     """Handles progress updates for GUI operations."""
     
     progress_updated = Signal(str, int)  # (status, percentage)
+    scan_progress = Signal(object)  # ScanProgress snapshot
     
     def update_progress(self, status: str, percentage: int = -1):
         """Update progress status and percentage.
@@ -14,3 +17,14 @@ class ProgressHandler(QObject):
             percentage: Progress percentage (-1 for indeterminate)
         """
         self.progress_updated.emit(status, percentage)
+    
+    def report_progress(self, progress: ScanProgress):
+        """Forward a scan progress snapshot.
+        
+        The scanner rate-limits snapshots, so each one is a single
+        cross-thread signal.
+        
+        Args:
+            progress: Current scan progress
+        """
+        self.scan_progress.emit(progress)
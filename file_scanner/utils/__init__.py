@@ -1,7 +1,7 @@
 """Utility functions and helpers."""
 from datetime import datetime
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 def ensure_path(path: Union[str, Path]) -> Path:
     """Convert string to Path and ensure it exists.
@@ -53,6 +53,54 @@ def format_size(size_bytes: int) -> str:
     else:
         return f"{size_bytes/(1024*1024*1024):.2f} GB"
 
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+def parse_size(text: str) -> int:
+    """Parse a size such as "4096", "64K" or "1.5 GB" into bytes.
+    
+    Units are powers of 1024, as in format_size.
+    
+    Args:
+        text: Size string
+        
+    Returns:
+        Size in bytes
+        
+    Raises:
+        ValueError: If the text is not a size, or the size is negative
+    """
+    value = text.strip().upper().replace(' ', '')
+    for suffix in ('IB', 'B'):
+        if value.endswith(suffix) and len(value) > len(suffix):
+            value = value[:-len(suffix)]
+            break
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ''
+    number = value[:-1] if unit else value
+    try:
+        size = float(number) * _SIZE_UNITS[unit]
+        if size < 0:
+            raise ValueError
+        return int(size)  # Rejects NaN and infinity
+    except (ValueError, OverflowError):
+        raise ValueError(f"Invalid size: {text}") from None
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds as a short string.
+    
+    Args:
+        seconds: Duration in seconds
+        
+    Returns:
+        Formatted duration (e.g., "45s", "3m 20s", "2h 05m")
+    """
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    else:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
 def get_relative_path(path: Path, base: Path) -> Path:
     """Get relative path that handles paths outside base.
     
@@ -69,9 +117,25 @@ def get_relative_path(path: Path, base: Path) -> Path:
         # Path is outside base directory
         return path
 
+def get_extension(name: str) -> Optional[str]:
+    """Get lowercase extension of a file name, matching Path.suffix.
+    
+    Args:
+        name: File name without directory components
+        
+    Returns:
+        Lowercase extension including the dot, or None if there is none
+    """
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return None
+
 __all__ = [
     'ensure_path',
     'format_timestamp',
     'format_size',
-    'get_relative_path'
+    'format_duration',
+    'get_relative_path',
+    'get_extension'
 ]
@@ -6,6 +6,9 @@ from rich.console import Console
 from rich.table import Table
 from rich.tree import Tree
 
+from ..core.duplicates import DuplicateReport
+from ..core.memory import MemoryReport
+from ..core.profiling import ProfileReport
 from ..core.models import FileInfo, DirectoryInfo, ScanResult
 from . import format_size, format_timestamp
 
@@ -65,9 +68,15 @@ def create_directory_tree(
         parent_path = Path(dir_info['relative_path']).parent
         
         if parent_path in path_to_tree:
-            branch = path_to_tree[parent_path].add(
-                f"[bold blue]{Path(dir_info['relative_path']).name}/[/]"
-            )
+            label = f"[bold blue]{Path(dir_info['relative_path']).name}/[/]"
+            if dir_info.get('tree_file_count') is not None:
+                label += (
+                    f" [dim]{dir_info['tree_file_count']:,} files, "
+                    f"{format_size(dir_info['tree_size_bytes'])}[/]"
+                )
+            if dir_info.get('truncated'):
+                label += f" [dim]… depth limit ({dir_info.get('entry_count') or 0:,} entries)[/]"
+            branch = path_to_tree[parent_path].add(label)
             path_to_tree[Path(dir_info['relative_path'])] = branch
     
     return tree
@@ -115,9 +124,162 @@ def create_scan_header(scan_result: ScanResult) -> List[str]:
     Returns:
         List of formatted header lines
     """
-    return [
+    lines = [
         f"[bold]Scan Results for:[/] [blue]{scan_result.root_path}[/]",
         f"[bold]Total Files:[/] [green]{scan_result.total_files:,}[/]",
         f"[bold]Total Size:[/] [green]{scan_result.formatted_total_size}[/]",
         f"[bold]File Types:[/] [yellow]{len(scan_result.extension_stats)}[/]"
     ]
+    
+    if scan_result.pruned_dirs:
+        lines.append(
+            f"[bold]Pruned Directories:[/] [yellow]{scan_result.pruned_dirs:,}[/]"
+        )
+    
+    if scan_result.reused_dirs:
+        lines.append(
+            f"[bold]Unchanged Directories:[/] [yellow]{scan_result.reused_dirs:,}[/]"
+        )
+    
+    if scan_result.duplicate_links:
+        lines.append(
+            f"[bold]Extra Hard Links (size counted once):[/] "
+            f"[yellow]{scan_result.duplicate_links:,}[/]"
+        )
+    
+    return lines
+
+def create_duplicates_table(report: DuplicateReport, limit: int = 20) -> Table:
+    """Create a formatted table of duplicate sets.
+    
+    Args:
+        report: Duplicate sets, most reclaimable first
+        limit: Maximum number of sets to show
+        
+    Returns:
+        Formatted table
+    """
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Size", justify="right", style="yellow")
+    table.add_column("Copies", justify="right", style="green")
+    table.add_column("Reclaimable", justify="right", style="red")
+    table.add_column("Paths", style="blue")
+    
+    for dup in report.sets[:limit]:
+        table.add_row(
+            format_size(dup.size_bytes),
+            f"{dup.copies:,}",
+            format_size(dup.reclaimable_bytes),
+            "\n".join(str(p) for p in dup.paths)
+        )
+    
+    return table
+
+def create_profile_table(report: ProfileReport) -> Table:
+    """Create a formatted table of time spent per phase.
+    
+    Timers are listed under their phase, largest phase first. With
+    several threads, times are summed over threads and may exceed the
+    wall time; otherwise the time outside all timers is shown as well.
+    
+    Args:
+        report: Report from a Profiler
+        
+    Returns:
+        Formatted table
+    """
+    wall = report.wall_seconds or 1e-9
+    table = Table(
+        title=f"Profile ({report.wall_seconds:.2f}s wall, {report.threads} thread(s))",
+        show_header=True,
+        header_style="bold magenta"
+    )
+    table.add_column("Phase", style="cyan")
+    table.add_column("Time", justify="right", style="green")
+    table.add_column("% Wall", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("Per Call", justify="right")
+    
+    phases = sorted(report.phases().items(), key=lambda item: item[1], reverse=True)
+    for phase, seconds in phases:
+        table.add_row(f"[bold]{phase}[/]", f"{seconds:.3f}s", f"{seconds / wall:.1%}", "", "")
+        timers = sorted(
+            (item for item in report.timers.items() if item[0].split('.', 1)[0] == phase),
+            key=lambda item: item[1].seconds,
+            reverse=True
+        )
+        for name, timing in timers:
+            per_call = timing.seconds / timing.calls if timing.calls else 0.0
+            table.add_row(
+                f"  {name}",
+                f"{timing.seconds:.3f}s",
+                f"{timing.seconds / wall:.1%}",
+                f"{timing.calls:,}",
+                f"{per_call * 1e6:,.1f}µs"
+            )
+    
+    if report.threads == 1:
+        other = report.wall_seconds - sum(seconds for _, seconds in phases)
+        table.add_row(
+            "[dim]other (unattributed)[/]", f"{other:.3f}s", f"{other / wall:.1%}", "", ""
+        )
+    
+    for name, value in sorted(report.counters.items()):
+        table.add_row(f"[dim]{name}[/]", "", "", f"{value:,}", "")
+    
+    return table
+
+def create_memory_samples_table(report: MemoryReport) -> Table:
+    """Create a formatted table of memory use at each phase boundary.
+    
+    Args:
+        report: Report from a MemoryProfiler
+        
+    Returns:
+        Formatted table
+    """
+    title = "Memory by Phase"
+    if report.peak_rss_bytes is not None:
+        title += f" (peak RSS {format_size(report.peak_rss_bytes)})"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("After", style="cyan")
+    table.add_column("RSS", justify="right", style="green")
+    table.add_column("Python Heap", justify="right")
+    table.add_column("Heap Peak in Phase", justify="right", style="yellow")
+    
+    for sample in report.samples:
+        table.add_row(
+            sample.label,
+            format_size(sample.rss_bytes) if sample.rss_bytes is not None else "-",
+            format_size(sample.traced_bytes),
+            format_size(sample.traced_peak_bytes)
+        )
+    if report.tracemalloc_bytes:
+        table.caption = f"RSS includes {format_size(report.tracemalloc_bytes)} used by tracemalloc"
+    return table
+
+def create_memory_containers_table(report: MemoryReport) -> Table:
+    """Create a formatted table of memory held per data structure.
+    
+    Args:
+        report: Report from a MemoryProfiler
+        
+    Returns:
+        Formatted table
+    """
+    table = Table(title="Memory by Data Structure", show_header=True, header_style="bold magenta")
+    table.add_column("Structure", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right", style="green")
+    table.add_column("Per File", justify="right", style="yellow")
+    table.add_column("Measured By", style="dim")
+    
+    for container in sorted(report.containers, key=lambda c: c.size_bytes, reverse=True):
+        table.add_row(
+            container.name,
+            f"{container.files:,}",
+            format_size(max(0, container.size_bytes)),
+            f"{container.bytes_per_file:,.0f} B",
+            container.method
+        )
+    return table
@@ -0,0 +1,142 @@
+"""Tests for I/O budgets and the throttle."""
+from datetime import datetime
+
+import pytest
+
+from file_scanner.core.budget import IOBudget, IOThrottle, parse_window
+from file_scanner.core.hashing import FileHasher
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.core.sharding import plan_shards
+from file_scanner.ui.cli import create_arg_parser, main
+from file_scanner.utils import parse_size
+
+class FakeClock:
+    """Monotonic clock advanced only by sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+def _count_io(throttle):
+    """Record the (ops, bytes) of every acquire() on a throttle."""
+    calls = []
+    acquire = throttle.acquire
+
+    def counting(ops=1, nbytes=0):
+        calls.append((ops, nbytes))
+        acquire(ops, nbytes)
+
+    throttle.acquire = counting
+    return calls
+
+def _throttle(budget, clock, hour=12):
+    return IOThrottle(budget, clock, clock.sleep, lambda: datetime(2024, 1, 1, hour, 30))
+
+def test_ops_are_paced_after_the_burst():
+    clock = FakeClock()
+    throttle = _throttle(IOBudget(ops_per_sec=100), clock)
+    for _ in range(100):
+        throttle.acquire()
+    assert clock.slept == 0 and not throttle.throttled
+
+    for _ in range(400):
+        throttle.acquire()
+    assert clock.now == pytest.approx(4.0)
+    assert throttle.throttled_seconds == pytest.approx(4.0)
+    assert throttle.throttled
+
+def test_bytes_are_paced_and_the_slower_rate_wins():
+    clock = FakeClock()
+    throttle = _throttle(IOBudget(ops_per_sec=1000, bytes_per_sec=1000), clock)
+    throttle.acquire(1, 1000)  # The burst
+    throttle.acquire(1, 5000)
+    assert clock.now == pytest.approx(5.0)
+
+    # Idle time refills the bucket, up to one second of tokens
+    clock.now += 10
+    throttle.acquire(1, 1000)
+    assert clock.now == pytest.approx(15.0)
+
+def test_windows_limit_when_the_budget_applies():
+    budget = IOBudget(ops_per_sec=10, windows=['22:00-06:00'])
+    clock = FakeClock()
+    outside = _throttle(budget, clock, hour=12)
+    for _ in range(100):
+        outside.acquire()
+    assert clock.slept == 0
+
+    inside = _throttle(budget, clock, hour=23)
+    for _ in range(100):
+        inside.acquire()
+    assert clock.slept == pytest.approx(9.0)
+
+def test_invalid_windows_are_rejected():
+    assert parse_window('8:00-18:30') == (datetime(1, 1, 1, 8).time(), datetime(1, 1, 1, 18, 30).time())
+    with pytest.raises(ValueError):
+        IOBudget(ops_per_sec=1, windows=['8-18'])
+    with pytest.raises(ValueError):
+        parse_window('25:00-26:00')
+
+@pytest.mark.parametrize('rates', [
+    {'ops_per_sec': 0}, {'ops_per_sec': -5}, {'bytes_per_sec': -1000},
+    {'bytes_per_sec': float('inf')}, {'ops_per_sec': float('nan')}
+])
+def test_invalid_rates_are_rejected(rates):
+    with pytest.raises(ValueError):
+        IOBudget(**rates)
+
+@pytest.mark.parametrize('text', ['inf', 'nan', '-5M', '-1', 'M', '1X'])
+def test_invalid_sizes_are_rejected(text):
+    with pytest.raises(ValueError):
+        parse_size(text)
+    # argparse reports them as usage errors
+    with pytest.raises(SystemExit) as exc:
+        create_arg_parser().parse_args(['hash', '1', '--max-bandwidth', text])
+    assert exc.value.code == 2
+
+def test_window_without_a_rate_is_a_usage_error(monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['file_scanner', 'hash', '1', '--budget-window', '08:00-18:00'])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert '--budget-window needs' in capsys.readouterr().err
+
+def test_scan_and_hashing_pay_for_their_io(tmp_path):
+    for i in range(3):
+        (tmp_path / f'd{i}').mkdir()
+        for k in range(4):
+            (tmp_path / f'd{i}' / f'f{k}').write_bytes(b'x' * 100)
+
+    scanner = FileScanner(tmp_path, ScanOptions(io_budget=IOBudget(ops_per_sec=1e9)))
+    calls = _count_io(scanner.throttle)
+    result = scanner.scan()
+    assert result.total_files == 12
+    # One listing per directory and one stat per file at least
+    assert sum(ops for ops, _ in calls) >= 4 + 12
+
+    throttle = IOThrottle(IOBudget(bytes_per_sec=1e9))
+    calls = _count_io(throttle)
+    hasher = FileHasher(2, throttle=throttle)
+    results = list(hasher.hash_files((f, f.path) for f in result.files))
+    assert all(r.digest for r in results)
+    assert sum(nbytes for _, nbytes in calls) == 1200
+
+def test_shard_planning_pays_for_its_listings(tmp_path):
+    for i in range(3):
+        (tmp_path / f'd{i}' / 'sub').mkdir(parents=True)
+        (tmp_path / f'd{i}' / 'f').write_bytes(b'x')
+
+    scanner = FileScanner(tmp_path, ScanOptions(io_budget=IOBudget(ops_per_sec=1e9)))
+    calls = _count_io(scanner.throttle)
+    shards = plan_shards(scanner._create_walker(), 2)
+    assert shards
+    # The root, each d* and each d*/sub are listed to weigh the shards
+    assert len(calls) >= 7
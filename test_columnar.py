@@ -0,0 +1,30 @@
+"""Tests for columnar scan results."""
+import os
+
+from file_scanner.core.scanner import FileScanner
+
+def _file_fields(result):
+    return {
+        f.relative_path_str: (f.size_bytes, f.link_count, f.file_id, f.st_mtime)
+        for f in result.files
+    }
+
+def test_columnar_matches_scan_with_hard_links(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'f1.txt').write_text('linked')
+    os.link(root / 'f1.txt', root / 'sub' / 'hl.txt')
+    (root / 'plain.txt').write_text('plain')
+    # Second link outside the scanned root
+    (root / 'out.txt').write_text('outside')
+    os.link(root / 'out.txt', tmp_path / 'out-link.txt')
+
+    result = FileScanner(root).scan()
+    columnar = FileScanner(root).scan_columnar()
+
+    assert _file_fields(columnar) == _file_fields(result)
+    linked = _file_fields(columnar)[os.path.join('sub', 'hl.txt')]
+    assert linked[1] == 2 and linked[2] is not None
+    assert _file_fields(columnar)['plain.txt'][1:3] == (1, None)
+    assert columnar.total_size == result.total_size
+    assert columnar.duplicate_links == result.duplicate_links == 1
@@ -0,0 +1,54 @@
+"""Tests for saving scans with their file and directory analysis."""
+import json
+import sqlite3
+
+from file_scanner.core.accumulator import ScanAccumulator
+from file_scanner.core.directory_parser import DirectoryAnalyzer
+from file_scanner.core.scanner import FileScanner
+from file_scanner.services.database_service import DatabaseService
+
+def _project_tree(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'ABC-123').mkdir(parents=True)
+    (root / 'misc').mkdir()
+    for name in ('ABC-123_plan.pdf', 'ABC-123_spec.pdf', 'ABC-123_notes.txt'):
+        (root / 'ABC-123' / name).write_text(name)
+    (root / 'misc' / 'x.txt').write_text('x')
+    (root / 'top.txt').write_text('top')
+    return root
+
+def _saved(service, scan_id):
+    entries = sorted(
+        (entry.path, sorted(entry.tags), entry.directory_info)
+        for entry in service.get_entries()
+    )
+    with sqlite3.connect(service.db_path) as conn:
+        rows = sorted(
+            (path, sorted(json.loads(tags)) if tags else [], info)
+            for path, tags, info in conn.execute(
+                "SELECT path, tags, directory_info FROM files WHERE scan_id = ?", (scan_id,)
+            )
+        )
+    return entries, rows
+
+def test_streamed_scan_gets_directory_groups_without_listing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = _project_tree(tmp_path)
+
+    service = DatabaseService()
+    service.process_scan_result(FileScanner(root).scan())
+    expected, expected_rows = _saved(service, 1)
+    assert expected == expected_rows
+    assert any('dir_project:ABC-123' in tags for _, tags, _ in expected)
+
+    def no_listing(self, root_path):
+        raise AssertionError("directory listed again")
+
+    monkeypatch.setattr(DirectoryAnalyzer, 'analyze_directory', no_listing)
+    monkeypatch.setattr(DatabaseService, 'BATCH_SIZE', 2)
+    service = DatabaseService()
+    scanner = FileScanner(root)
+    accumulator = ScanAccumulator(scanner.root_path)
+    service.process_scan_stream(scanner.iter_scan(accumulator), accumulator)
+
+    assert _saved(service, 2) == (expected, expected)
@@ -0,0 +1,140 @@
+"""Tests for duplicate detection and the hashing stage."""
+import os
+import sqlite3
+from unittest import mock
+
+import pytest
+
+from file_scanner.core.duplicates import DuplicateCandidate, DuplicateFinder
+from file_scanner.core.hashing import FileHasher
+from file_scanner.core.scanner import FileScanner
+from file_scanner.database.catalog import CatalogManager
+from file_scanner.database.hash_cache import HashCache
+from file_scanner.services.hash_service import HashService
+
+EDGE = 16
+
+def _candidates(*paths):
+    candidates = []
+    for path in paths:
+        stats = os.stat(path)
+        file_id = (stats.st_dev, stats.st_ino) if stats.st_nlink > 1 else None
+        candidates.append(DuplicateCandidate(path, stats.st_size, file_id))
+    return candidates
+
+def test_same_edges_are_settled_by_the_full_pass(tmp_path):
+    body = b'a' * EDGE + b'middle' + b'z' * EDGE
+    (tmp_path / 'one').write_bytes(body)
+    (tmp_path / 'two').write_bytes(body)
+    (tmp_path / 'three').write_bytes(body.replace(b'middle', b'MIDDLE'))
+    # Same size, different ends
+    (tmp_path / 'four').write_bytes(b'b' + body[1:])
+    (tmp_path / 'five').write_bytes(body[:-1] + b'y')
+
+    report = DuplicateFinder(FileHasher(2), EDGE).find(
+        _candidates(*(tmp_path / n for n in ('one', 'two', 'three', 'four', 'five')))
+    )
+
+    assert report.candidates == 5
+    assert report.edge_hashed == 5
+    assert report.full_hashed == 3  # one, two and three share their edges
+    assert [s.paths for s in report.sets] == [[tmp_path / 'one', tmp_path / 'two']]
+    assert report.reclaimable_bytes == len(body)
+
+def test_hard_links_are_not_duplicates(tmp_path):
+    (tmp_path / 'a').write_bytes(b'same content')
+    os.link(tmp_path / 'a', tmp_path / 'a-link')
+    (tmp_path / 'b').write_bytes(b'other bytes!')
+    os.link(tmp_path / 'b', tmp_path / 'b-link')
+    (tmp_path / 'c').write_bytes(b'other bytes!')
+
+    report = DuplicateFinder(FileHasher(2), EDGE).find(
+        _candidates(*(tmp_path / n for n in ('a', 'a-link', 'b', 'b-link', 'c')))
+    )
+
+    # a and a-link are one file; b-link is listed with b's set, not as a copy
+    assert report.candidates == 3
+    assert report.edge_hashed + report.full_hashed == 3
+    assert len(report.sets) == 1
+    dup = report.sets[0]
+    assert dup.copies == 2
+    assert dup.paths == [tmp_path / 'b', tmp_path / 'c']
+    assert dup.links == [tmp_path / 'b-link']
+    assert dup.reclaimable_bytes == 12
+
+def test_hash_catalog_reads_hard_links_once(tmp_path):
+    root = tmp_path / 'root'
+    root.mkdir()
+    (root / 'a').write_bytes(b'x' * 1000)
+    for i in range(3):
+        os.link(root / 'a', root / f'link{i}')
+    (root / 'b').write_bytes(b'y' * 10)
+
+    db_path = str(tmp_path / 'catalog.db')
+    catalog_manager = CatalogManager(db_path)
+    catalog_id = catalog_manager.create_catalog(FileScanner(root).scan())
+    service = HashService(catalog_manager, workers=2)
+    results = list(service.hash_catalog(catalog_id))
+
+    assert len(results) == 2
+    assert service.summary.total == service.summary.files == 5
+    assert service.summary.bytes_read == 1010
+    with sqlite3.connect(db_path) as conn:
+        hashes = dict(conn.execute(
+            "SELECT file_name, content_hash FROM files WHERE catalog_id = ?", (catalog_id,)
+        ))
+    assert len(hashes) == 5 and None not in hashes.values()
+    assert len({hashes[n] for n in ('a', 'link0', 'link1', 'link2')}) == 1
+
+    report = service.find_duplicates(catalog_id)
+    assert report.sets == []
+
+def test_hash_catalog_reads_pages(tree, catalog_manager, monkeypatch):
+    monkeypatch.setattr(HashService, 'PAGE_SIZE', 4)
+    catalog_id = catalog_manager.create_catalog(FileScanner(tree).scan())
+    service = HashService(catalog_manager, workers=2)
+    pages = []
+    read_page = service._read_page
+
+    def recording_read_page(*args):
+        pages.append(read_page(*args))
+        return pages[-1]
+
+    monkeypatch.setattr(service, '_read_page', recording_read_page)
+
+    results = list(service.hash_catalog(catalog_id))
+
+    assert service.summary.total == service.summary.files == 35
+    assert len(pages) == 10 and not pages[-1][0]
+    assert all(len(sum((rows for rows, _ in files), [])) == 4 for files, _ in pages[:8])
+    assert service.summary.failed == 0
+    # d0/g1.txt and its link in d2/inner are hashed together if they share
+    # a page; otherwise the second one is found in the cache
+    assert len(results) - service.summary.cached == 34
+    assert service.summary.bytes_read == 441
+    assert catalog_manager.count_files(catalog_id, unhashed_only=True) == 0
+
+def test_hash_cache_connections_are_closed(tmp_path):
+    for i in range(20):
+        (tmp_path / f'f{i}').write_bytes(b'x' * i)
+    cache = HashCache(str(tmp_path / 'cache.db'))
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        if kwargs.get('check_same_thread') is False:  # Lookup connections only
+            opened.append(conn)
+        return conn
+
+    hasher = FileHasher(4, cache=cache)
+    with mock.patch('file_scanner.database.hash_cache.sqlite3.connect', tracking_connect):
+        for _ in range(2):
+            results = list(hasher.hash_files((p, p) for p in tmp_path.glob('f*')))
+            assert all(r.digest for r in results)
+    # At most one per thread and call
+    assert 1 <= len(opened) <= 8
+    assert not cache._connections
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
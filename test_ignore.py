@@ -0,0 +1,81 @@
+"""Tests for ignore rules."""
+from file_scanner.core.ignore import IgnoreMatcher
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+
+def test_negation_last_rule_wins():
+    matcher = IgnoreMatcher.from_patterns(['*.log', '!keep.log', 'sub/keep.log'])
+    assert matcher.ignores('a.log')
+    assert matcher.ignores('deep/dir/b.log')
+    assert matcher.match('keep.log') is False
+    assert matcher.match('other/keep.log') is False
+    assert matcher.ignores('sub/keep.log')
+    assert matcher.match('a.txt') is None
+
+def test_anchoring():
+    matcher = IgnoreMatcher.from_patterns(['/build', 'docs/*.tmp', 'name.bak'])
+    assert matcher.ignores('build', is_dir=True)
+    assert not matcher.ignores('src/build', is_dir=True)
+    assert matcher.ignores('docs/a.tmp')
+    assert not matcher.ignores('src/docs/a.tmp')
+    assert not matcher.ignores('docs/sub/a.tmp')
+    assert matcher.ignores('name.bak') and matcher.ignores('a/b/name.bak')
+
+def test_anchoring_in_nested_ignore_file():
+    matcher = IgnoreMatcher.from_patterns(['/out', 'gen/*.c'], base='pkg')
+    assert matcher.ignores('pkg/out', is_dir=True)
+    assert not matcher.ignores('out', is_dir=True)
+    assert not matcher.ignores('pkg/sub/out', is_dir=True)
+    assert matcher.ignores('pkg/gen/a.c')
+    assert not matcher.ignores('gen/a.c')
+
+def test_double_star():
+    matcher = IgnoreMatcher.from_patterns(['**/cache', 'logs/**', 'a/**/z.txt'])
+    assert matcher.ignores('cache', is_dir=True)
+    assert matcher.ignores('x/y/cache', is_dir=True)
+    assert matcher.ignores('logs/today.txt')
+    assert matcher.ignores('logs/2024/01/today.txt')
+    assert not matcher.ignores('logs', is_dir=True)
+    assert matcher.ignores('a/z.txt')
+    assert matcher.ignores('a/b/c/z.txt')
+    assert not matcher.ignores('b/a/z.txt')
+
+def test_directory_only_patterns():
+    matcher = IgnoreMatcher.from_patterns(['tmp/', '/dist/'])
+    assert matcher.ignores('tmp', is_dir=True)
+    assert matcher.ignores('src/tmp', is_dir=True)
+    assert not matcher.ignores('tmp')
+    assert not matcher.ignores('src/tmp')
+    assert matcher.ignores('dist', is_dir=True)
+    assert not matcher.ignores('dist')
+
+def test_scan_prunes_ignored_directories(tmp_path):
+    for rel in ('build/out.o', 'src/build/keep.c', 'src/a.log', 'src/keep.log',
+                'node_modules/pkg/index.js', 'tmp'):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x')
+    options = ScanOptions(ignore_patterns=['/build/', '*.log', '!keep.log', '**/node_modules', 'tmp/'])
+
+    result = FileScanner(tmp_path, options).scan()
+
+    files = sorted(f.relative_path.as_posix() for f in result.files)
+    assert files == ['src/build/keep.c', 'src/keep.log', 'tmp']
+    assert result.pruned_dirs == 2
+
+def test_stat_file_reuses_ignore_files_until_forgotten(tmp_path):
+    (tmp_path / 'sub' / 'deep').mkdir(parents=True)
+    (tmp_path / '.gitignore').write_text('*.log\n')
+    (tmp_path / 'sub' / 'deep' / 'a.log').write_text('x')
+    (tmp_path / 'sub' / 'deep' / 'a.txt').write_text('x')
+    scanner = FileScanner(tmp_path, ScanOptions(ignore_files=['.gitignore']))
+
+    assert scanner.stat_file('sub/deep/a.log') is None
+    assert scanner.stat_file('sub/deep/a.txt') is not None
+
+    (tmp_path / 'sub' / '.gitignore').write_text('*.txt\n!a.log\n')
+    # Rules read before are kept until the change is reported
+    assert scanner.stat_file('sub/deep/a.txt') is not None
+    scanner.forget_ignore_rules('sub')
+    assert scanner.stat_file('sub/deep/a.txt') is None
+    assert scanner.stat_file('sub/deep/a.log') is not None
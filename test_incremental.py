@@ -0,0 +1,32 @@
+"""Tests for incremental rescans."""
+import shutil
+
+from file_scanner.core.scanner import FileScanner
+from file_scanner.core.walker import DirectoryWalker
+
+def test_incremental_rescan_matches_fresh_scan(tree, catalog_manager, stream_catalog, catalog_contents):
+    stream_catalog(catalog_manager, FileScanner(tree))
+
+    (tree / 'd0' / 'inner' / 'new.txt').write_text('new file')
+    (tree / 'd1' / 'g0.txt').unlink()
+    (tree / 'd2' / 'inner' / 'f1.txt').rename(tree / 'd2' / 'inner' / 'moved.txt')
+    shutil.rmtree(tree / 'd3' / 'inner')
+    (tree / 'd4' / 'added' / 'deeper').mkdir(parents=True)
+    (tree / 'd4' / 'added' / 'deeper' / 'h.txt').write_text('hello')
+    (tree / 'top.txt').write_text('top')
+
+    baseline = catalog_manager.load_baseline(tree)
+    assert baseline is not None
+    listings = list(DirectoryWalker(str(tree), baseline=baseline).walk())
+    reused = sorted(listing.relative_path for listing in listings if listing.reused)
+    assert reused == [
+        '.hidden', 'd0', 'd0/inner/a', 'd0/inner/a/b', 'd1/inner', 'd2', 'd4/inner',
+        'empty', 'node_modules', 'node_modules/pkg'
+    ]
+
+    incremental_id = stream_catalog(
+        catalog_manager, FileScanner(tree, baseline=catalog_manager.load_baseline(tree))
+    )
+    fresh_id = stream_catalog(catalog_manager, FileScanner(tree))
+    assert catalog_contents(catalog_manager, incremental_id) == \
+        catalog_contents(catalog_manager, fresh_id)
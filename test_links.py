@@ -0,0 +1,87 @@
+"""Tests for hard-link handling during scans."""
+import os
+
+from file_scanner.core import accumulator, walker
+from file_scanner.core.accumulator import ScanAccumulator
+from file_scanner.core.models import FileInfo, ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.core.walker import DirectoryWalker
+
+def _linked_tree(tmp_path, pairs=20, outside=20):
+    root = tmp_path / 'root'
+    root.mkdir()
+    for i in range(pairs):
+        (root / f'a{i}').mkdir()
+        (root / f'b{i}').mkdir()
+        (root / f'a{i}' / 'f.txt').write_text('x' * (i + 1))
+        os.link(root / f'a{i}' / 'f.txt', root / f'b{i}' / 'f.txt')
+    for i in range(outside):
+        (root / f'out{i}.txt').write_text('y' * (i + 1))
+        os.link(root / f'out{i}.txt', tmp_path / f'out{i}.txt')
+    return root
+
+def _dir_sizes(result):
+    return {str(d.relative_path): (d.file_count, d.size_bytes) for d in result.directories}
+
+def test_threaded_scan_counts_links_like_sequential(tmp_path):
+    root = _linked_tree(tmp_path)
+    sequential = FileScanner(root).scan()
+    for _ in range(5):
+        threaded = FileScanner(root, ScanOptions(workers=8)).scan()
+        assert threaded.total_files == sequential.total_files == 60
+        assert threaded.total_size == sequential.total_size
+        assert threaded.duplicate_links == sequential.duplicate_links == 20
+        assert _dir_sizes(threaded) == _dir_sizes(sequential)
+
+def test_link_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(walker, 'LINK_CACHE_SIZE', 3)
+    root = _linked_tree(tmp_path, pairs=0, outside=10)
+    dir_walker = DirectoryWalker(str(root))
+    stats = [st for listing in dir_walker.walk() for _, st in listing.files]
+    assert len(stats) == 10 and all(st.st_nlink == 2 for st in stats)
+    assert len(dir_walker._links) == 3
+
+def _linked_file(root, name, inode):
+    path = os.path.join(str(root), name)
+    return FileInfo(name, path, len(str(root)) + 1, '.txt', 10, 0.0, 0.0,
+                    link_count=2, file_id=(1, inode))
+
+def test_pending_links_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(accumulator, 'MAX_PENDING_LINKS', 3)
+    scan = ScanAccumulator(tmp_path)
+    for inode in range(10):
+        scan.add_file(_linked_file(tmp_path, f'a{inode}.txt', inode))
+    assert len(scan._pending_links) == 3
+    assert scan.total_size == 100
+    # Recent files are still recognized, forgotten ones count again
+    scan.add_file(_linked_file(tmp_path, 'b9.txt', 9))
+    assert scan.total_size == 100 and scan.duplicate_links == 1
+    scan.add_file(_linked_file(tmp_path, 'b0.txt', 0))
+    assert scan.total_size == 110 and scan.duplicate_links == 1
+
+def test_link_size_counts_at_the_smallest_path(tmp_path):
+    scan = ScanAccumulator(tmp_path)
+    first = scan.registry.register('x', 1)
+    second = scan.registry.register('a', 1)
+    for dir_info in (first, second):
+        file_info = _linked_file(tmp_path, os.path.join(str(dir_info.relative_path), 'f.txt'), 7)
+        file_info.directory_id = dir_info.id
+        scan.add_file(file_info)
+    assert (first.file_count, first.size_bytes) == (1, 0)
+    assert (second.file_count, second.size_bytes) == (1, 10)
+    assert scan.total_size == 10 and scan.duplicate_links == 1
+    assert not scan._pending_links
+
+def test_followed_symlinks_count_size_once(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'a' / 'f.txt').write_text('x' * 100)
+    os.link(tmp_path / 'a' / 'f.txt', tmp_path / 'b' / 'f.txt')
+    (tmp_path / 'link.txt').symlink_to(tmp_path / 'a' / 'f.txt')
+    (tmp_path / 'z.txt').symlink_to(tmp_path / 'b' / 'f.txt')
+    for workers in (1, 4):
+        result = FileScanner(tmp_path, ScanOptions(follow_links=True, workers=workers)).scan()
+        assert result.total_files == 4
+        assert result.total_size == 100
+        assert result.duplicate_links == 3
+        assert _dir_sizes(result)['a'] == (1, 100)
@@ -0,0 +1,37 @@
+"""Tests for the core models."""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from file_scanner.core.models import FileInfo
+
+CREATED = datetime(2024, 1, 2, 3, 4, 5, 6)
+MODIFIED = datetime(2024, 2, 3, 4, 5, 6, 7)
+
+def test_file_info_accepts_original_keywords():
+    file_info = FileInfo(
+        name='x.txt',
+        path=Path('/root/a/x.txt'),
+        relative_path=Path('a/x.txt'),
+        extension='.txt',
+        size_bytes=3,
+        created_date=CREATED,
+        modified_date=MODIFIED,
+        is_hidden=False
+    )
+    assert file_info.path_str == '/root/a/x.txt'
+    assert file_info.relative_path_str == 'a/x.txt'
+    assert file_info.st_mtime == MODIFIED.timestamp()
+    assert file_info.modified_date is MODIFIED
+
+def test_file_info_original_forms_are_equal():
+    raw = FileInfo('x.txt', '/root/a/x.txt', 6, '.txt', 3, CREATED.timestamp(), MODIFIED.timestamp(), False)
+    positional = FileInfo('x.txt', Path('/root/a/x.txt'), Path('a/x.txt'), '.txt', 3, CREATED, MODIFIED, False)
+    from_values = FileInfo.from_values('x.txt', Path('/root/a/x.txt'), Path('a/x.txt'), '.txt', 3, CREATED, MODIFIED, False)
+    assert raw == positional == from_values
+    assert raw.created_date == CREATED
+
+def test_file_info_needs_a_path():
+    with pytest.raises(TypeError):
+        FileInfo('x.txt')
@@ -0,0 +1,75 @@
+"""Tests for resuming interrupted scans."""
+import pytest
+
+from file_scanner.core.accumulator import ScanAccumulator
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.database.catalog import CatalogManager
+
+def _interrupt_after(files, count):
+    for i, file_info in enumerate(files, 1):
+        yield file_info
+        if i == count:
+            raise KeyboardInterrupt
+
+def _interrupt_and_resume(catalog_manager, scanner, count):
+    """Catalog a scan interrupted after count files, then resume it.
+
+    Returns:
+        (catalog id, accumulator of the resumed scan)
+    """
+    accumulator = ScanAccumulator(scanner.root_path)
+    partial_id = catalog_manager.create_catalog_from_stream(
+        _interrupt_after(scanner.iter_scan(accumulator), count),
+        accumulator,
+        checkpoint=scanner.checkpoint
+    )
+    assert accumulator.interrupted
+
+    resume = catalog_manager.load_resume(partial_id)
+    assert resume is not None
+    assert resume.checkpoint.frontier
+    assert resume.accumulator.total_files <= count
+    scanner = FileScanner(resume.root_path, resume.checkpoint.options)
+    resumed_id = catalog_manager.create_catalog_from_stream(
+        scanner.iter_scan(resume.accumulator, resume.checkpoint),
+        resume.accumulator,
+        checkpoint=scanner.checkpoint,
+        resume=resume
+    )
+    assert resumed_id == partial_id
+    assert not resume.accumulator.interrupted
+    assert catalog_manager.load_resume(partial_id) is None
+    return resumed_id, resume.accumulator
+
+@pytest.mark.parametrize('count', [1, 9, 20, 34])
+def test_resumed_scan_matches_full_scan(
+    tree, catalog_manager, stream_catalog, catalog_contents, monkeypatch, count
+):
+    monkeypatch.setattr(CatalogManager, 'BATCH_SIZE', 7)
+    full_id = stream_catalog(catalog_manager, FileScanner(tree))
+
+    resumed_id, accumulator = _interrupt_and_resume(
+        catalog_manager, FileScanner(tree, ScanOptions(workers=2)), count
+    )
+
+    full = catalog_contents(catalog_manager, full_id)
+    assert full[0][0] == 35
+    assert catalog_contents(catalog_manager, resumed_id) == full
+    assert accumulator.to_result().pruned_dirs == FileScanner(tree).scan().pruned_dirs
+
+@pytest.mark.parametrize('workers', [1, 4])
+@pytest.mark.parametrize('count', [3, 7, 12, 18])
+def test_resumed_scan_counts_pruned_directories_once(tmp_path, catalog_manager, count, workers):
+    root = tmp_path / 'root'
+    for i in range(5):
+        (root / f'd{i}' / 'skip').mkdir(parents=True)
+        for k in range(4):
+            (root / f'd{i}' / f'f{k}.txt').write_text('x' * k)
+    options = ScanOptions(ignore_patterns=['skip'], workers=workers)
+    assert FileScanner(root, options).scan().pruned_dirs == 5
+
+    _, accumulator = _interrupt_and_resume(catalog_manager, FileScanner(root, options), count)
+    result = accumulator.to_result()
+    assert result.total_files == 20
+    assert result.pruned_dirs == 5
@@ -0,0 +1,41 @@
+"""Tests for scanning several roots in one run."""
+import pytest
+
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.services.root_scan_service import MultiRootScanService
+
+def _nested_tree(tmp_path):
+    root = tmp_path / 'm'
+    (root / 'inner' / 'build').mkdir(parents=True)
+    (root / 'build').mkdir()
+    (root / 'inner' / 'build' / 'x.o').write_text('x')
+    (root / 'build' / 'y.o').write_text('yy')
+    (root / 'inner' / 'k.c').write_text('kkk')
+    (root / 'inner' / '.gitignore').write_text('*.c\n')
+    return root
+
+def _catalog_files(catalog_contents, catalog_manager, catalog_id):
+    return [row[0] for row in catalog_contents(catalog_manager, catalog_id)[1]]
+
+@pytest.mark.parametrize('options, reused', [
+    (ScanOptions(ignore_patterns=['*.o']), True),
+    (ScanOptions(ignore_patterns=['/build']), False),
+    (ScanOptions(ignore_files=['.gitignore']), False),
+])
+def test_outer_root_catalogs_what_a_single_scan_does(
+    tmp_path, catalog_manager, stream_catalog, catalog_contents, options, reused
+):
+    root = _nested_tree(tmp_path)
+    single_id = stream_catalog(catalog_manager, FileScanner(root, options))
+
+    service = MultiRootScanService([root, root / 'inner', root], catalog_manager, options)
+    scans = list(service.scan())
+
+    assert service.duplicates == [root]
+    assert [scan.root_path for scan in scans] == [root / 'inner', root]
+    outer = scans[1]
+    assert outer.nested == ([root / 'inner'] if reused else [])
+    assert (outer.result.reused_dirs > 0) == reused
+    assert _catalog_files(catalog_contents, catalog_manager, outer.catalog_id) == \
+        _catalog_files(catalog_contents, catalog_manager, single_id)
@@ -0,0 +1,51 @@
+"""Tests for multi-process scanning."""
+from file_scanner.core import sharding
+from file_scanner.core.models import ScanOptions
+from file_scanner.core.scanner import FileScanner
+from file_scanner.core.sharding import plan_shards
+from file_scanner.core.walker import DirectoryWalker
+
+def _deep_narrow_tree(root):
+    """20 light directories and one heavy directory four levels down."""
+    for i in range(20):
+        (root / f'd{i:02}').mkdir(parents=True)
+        for k in range(10):
+            (root / f'd{i:02}' / f'f{k}').write_bytes(b'x')
+    heavy = root / 'a' / 'x' / 'y' / 'z'
+    heavy.mkdir(parents=True)
+    for k in range(2000):
+        (heavy / f'f{k}').write_bytes(b'y')
+    return root
+
+def test_deep_heavy_subtree_is_split(tmp_path):
+    root = _deep_narrow_tree(tmp_path / 'root')
+    processes = 4
+
+    shards = plan_shards(DirectoryWalker(str(root)), processes)
+
+    paths = {(s.relative_path, s.recursive) for s in shards}
+    assert ('a', True) not in paths
+    assert shards[0].relative_path == 'a/x/y/z' and not shards[0].recursive
+    total = sum(s.weight for s in shards)
+    assert total >= 2200
+    # Every recursive shard is at most half of a worker's share
+    assert all(s.weight <= total / (processes * 2) for s in shards if s.recursive)
+
+def test_probing_is_bounded(tmp_path, monkeypatch):
+    root = _deep_narrow_tree(tmp_path / 'root')
+    monkeypatch.setattr(sharding, 'MAX_PROBED_ENTRIES', 0)
+
+    shards = plan_shards(DirectoryWalker(str(root)), 4)
+
+    # Without a probe budget, subtrees are weighed by their direct entries
+    assert {s.weight for s in shards if s.recursive} <= {1, 10}
+
+def test_sharded_scan_covers_the_deep_tree(tmp_path):
+    root = _deep_narrow_tree(tmp_path / 'root')
+
+    sequential = FileScanner(root).scan()
+    sharded = FileScanner(root, ScanOptions(processes=4)).scan()
+
+    assert sharded.total_files == sequential.total_files == 2200
+    assert sorted(f.relative_path_str for f in sharded.files) == \
+        sorted(f.relative_path_str for f in sequential.files)
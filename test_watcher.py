@@ -0,0 +1,58 @@
+"""Tests for keeping a catalog current from inotify events."""
+import os
+import shutil
+
+import pytest
+
+from file_scanner.core.models import WatchError
+from file_scanner.core.scanner import FileScanner
+from file_scanner.services.watcher_service import WatcherService
+
+@pytest.fixture
+def watcher(tmp_path, catalog_manager):
+    """Watcher over tmp_path/root, which holds a.txt and a/x.txt."""
+    root = tmp_path / 'root'
+    (root / 'a').mkdir(parents=True)
+    (root / 'a.txt').write_text('a')
+    (root / 'a' / 'x.txt').write_text('xx')
+    service = WatcherService(FileScanner(root), catalog_manager, settle=0)
+    try:
+        service.start()
+    except WatchError as e:
+        pytest.skip(str(e))
+    yield service
+    service.close()
+
+def _apply(watcher):
+    batch = watcher.poll(timeout=0.2)
+    assert batch is not None
+    return batch
+
+def _files(catalog_contents, watcher):
+    catalog, files, _ = catalog_contents(watcher.catalog_manager, watcher.catalog_id)
+    return catalog[:2], [row[0] for row in files]
+
+def test_directory_replaced_by_a_file(watcher, catalog_contents):
+    root = watcher.scanner.root_path
+    shutil.rmtree(root / 'a')
+    (root / 'a').write_text('file')
+    _apply(watcher)
+
+    assert _files(catalog_contents, watcher) == ((2, 5), ['a', 'a.txt'])
+    assert set(watcher._wds) == {''}
+
+def test_renamed_directory_stays_watched(watcher, catalog_contents):
+    root = watcher.scanner.root_path
+    # The new path is buffered before the old one
+    (root / 'b').mkdir()
+    (root / 'b').rmdir()
+    os.rename(root / 'a', root / 'b')
+    _apply(watcher)
+    assert _files(catalog_contents, watcher) == ((2, 3), ['a.txt', os.path.join('b', 'x.txt')])
+    assert set(watcher._wds) == {'', 'b'}
+
+    (root / 'b' / 'y.txt').write_text('yyy')
+    _apply(watcher)
+    assert _files(catalog_contents, watcher) == (
+        (3, 6), ['a.txt', os.path.join('b', 'x.txt'), os.path.join('b', 'y.txt')]
+    )